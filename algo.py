@@ -1,10 +1,118 @@
+import time
 from abc import ABC, abstractmethod
 from game_components import Board, PlayerID
 
+class SearchStats:
+    """
+    What one search did, or the sum over several searches (see `total`).
+
+    Algorithms fill in the counters they have; the others stay 0. Minimax
+    engines count nodes, cutoffs and cache hits, and also how often and for
+    how long they evaluated positions and generated and played moves, MCTS
+    counts playouts, and so on. Seconds are wall-clock time.
+    """
+    COUNTERS = (
+        "searches", "nodes", "playouts", "cutoffs", "tt_probes", "tt_hits",
+        "tablebase_hits", "book_hits", "evaluations", "movegen_calls",
+        "moves_generated", "depth_total", "eval_seconds", "movegen_seconds",
+        "apply_seconds", "seconds",
+    )
+
+    def __init__(self, algo_name: str = "", **counters):
+        unknown = set(counters) - set(self.COUNTERS) - {"depth"}
+        if unknown:
+            raise TypeError(f"Unknown SearchStats counters: {sorted(unknown)}")
+        self.algo_name = algo_name
+        for name in self.COUNTERS:
+            setattr(self, name, counters.get(name, 0))
+        # Deepest search, while depth_total / searches is the average depth
+        self.depth = counters.get("depth", 0)
+        self.started = time.perf_counter()
+
+    @classmethod
+    def from_dict(cls, stats: dict) -> "SearchStats":
+        """Rebuilds stats from `as_dict`, e.g. after they were sent as JSON."""
+        return cls(
+            stats["algo"], depth=stats["depth"], **{name: stats[name] for name in cls.COUNTERS}
+        )
+
+    @classmethod
+    def total(cls, stats_list) -> "SearchStats":
+        """Sums the counters of `stats_list`, e.g. all moves of a game."""
+        total = cls()
+        for stats in stats_list:
+            total.merge(stats)
+        return total
+
+    def merge(self, other: "SearchStats"):
+        """Adds the counters of `other` to this one."""
+        if not self.algo_name:
+            self.algo_name = other.algo_name
+        for name in self.COUNTERS:
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+        self.depth = max(self.depth, other.depth)
+
+    @property
+    def branching_factor(self) -> float:
+        """Average number of legal moves at the positions searched."""
+        return self.moves_generated / self.movegen_calls if self.movegen_calls else 0.0
+
+    @property
+    def nodes_per_second(self) -> float:
+        return self.nodes / self.seconds if self.seconds else 0.0
+
+    @property
+    def tt_hit_rate(self) -> float:
+        return self.tt_hits / self.tt_probes if self.tt_probes else 0.0
+
+    @property
+    def average_depth(self) -> float:
+        return self.depth_total / self.searches if self.searches else 0.0
+
+    def as_dict(self) -> dict:
+        stats = {"algo": self.algo_name, "depth": self.depth}
+        stats.update((name, getattr(self, name)) for name in self.COUNTERS)
+        stats.update(
+            branching_factor=self.branching_factor,
+            nodes_per_second=self.nodes_per_second,
+            tt_hit_rate=self.tt_hit_rate,
+            average_depth=self.average_depth,
+        )
+        return stats
+
+    def summary(self) -> str:
+        """One line for the game log."""
+        parts = [f"depth {self.depth}"]
+        if self.nodes:
+            parts.append(f"{self.nodes} nodes ({self.nodes_per_second:,.0f}/s)")
+        if self.playouts:
+            parts.append(f"{self.playouts} playouts")
+        if self.movegen_calls:
+            parts.append(f"branching {self.branching_factor:.2f}")
+        if self.cutoffs:
+            parts.append(f"{self.cutoffs} cutoffs")
+        if self.tt_probes:
+            parts.append(f"TT hits {self.tt_hit_rate:.0%}")
+        if self.book_hits:
+            parts.append("book")
+        if self.eval_seconds or self.movegen_seconds or self.apply_seconds:
+            parts.append(
+                f"eval {self.eval_seconds:.3f}s / movegen {self.movegen_seconds:.3f}s"
+                f" / apply {self.apply_seconds:.3f}s"
+            )
+        parts.append(f"{self.seconds:.3f}s")
+        return ", ".join(parts)
+
 class Algo(ABC):
     """Abstract base class for all Congklak AI algorithms."""
     def __init__(self, name: str):
         self.name = name
+        # Search statistics are off unless enabled, so they cost nothing by default
+        self.collect_stats = False
+        self.last_stats = None
+        self._stats_listeners = []
+        # Set from another thread to end the running search early, see `request_stop`
+        self.stop_requested = False
 
     @abstractmethod
     def get_best_choice(self, board: Board, player_id: PlayerID) -> tuple[int, int | None]:
@@ -19,4 +127,63 @@ class Algo(ABC):
             A tuple containing (best_score, best_move).
             best_move can be None if no move is possible.
         """
-        pass
\ No newline at end of file
+        pass
+
+    def get_best_choice_within(
+        self, board: Board, player_id: PlayerID, time_limit: float
+    ) -> tuple[int, int | None, int]:
+        """
+        Time-budgeted version of `get_best_choice`.
+
+        Args:
+            board: The current board state.
+            player_id: The ID of the player making the move.
+            time_limit: The search budget in seconds.
+
+        Returns:
+            A tuple containing (best_score, best_move, depth_reached), taken
+            from the deepest search that completed within the budget.
+            Algorithms without a time-budgeted search run their usual
+            `get_best_choice` and report their fixed depth, if any.
+        """
+        best_score, best_move = self.get_best_choice(board, player_id)
+        return best_score, best_move, getattr(self, "depth", 0)
+
+    # --- Stopping A Search ---
+    def request_stop(self):
+        """
+        Asks a search running in another thread to return as soon as it can.
+        The result of a stopped search is meaningless and should be discarded.
+        Searches started before `clear_stop` stop immediately. Algorithms that
+        do not check the flag simply finish their search.
+        """
+        self.stop_requested = True
+
+    def clear_stop(self):
+        self.stop_requested = False
+
+    # --- Search Statistics ---
+    def enable_stats(self, listener=None):
+        """
+        Collects a `SearchStats` for every search from now on. The latest is
+        kept in `last_stats`, and `listener(stats)` is called after each search.
+        """
+        self.collect_stats = True
+        if listener is not None:
+            self._stats_listeners.append(listener)
+
+    def disable_stats(self):
+        self.collect_stats = False
+        self._stats_listeners = []
+
+    def _new_stats(self) -> SearchStats:
+        """Starts the stats of a search. Its clock starts now."""
+        return SearchStats(self.name, searches=1)
+
+    def _report_stats(self, stats: SearchStats, depth: int = 0):
+        """Finishes the stats of a search that reached `depth` and hands them to the listeners."""
+        stats.seconds = time.perf_counter() - stats.started
+        stats.depth = stats.depth_total = depth
+        self.last_stats = stats
+        for listener in self._stats_listeners:
+            listener(stats)
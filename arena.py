@@ -0,0 +1,319 @@
+"""
+Headless tournament runner for the entries in `main.available_algos`.
+
+Plays round-robin or gauntlet matches over a process pool, streams one JSON
+line per finished game and prints a win-rate and Elo summary, e.g.:
+
+    python arena.py --games 20 --opening-plies 4 --out results.jsonl
+    python arena.py --mode gauntlet --challenger minimax-v2 --time-limit 0.1
+    python arena.py --games 4 --stats
+    python arena.py --games 20 --record games.rec
+
+Games saved with --record can be replayed and analyzed with `game_record.py`.
+
+Each opening is played twice with colours swapped, and opening k is the same
+random line in every pairing, so runs with the same --seed are reproducible.
+"""
+import argparse
+import itertools
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from game_components import Board, PlayerID, GameStatus
+from algo import SearchStats
+from game_record import GameRecord, check_fits, write_records
+
+def opening_moves(seed: int, plies: int, initial_seeds: int, board_size: int) -> list[int]:
+    """Returns a reproducible random opening of up to `plies` moves."""
+    rng = random.Random(seed)
+    board = Board(initial_seeds, board_size)
+    moves = []
+    for _ in range(plies):
+        if board.game_status != GameStatus.ONGOING:
+            break
+        move = rng.choice(board.get_legal_moves())
+        board = board.make_move(move)
+        moves.append(move)
+    return moves
+
+def play_game(
+    player_one: str,
+    player_two: str,
+    opening: list[int],
+    initial_seeds: int = 7,
+    board_size: int = 7,
+    time_limit: float | None = None,
+    collect_stats: bool = False,
+) -> dict:
+    """
+    Plays one game between two `available_algos` entries after `opening`.
+    Runs in a worker process, so entries are looked up by name.
+    With `collect_stats`, the result has each side's SearchStats per move and
+    in total under "stats".
+    """
+    from main import available_algos
+
+    algos = {
+        PlayerID.PLAYER_ONE: available_algos[player_one],
+        PlayerID.PLAYER_TWO: available_algos[player_two],
+    }
+    move_stats = {player_id: [] for player_id in algos}
+    if collect_stats:
+        for algo in algos.values():
+            algo.enable_stats()
+    board = Board(initial_seeds, board_size)
+    for move in opening:
+        board = board.make_move(move)
+
+    moves = []
+    start = time.perf_counter()
+    while board.game_status == GameStatus.ONGOING:
+        algo = algos[board.current_player]
+        algo.last_stats = None
+        if time_limit is not None:
+            _, move, _ = algo.get_best_choice_within(board, board.current_player, time_limit)
+        else:
+            _, move = algo.get_best_choice(board, board.current_player)
+        if algo.last_stats is not None:
+            move_stats[board.current_player].append(algo.last_stats)
+        board = board.make_move(move)
+        moves.append(move)
+
+    result = {
+        "player_one": player_one,
+        "player_two": player_two,
+        "initial_seeds": initial_seeds,
+        "board_size": board_size,
+        "opening": opening,
+        "moves": moves,
+        "status": board.game_status.name,
+        "score": [
+            board.board[board.get_player_silo_index(PlayerID.PLAYER_ONE)],
+            board.board[board.get_player_silo_index(PlayerID.PLAYER_TWO)],
+        ],
+        "seconds": round(time.perf_counter() - start, 3),
+    }
+    if collect_stats:
+        result["stats"] = {
+            key: {
+                "moves": [stats.as_dict() for stats in move_stats[player_id]],
+                "total": SearchStats.total(move_stats[player_id]).as_dict(),
+            }
+            for key, player_id in (("player_one", PlayerID.PLAYER_ONE), ("player_two", PlayerID.PLAYER_TWO))
+        }
+    return result
+
+def schedule(
+    entries: list[str],
+    games: int,
+    seed: int,
+    opening_plies: int,
+    initial_seeds: int = 7,
+    board_size: int = 7,
+    challenger: str | None = None,
+) -> list[dict]:
+    """
+    Lists the games to play. Round-robin pairs every two entries, gauntlet
+    pairs `challenger` with every other entry. Each pairing plays `games` games,
+    alternating colours on the same opening.
+    """
+    if challenger is not None:
+        pairings = [(challenger, other) for other in entries if other != challenger]
+    else:
+        pairings = list(itertools.combinations(entries, 2))
+
+    jobs = []
+    for a, b in pairings:
+        for k in range(games):
+            opening_seed = seed * 1_000_003 + k // 2
+            player_one, player_two = (a, b) if k % 2 == 0 else (b, a)
+            jobs.append({
+                "player_one": player_one,
+                "player_two": player_two,
+                "opening_seed": opening_seed,
+                "opening": opening_moves(opening_seed, opening_plies, initial_seeds, board_size),
+            })
+    return jobs
+
+def game_points(result: dict) -> tuple[float, float]:
+    """Returns the (player_one, player_two) points for a finished game."""
+    status = result["status"]
+    if status == GameStatus.PLAYER_ONE_WINS.name:
+        return 1.0, 0.0
+    elif status == GameStatus.PLAYER_TWO_WINS.name:
+        return 0.0, 1.0
+    else:
+        return 0.5, 0.5
+
+def elo_ratings(results: list[dict], iterations: int = 200) -> dict[str, float]:
+    """
+    Maximum-likelihood Elo ratings (Bradley-Terry on the Elo scale), centred on
+    1500. Entries that won or lost every game are clamped to +-800 from the mean.
+    """
+    if not results:
+        return {}
+    names = sorted({r["player_one"] for r in results} | {r["player_two"] for r in results})
+    ratings = {name: 0.0 for name in names}
+    for _ in range(iterations):
+        for name in names:
+            actual = expected = 0.0
+            for r in results:
+                if name not in (r["player_one"], r["player_two"]):
+                    continue
+                is_one = r["player_one"] == name
+                other = r["player_two"] if is_one else r["player_one"]
+                actual += game_points(r)[0 if is_one else 1]
+                expected += 1 / (1 + 10 ** ((ratings[other] - ratings[name]) / 400))
+            played = sum(1 for r in results if name in (r["player_one"], r["player_two"]))
+            ratings[name] += 400 * (actual - expected) / max(played, 1)
+            ratings[name] = max(-800.0, min(800.0, ratings[name]))
+        mean = sum(ratings.values()) / len(ratings)
+        ratings = {name: rating - mean for name, rating in ratings.items()}
+    return {name: 1500 + rating for name, rating in ratings.items()}
+
+def summarize(results: list[dict]) -> list[dict]:
+    """Per-entry wins, draws, losses, score rate and Elo, best first."""
+    stats = {}
+    for r in results:
+        points = game_points(r)
+        for name, own in ((r["player_one"], points[0]), (r["player_two"], points[1])):
+            entry = stats.setdefault(name, {"name": name, "games": 0, "wins": 0, "draws": 0, "losses": 0})
+            entry["games"] += 1
+            entry["wins"] += own == 1.0
+            entry["draws"] += own == 0.5
+            entry["losses"] += own == 0.0
+
+    ratings = elo_ratings(results)
+    for name, entry in stats.items():
+        entry["score_rate"] = (entry["wins"] + 0.5 * entry["draws"]) / entry["games"]
+        entry["elo"] = round(ratings[name])
+    return sorted(stats.values(), key=lambda entry: -entry["elo"])
+
+def summarize_stats(results: list[dict]) -> dict[str, SearchStats]:
+    """Per-entry SearchStats summed over every game played with `collect_stats`."""
+    totals = {}
+    for r in results:
+        for key in ("player_one", "player_two"):
+            if "stats" in r:
+                totals.setdefault(r[key], SearchStats()).merge(
+                    SearchStats.from_dict(r["stats"][key]["total"])
+                )
+    return totals
+
+def run_tournament(
+    jobs: list[dict],
+    workers: int | None = None,
+    out=None,
+    initial_seeds: int = 7,
+    board_size: int = 7,
+    time_limit: float | None = None,
+    collect_stats: bool = False,
+) -> list[dict]:
+    """
+    Plays `jobs` over a process pool. Each result is written to `out` as one
+    JSON line as soon as its game finishes.
+    """
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(
+                play_game,
+                job["player_one"],
+                job["player_two"],
+                job["opening"],
+                initial_seeds,
+                board_size,
+                time_limit,
+                collect_stats,
+            ): (index, job)
+            for index, job in enumerate(jobs)
+        }
+        for future in as_completed(futures):
+            index, job = futures[future]
+            result = {"game": index, "opening_seed": job["opening_seed"], **future.result()}
+            results.append(result)
+            if out is not None:
+                out.write(json.dumps(result) + "\n")
+                out.flush()
+    results.sort(key=lambda r: r["game"])
+    return results
+
+def main(argv=None):
+    from main import available_algos
+
+    parser = argparse.ArgumentParser(description="Play matches between the available Congklak AIs.")
+    parser.add_argument("--mode", choices=("round-robin", "gauntlet"), default="round-robin")
+    parser.add_argument("--entries", nargs="+", default=list(available_algos),
+                        help="Entries from available_algos (default: all)")
+    parser.add_argument("--challenger", help="Entry that plays every other entry in gauntlet mode")
+    parser.add_argument("--games", type=int, default=10, help="Games per pairing")
+    parser.add_argument("--opening-plies", type=int, default=4, help="Random plies before the AIs take over")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the random openings")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--time-limit", type=float, help="Per-move budget in seconds instead of fixed depth")
+    parser.add_argument("--initial-seeds", type=int, default=7)
+    parser.add_argument("--board-size", type=int, default=7)
+    parser.add_argument("--out", help="JSONL file for per-game results (default: stdout)")
+    parser.add_argument("--stats", action="store_true",
+                        help="Record search stats per move and per game, and summarize them per entry")
+    parser.add_argument("--record", help="Also save the games to this game record file")
+    args = parser.parse_args(argv)
+
+    unknown = [name for name in args.entries if name not in available_algos]
+    if unknown:
+        parser.error(f"Unknown entries {unknown}, choose from {list(available_algos)}")
+    if args.mode == "gauntlet" and args.challenger not in args.entries:
+        parser.error("--mode gauntlet needs a --challenger that is one of the entries")
+    if args.record:
+        try:
+            check_fits(args.initial_seeds, args.board_size, args.opening_plies)
+        except ValueError as e:
+            parser.error(f"--record: {e}")
+
+    jobs = schedule(
+        args.entries,
+        args.games,
+        args.seed,
+        args.opening_plies,
+        args.initial_seeds,
+        args.board_size,
+        args.challenger if args.mode == "gauntlet" else None,
+    )
+    if not jobs:
+        parser.error("no games to play")
+    out = open(args.out, "w") if args.out else sys.stdout
+    try:
+        start = time.perf_counter()
+        results = run_tournament(
+            jobs, args.workers, out, args.initial_seeds, args.board_size, args.time_limit, args.stats
+        )
+    finally:
+        if args.out:
+            out.close()
+
+    if args.record:
+        write_records((GameRecord.from_arena_result(result) for result in results), args.record)
+
+    print(f"\n{len(results)} games in {time.perf_counter() - start:.1f}s", file=sys.stderr)
+    print(f"{'Entry':<20} {'Games':>5} {'W':>4} {'D':>4} {'L':>4} {'Score':>6} {'Elo':>5}", file=sys.stderr)
+    for entry in summarize(results):
+        print(
+            f"{entry['name']:<20} {entry['games']:>5} {entry['wins']:>4} {entry['draws']:>4} "
+            f"{entry['losses']:>4} {entry['score_rate']:>6.1%} {entry['elo']:>5}",
+            file=sys.stderr,
+        )
+
+    if args.stats:
+        print(f"\n{'Entry':<20} {'Moves':>6} {'Avg depth':>9} {'Nodes/s':>9} {'Branching':>9} {'Cutoffs':>8}", file=sys.stderr)
+        for name, stats in summarize_stats(results).items():
+            print(
+                f"{name:<20} {stats.searches:>6} {stats.average_depth:>9.2f} {stats.nodes_per_second:>9,.0f} "
+                f"{stats.branching_factor:>9.2f} {stats.cutoffs:>8}",
+                file=sys.stderr,
+            )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+"""
+Vectorized Congklak engine that steps many independent games at once.
+
+`BatchBoards` holds N boards as an (N, 2 * board_size + 2) integer array plus
+side-to-move and status vectors, and applies one move per board in a single
+call. The rules are the same as `Board.make_move` (relay sowing, capture, free
+turns and the end-of-game sweep); `verify_against_board` checks this on random
+games. Run `python batch_engine.py` to do so.
+
+Requires NumPy.
+"""
+import argparse
+import random
+import numpy as np
+from game_components import Board, PlayerID, GameStatus, sowing_geometry
+
+class BatchBoards:
+    def __init__(self, num_boards: int, initial_seeds: int = 7, board_size: int = 7):
+        self.board_size = board_size
+        self.num_pits = 2 * board_size + 2
+        self.pits = np.full((num_boards, self.num_pits), initial_seeds, dtype=np.int32)
+        self.pits[:, board_size] = 0
+        self.pits[:, -1] = 0
+        # 0 when Player 1 is to move, 1 when Player 2 is
+        self.side = np.zeros(num_boards, dtype=np.int8)
+        # GameStatus values
+        self.status = np.zeros(num_boards, dtype=np.int8)
+        self._build_geometry()
+
+    def _build_geometry(self):
+        """Stacks the per-side tables from `sowing_geometry` so they can be indexed by `side`."""
+        geometry = [sowing_geometry(self.board_size, side) for side in (0, 1)]
+        self._cycle = np.array([g[0] for g in geometry], dtype=np.int64)
+        self._position = np.array([g[1] for g in geometry], dtype=np.int64)
+        self._opposite = np.array(geometry[0][2], dtype=np.int64)
+        self._own_silo = np.array([g[3] for g in geometry], dtype=np.int64)
+        self._sown = self._position >= 0  # Pits each side sows into
+        self._cycle_length = 2 * self.board_size + 1
+        self._holes_start = np.array([0, self.board_size + 1], dtype=np.int64)
+
+    def __len__(self):
+        return len(self.pits)
+
+    @classmethod
+    def from_boards(cls, boards: list[Board]):
+        batch = cls(len(boards), 0, boards[0].board_size)
+        batch.pits[:] = [board.board for board in boards]
+        batch.side[:] = [0 if b.current_player == PlayerID.PLAYER_ONE else 1 for b in boards]
+        batch.status[:] = [board.game_status.value for board in boards]
+        return batch
+
+    def to_board(self, index: int) -> Board:
+        """Returns board `index` as a `Board`."""
+        board = Board(0, self.board_size)
+        board.board = self.pits[index].tolist()
+        board.current_player = PlayerID.PLAYER_ONE if self.side[index] == 0 else PlayerID.PLAYER_TWO
+        board.game_status = GameStatus(int(self.status[index]))
+        board.refresh_hash()
+        return board
+
+    def legal_move_mask(self) -> np.ndarray:
+        """
+        Returns an (N, board_size) bool array, True where the hole is a legal
+        move for the side to move. Finished games have no legal moves.
+        """
+        holes = self._holes_start[self.side][:, None] + np.arange(self.board_size)
+        mask = np.take_along_axis(self.pits, holes, axis=1) > 0
+        mask[self.status != GameStatus.ONGOING.value] = False
+        return mask
+
+    def random_moves(self, rng: np.random.Generator) -> np.ndarray:
+        """Picks a uniformly random legal move per board, -1 for finished games."""
+        mask = self.legal_move_mask()
+        scores = np.where(mask, rng.random(mask.shape), -1.0)
+        moves = scores.argmax(axis=1)
+        moves[~mask.any(axis=1)] = -1
+        return moves
+
+    def step(self, moves: np.ndarray) -> np.ndarray:
+        """
+        Plays moves[i] on board i, for every board whose move is not -1.
+        Raises ValueError if any of those moves is illegal.
+        Returns a bool array, True for boards that got a free turn.
+        """
+        moves = np.asarray(moves, dtype=np.int64)
+        rows = np.flatnonzero(moves >= 0)
+        free_turn = np.zeros(len(self), dtype=bool)
+        if len(rows) == 0:
+            return free_turn
+
+        legal = self.legal_move_mask()
+        if not legal[rows, moves[rows]].all():
+            bad = rows[~legal[rows, moves[rows]]]
+            raise ValueError(f"Illegal moves on boards {bad.tolist()}: {moves[bad].tolist()}")
+
+        pits = self.pits
+        side = self.side[rows].astype(np.int64)
+        last = self._holes_start[side] + moves[rows]
+
+        # 1. Sow, one relay segment per pass, for the boards still sowing
+        sowing = np.arange(len(rows))
+        while len(sowing):
+            r = rows[sowing]
+            s = side[sowing]
+            source = last[sowing]
+            seeds = pits[r, source]
+            pits[r, source] = 0
+            start = self._position[s, source]
+
+            laps, remaining = np.divmod(seeds, self._cycle_length)
+            # Seeds after the source along the cycle: every sown pit gets `laps`,
+            # and the `remaining` pits right after the source get one more.
+            offset = (self._position[s] - start[:, None] - 1) % self._cycle_length
+            added = laps[:, None] + (offset < remaining[:, None])
+            pits[r] += np.where(self._sown[s], added, 0).astype(pits.dtype)
+
+            landed = self._cycle[s, start + remaining]
+            last[sowing] = landed
+            # If the last seed lands in a non-empty hole (now > 1), continue sowing
+            relay = (pits[r, landed] > 1) & (landed != self._own_silo[s])
+            sowing = sowing[relay]
+
+        # 2. Capture: the last seed landed in an empty hole on the mover's own side
+        own_silo = self._own_silo[side]
+        holes_start = self._holes_start[side]
+        opposite = self._opposite[last]
+        capture = (
+            (pits[rows, last] == 1)
+            & (last >= holes_start)
+            & (last < holes_start + self.board_size)
+        )
+        capture &= pits[rows, np.where(capture, opposite, 0)] > 0
+        c_rows, c_last, c_opposite = rows[capture], last[capture], opposite[capture]
+        pits[c_rows, own_silo[capture]] += pits[c_rows, c_opposite] + 1
+        pits[c_rows, c_opposite] = 0
+        pits[c_rows, c_last] = 0
+
+        # 3. Next player: the same one after landing in their own silo
+        free_turn[rows] = last == own_silo
+        self.side[rows] = np.where(free_turn[rows], side, 1 - side)
+
+        # 4. End of game: sweep remaining seeds into silos and decide the winner
+        self._settle(rows)
+        return free_turn
+
+    def _settle(self, rows: np.ndarray):
+        n = self.board_size
+        pits = self.pits[rows]
+        p1_remaining = pits[:, :n].sum(axis=1)
+        p2_remaining = pits[:, n + 1:2 * n + 1].sum(axis=1)
+        over = (p1_remaining == 0) | (p2_remaining == 0)
+        if not over.any():
+            return
+
+        pits = pits[over]
+        pits[:, n] += p1_remaining[over]
+        pits[:, -1] += p2_remaining[over]
+        pits[:, :n] = 0
+        pits[:, n + 1:2 * n + 1] = 0
+        self.pits[rows[over]] = pits
+
+        status = np.full(len(pits), GameStatus.DRAW.value, dtype=np.int8)
+        status[pits[:, n] > pits[:, -1]] = GameStatus.PLAYER_ONE_WINS.value
+        status[pits[:, n] < pits[:, -1]] = GameStatus.PLAYER_TWO_WINS.value
+        self.status[rows[over]] = status
+
+    def game_status(self) -> np.ndarray:
+        """Returns the GameStatus value of every board."""
+        return self.status.copy()
+
+def verify_against_board(
+    num_games: int = 1000, initial_seeds: int = 7, board_size: int = 7, seed: int = 0
+) -> int:
+    """
+    Plays `num_games` random games both in a `BatchBoards` and move by move with
+    `Board.make_move`, and checks that every position matches.
+    Returns the number of moves checked. Raises AssertionError on a mismatch.
+    """
+    rng = np.random.default_rng(seed)
+    batch = BatchBoards(num_games, initial_seeds, board_size)
+    boards = [Board(initial_seeds, board_size) for _ in range(num_games)]
+    moves_checked = 0
+
+    while (batch.status == GameStatus.ONGOING.value).any():
+        moves = batch.random_moves(rng)
+        batch.step(moves)
+        for i in np.flatnonzero(moves >= 0):
+            boards[i] = boards[i].make_move(int(moves[i]))
+            expected = boards[i]
+            assert batch.pits[i].tolist() == expected.board, (i, batch.pits[i], expected.board)
+            assert batch.side[i] == expected.current_player.value - 1, i
+            assert batch.status[i] == expected.game_status.value, i
+            moves_checked += 1
+
+    return moves_checked
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check BatchBoards against Board on random games.")
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--seeds", type=int, default=7, help="Initial seeds per hole")
+    parser.add_argument("--board-size", type=int, default=7)
+    parser.add_argument("--seed", type=int, default=random.randrange(2**32))
+    args = parser.parse_args()
+
+    checked = verify_against_board(args.games, args.seeds, args.board_size, args.seed)
+    print(f"OK: {checked} moves in {args.games} games matched Board (seed {args.seed}).")
@@ -0,0 +1,325 @@
+"""
+Benchmark suite for the move generator and the search engines.
+
+Sections (all run by default, pick some with --sections):
+- perft: move-path counts from fixed reference positions with both `Board`
+  and `SearchBoard`. The expected counts double as a rules regression test.
+- minimax: the alpha-beta engines against plain minimax on seeded random
+  positions, a regression test of the search being exact.
+- search: nodes per second of each `available_algos` entry at a fixed depth.
+- memory: bytes per `Board`, per `SearchBoard` undo ply, per transposition
+  table entry and per MCTS node, and the peak memory of each search.
+- sweep: move generation and search speed over board sizes and seed counts.
+
+Results are written as one JSON document, e.g.:
+
+    python benchmark.py --out bench.json
+    python benchmark.py --sections perft --perft-depth 4
+
+The exit status is 1 if any perft count is wrong or any engine differs from
+plain minimax.
+"""
+import argparse
+import copy
+import json
+import math
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from game_components import Board, SearchBoard, PlayerID, GameStatus
+from minimax.search import MinimaxSearchAlgo, natural_order, heuristic_order, verify_against_minimax
+from minimax.minimax_module import MinimaxAlgo
+from minimax.minimax_module_v2 import MinimaxAlgoV2
+from minimax.transposition import TranspositionTable
+
+SECTIONS = ("perft", "minimax", "search", "memory", "sweep")
+
+# --- Reference Positions ---
+# `counts[d - 1]` is perft(d): the number of move sequences of length d from the
+# position. Games that end earlier do not count. The counts were produced with
+# the original move-by-move implementation of `Board.make_move`.
+
+def _endgame_position() -> Board:
+    board = Board(0, 7)
+    board.board = [0, 3, 0, 1, 0, 2, 1, 30, 1, 0, 2, 0, 0, 1, 4, 25]
+    board.current_player = PlayerID.PLAYER_TWO
+    board.refresh_hash()
+    return board
+
+def _played_position(initial_seeds: int, board_size: int, moves: list[int]) -> Board:
+    board = Board(initial_seeds, board_size)
+    for move in moves:
+        board = board.make_move(move)
+    return board
+
+REFERENCE_POSITIONS = {
+    "start": (
+        lambda: Board(7, 7),
+        [7, 36, 230, 1406, 8295, 48305],
+    ),
+    "midgame": (
+        lambda: _played_position(7, 7, [2, 5, 0, 6, 4, 1]),
+        [6, 33, 165, 876, 4616, 23867],
+    ),
+    "endgame": (
+        _endgame_position,
+        [4, 18, 56, 205, 684, 2113, 6311, 17870],
+    ),
+    "small": (
+        lambda: Board(3, 3),
+        [3, 4, 8, 19, 43, 84, 143, 191, 223, 275],
+    ),
+}
+
+# --- Perft ---
+
+def perft(board: Board, depth: int) -> int:
+    """Counts move sequences of length `depth` with `Board.make_move`."""
+    if depth == 0:
+        return 1
+    if board.game_status != GameStatus.ONGOING:
+        return 0
+    return sum(perft(board.make_move(move), depth - 1) for move in board.get_legal_moves())
+
+def search_board_perft(board: SearchBoard, depth: int) -> int:
+    """Counts move sequences of length `depth` with `SearchBoard.apply` and `undo`."""
+    if depth == 0:
+        return 1
+    if board.status:
+        return 0
+    count = 0
+    for move in board.legal_moves():
+        board.apply(move)
+        count += search_board_perft(board, depth - 1)
+        board.undo()
+    return count
+
+def _timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+def run_perft(max_depth: int | None = None) -> list[dict]:
+    rows = []
+    for name, (make_position, counts) in REFERENCE_POSITIONS.items():
+        board = make_position()
+        for depth, expected in enumerate(counts, start=1):
+            if max_depth is not None and depth > max_depth:
+                break
+            board_count, board_seconds = _timed(perft, board, depth)
+            search_board = SearchBoard.from_board(board, track_hash=False)
+            search_count, search_seconds = _timed(search_board_perft, search_board, depth)
+            rows.append({
+                "position": name,
+                "depth": depth,
+                "expected": expected,
+                "board": board_count,
+                "search_board": search_count,
+                "ok": board_count == expected and search_count == expected,
+                "board_seconds": round(board_seconds, 6),
+                "search_board_seconds": round(search_seconds, 6),
+                "board_moves_per_second": round(board_count / board_seconds) if board_seconds else None,
+                "search_board_moves_per_second": round(search_count / search_seconds) if search_seconds else None,
+            })
+    return rows
+
+# --- Exactness ---
+
+def run_minimax_check(positions: int = 50, max_depth: int = 4, seed: int = 0) -> list[dict]:
+    """Checks each engine and move ordering against `_minimax` with `verify_against_minimax`."""
+    rows = []
+    for engine_class in (MinimaxAlgo, MinimaxAlgoV2):
+        for ordering in (natural_order, heuristic_order):
+            engine = engine_class(max_depth, move_ordering=ordering)
+            row = {"engine": engine_class.__name__, "ordering": ordering.__name__, "positions": positions}
+            try:
+                _, seconds = _timed(verify_against_minimax, engine, positions, max_depth, seed)
+                row.update(ok=True, seconds=round(seconds, 3))
+            except AssertionError as e:
+                row.update(ok=False, mismatch=repr(e.args[0] if e.args else e))
+            rows.append(row)
+    return rows
+
+# --- Search Speed ---
+
+def _at_depth(algo, depth: int):
+    """
+    A fresh copy of an `available_algos` entry, so no state carries over
+    between runs. Minimax entries search to `depth`, others run as configured.
+    """
+    algo = copy.deepcopy(algo)
+    if isinstance(algo, MinimaxSearchAlgo):
+        algo.depth = depth
+    return algo
+
+def _work_done(algo) -> tuple[str, int]:
+    """The unit and amount of work of the last search: minimax nodes or MCTS playouts."""
+    if hasattr(algo, "playouts"):
+        return "playouts", algo.playouts
+    return "nodes", algo.nodes
+
+def run_search(depth: int, positions=("start", "midgame", "endgame")) -> list[dict]:
+    from main import available_algos
+
+    rows = []
+    for entry, algo in available_algos.items():
+        algo = _at_depth(algo, depth)
+        for name in positions:
+            board = REFERENCE_POSITIONS[name][0]()
+            (score, move), seconds = _timed(algo.get_best_choice, board, board.current_player)
+            unit, work = _work_done(algo)
+            rows.append({
+                "entry": entry,
+                "position": name,
+                "depth": getattr(algo, "depth", None),
+                "move": move,
+                "score": score if math.isfinite(score) else str(score),
+                "unit": unit,
+                "work": work,
+                "seconds": round(seconds, 6),
+                "per_second": round(work / seconds) if seconds else None,
+            })
+    return rows
+
+# --- Memory ---
+
+def _traced_bytes(function) -> tuple[int, int]:
+    """Runs `function` and returns (bytes still held afterwards, peak bytes)."""
+    tracemalloc.start()
+    try:
+        start, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        result = function()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return current - start, peak - start
+
+def run_memory(depth: int) -> dict:
+    from main import available_algos
+    from mcts.mcts_module import MCTSAlgo
+
+    count = 1000
+    start = Board()
+    move = start.get_legal_moves()[0]
+    board_bytes, _ = _traced_bytes(lambda: [start.make_move(move) for _ in range(count)])
+
+    plies = 1000
+    small_stack, _ = _traced_bytes(lambda: SearchBoard.from_board(start, max_ply=1))
+    large_stack, _ = _traced_bytes(lambda: SearchBoard.from_board(start, max_ply=1 + plies))
+
+    table = TranspositionTable(max_memory_mb=1)
+    slots = table.num_buckets * table.slots_per_bucket
+
+    mcts = MCTSAlgo(iterations=500, seed=0)
+    mcts.get_best_choice(start, start.current_player)
+
+    search_peaks = {}
+    for entry, algo in available_algos.items():
+        algo = _at_depth(algo, depth)
+        _, peak = _traced_bytes(lambda: algo.get_best_choice(start, start.current_player))
+        search_peaks[entry] = peak
+
+    return {
+        "board_bytes": board_bytes / count,
+        "search_board_bytes": small_stack,
+        "search_board_bytes_per_ply": (large_stack - small_stack) / plies,
+        "tt_entry_bytes": TranspositionTable.ENTRY_BYTES,
+        "tt_slots_per_mb": slots,
+        "mcts_node_bytes": mcts.tree.memory_bytes() / len(mcts.tree),
+        "search_peak_bytes": search_peaks,
+    }
+
+# --- Sweeps ---
+
+def _random_playouts(initial_seeds: int, board_size: int, games: int, seed: int) -> tuple[int, int]:
+    """Plays random games with `Board`. Returns (moves played, legal move lists generated)."""
+    rng = random.Random(seed)
+    moves = generated = 0
+    for _ in range(games):
+        board = Board(initial_seeds, board_size)
+        while board.game_status == GameStatus.ONGOING:
+            legal_moves = board.get_legal_moves()
+            generated += 1
+            board = board.make_move(rng.choice(legal_moves))
+            moves += 1
+    return moves, generated
+
+def run_sweep(
+    board_sizes=(3, 5, 7, 9), seed_counts=(3, 5, 7), depth: int = 6, games: int = 50
+) -> list[dict]:
+    rows = []
+    for board_size in board_sizes:
+        for initial_seeds in seed_counts:
+            (moves, _), playout_seconds = _timed(_random_playouts, initial_seeds, board_size, games, 0)
+            board = Board(initial_seeds, board_size)
+            algo = MinimaxAlgo(depth)
+            _, search_seconds = _timed(algo.get_best_choice, board, board.current_player)
+            rows.append({
+                "board_size": board_size,
+                "initial_seeds": initial_seeds,
+                "playout_moves": moves,
+                "moves_per_second": round(moves / playout_seconds),
+                "average_game_length": moves / games,
+                "search_depth": depth,
+                "search_nodes": algo.nodes,
+                "search_nodes_per_second": round(algo.nodes / search_seconds) if search_seconds else None,
+            })
+    return rows
+
+def run(sections=SECTIONS, depth: int = 7, perft_depth: int | None = None) -> dict:
+    results = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+            "depth": depth,
+        }
+    }
+    if "perft" in sections:
+        results["perft"] = run_perft(perft_depth)
+    if "minimax" in sections:
+        results["minimax"] = run_minimax_check()
+    if "search" in sections:
+        results["search"] = run_search(depth)
+    if "memory" in sections:
+        results["memory"] = run_memory(depth)
+    if "sweep" in sections:
+        results["sweep"] = run_sweep()
+    return results
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark Congklak move generation and search.")
+    parser.add_argument("--sections", nargs="+", choices=SECTIONS, default=list(SECTIONS))
+    parser.add_argument("--depth", type=int, default=7, help="Search depth for the minimax entries")
+    parser.add_argument("--perft-depth", type=int, help="Deepest perft to run (default: every reference count)")
+    parser.add_argument("--out", help="JSON file for the results (default: stdout)")
+    args = parser.parse_args(argv)
+
+    results = run(args.sections, args.depth, args.perft_depth)
+    text = json.dumps(results, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    failures = [row for row in results.get("perft", []) if not row["ok"]]
+    for row in failures:
+        print(
+            f"perft mismatch: {row['position']} depth {row['depth']}: expected {row['expected']}, "
+            f"Board {row['board']}, SearchBoard {row['search_board']}",
+            file=sys.stderr,
+        )
+    mismatches = [row for row in results.get("minimax", []) if not row["ok"]]
+    for row in mismatches:
+        print(f"minimax mismatch: {row['engine']} with {row['ordering']}: {row['mismatch']}", file=sys.stderr)
+    return 1 if failures or mismatches else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,4 +1,7 @@
+from array import array
 from enum import Enum
+from collections import deque
+from functools import lru_cache
 
 # --- Enums (Unchanged) ---
 class PlayerID(Enum):
@@ -11,6 +14,153 @@ class GameStatus(Enum):
     PLAYER_TWO_WINS = 2
     DRAW = 3
 
+# GameStatus values as plain ints, for the rules kernel and search code
+ONGOING = GameStatus.ONGOING.value
+PLAYER_ONE_WINS = GameStatus.PLAYER_ONE_WINS.value
+PLAYER_TWO_WINS = GameStatus.PLAYER_TWO_WINS.value
+DRAW = GameStatus.DRAW.value
+
+# --- Zobrist Hashing ---
+# One random 64-bit key per (board_size, pit, seed count), generated on demand
+# from a fixed seed so that hashes are stable across runs and processes.
+# An empty pit contributes nothing, so only occupied pits need a key.
+ZOBRIST_SIDE_TO_MOVE = 0x9E3779B97F4A7C15  # XOR-ed in when Player 2 is to move
+_zobrist_keys = {}
+
+def _splitmix64(x):
+    x = (x + 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & 0xFFFFFFFFFFFFFFFF
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & 0xFFFFFFFFFFFFFFFF
+    return x ^ (x >> 31)
+
+def zobrist_keys(board_size, num_seeds):
+    """
+    Returns a flat list of keys where `keys[pit * (num_seeds + 1) + seeds]` is
+    `zobrist_key(board_size, pit, seeds)`, for games with `num_seeds` seeds in total.
+    """
+    return [
+        zobrist_key(board_size, pit, seeds)
+        for pit in range(2 * board_size + 2)
+        for seeds in range(num_seeds + 1)
+    ]
+
+def zobrist_key(board_size, pit, seeds):
+    """Returns the Zobrist key for `seeds` seeds sitting in `pit`."""
+    if seeds == 0:
+        return 0
+    keys = _zobrist_keys.setdefault((board_size, pit), [0])
+    while len(keys) <= seeds:
+        keys.append(_splitmix64((board_size << 48) | (pit << 32) | len(keys)))
+    return keys[seeds]
+
+# --- Rules Kernel ---
+# The rules live in these functions so that `Board` and `SearchBoard` share them.
+# They work in place on any mutable sequence of seed counts (a list or an
+# array). Sides are ints here: 0 for Player 1, 1 for Player 2.
+
+@lru_cache(maxsize=None)
+def sowing_geometry(board_size, side):
+    """
+    Precomputed pit geometry for `side` (0 or 1) on a board of `board_size`.
+
+    Returns a tuple (cycle, position, opposite, own_silo, skipped_silo):
+    - cycle: the 2 * board_size + 1 pits the side sows into, in sowing order
+      starting from pit 0, repeated twice so that a run of sown pits never
+      has to wrap around.
+    - position: the index in `cycle` of each pit (-1 for the skipped silo).
+    - opposite: the pit facing each hole (-1 for the silos).
+    """
+    num_pits = 2 * board_size + 2
+    own_silo = board_size if side == 0 else num_pits - 1
+    skipped_silo = num_pits - 1 if side == 0 else board_size
+    cycle = tuple(pit for pit in range(num_pits) if pit != skipped_silo)
+    position = tuple(cycle.index(pit) if pit != skipped_silo else -1 for pit in range(num_pits))
+    opposite = tuple(
+        (2 * board_size) - pit if pit not in (board_size, num_pits - 1) else -1
+        for pit in range(num_pits)
+    )
+    return cycle + cycle, position, opposite, own_silo, skipped_silo
+
+# Build the tables for the standard 7-hole board at startup
+for _side in (0, 1):
+    sowing_geometry(7, _side)
+
+def sow_move(pits, board_size, side, hole_index):
+    """
+    Sows the seeds of the side's hole `hole_index`, including relay sowing and
+    capture. Returns True if the last seed landed in the side's own silo, which
+    gives that side another turn.
+
+    Seeds are sown lap by lap: every full lap of the 2 * board_size + 1 active
+    pits adds one seed to each of them, so a hole of any size costs at most one
+    pass over the board plus the leftover seeds.
+    """
+    cycle, position, opposite, own_silo, _ = sowing_geometry(board_size, side)
+    cycle_length = len(position) - 1
+    holes_start = 0 if side == 0 else board_size + 1
+
+    last_sown_index = hole_index + holes_start
+    while True:
+        seeds_to_sow = pits[last_sown_index]
+        pits[last_sown_index] = 0
+        start = position[last_sown_index]
+
+        laps, seeds_to_sow = divmod(seeds_to_sow, cycle_length)
+        if laps:
+            for k in range(cycle_length):
+                pits[cycle[k]] += laps
+        for k in range(start + 1, start + seeds_to_sow + 1):
+            pits[cycle[k]] += 1
+        last_sown_index = cycle[start + seeds_to_sow]
+
+        # If the last seed lands in a non-empty hole (now > 1), continue sowing
+        if pits[last_sown_index] <= 1 or last_sown_index == own_silo:
+            break
+
+    # Capture: the last seed landed in an empty hole on the mover's own side
+    if (
+        pits[last_sown_index] == 1
+        and holes_start <= last_sown_index < holes_start + board_size
+    ):
+        opposite_index = opposite[last_sown_index]
+        if pits[opposite_index] > 0:
+            pits[own_silo] += pits[opposite_index] + 1
+            pits[opposite_index] = 0
+            pits[last_sown_index] = 0
+
+    return last_sown_index == own_silo
+
+def settle_game_status(pits, board_size):
+    """
+    Ends the game if either side has no seeds left in its holes, sweeping the
+    remaining seeds into their owner's silo. Returns the GameStatus value.
+    """
+    p1_silo = board_size
+    p2_silo = 2 * board_size + 1
+    p1_remaining = sum(pits[0:p1_silo])
+    p2_remaining = sum(pits[p1_silo + 1:p2_silo])
+    if p1_remaining and p2_remaining:
+        return ONGOING
+
+    # Game ends, sweep remaining seeds into silos
+    for i in range(p2_silo):
+        pits[i] = 0 if i != p1_silo else pits[i] + p1_remaining
+    pits[p2_silo] += p2_remaining
+
+    # Determine winner
+    if pits[p1_silo] > pits[p2_silo]:
+        return PLAYER_ONE_WINS
+    elif pits[p2_silo] > pits[p1_silo]:
+        return PLAYER_TWO_WINS
+    else:
+        return DRAW
+
+# --- Macro Moves ---
+# Mid-turn positions expanded per turn by `SearchBoard.macro_moves`. Most turns
+# need one or a few, but the free-turn chains of the opening branch into
+# millions of outcomes.
+MACRO_EXPANSION_LIMIT = 16
+
 # --- The Core Game Engine: Board Class ---
 class Board:
     def __init__(self, initial_seeds=7, board_size=7):
@@ -25,13 +175,38 @@ class Board:
         )
         self.current_player = PlayerID.PLAYER_ONE
         self.game_status = GameStatus.ONGOING
+        self._pits_hash = self._compute_pits_hash()
+
+    def _compute_pits_hash(self):
+        """Hashes the seed counts from scratch."""
+        pits_hash = 0
+        for pit, seeds in enumerate(self.board):
+            pits_hash ^= zobrist_key(self.board_size, pit, seeds)
+        return pits_hash
+
+    @property
+    def zobrist_hash(self):
+        """
+        64-bit Zobrist hash of the seed counts and the player to move.
+        It is updated incrementally by `make_move`; call `refresh_hash` after
+        editing `board` by hand.
+        """
+        if self.current_player == PlayerID.PLAYER_TWO:
+            return self._pits_hash ^ ZOBRIST_SIDE_TO_MOVE
+        return self._pits_hash
+
+    def refresh_hash(self):
+        self._pits_hash = self._compute_pits_hash()
 
     def clone(self):
         """Creates a deep copy of the board state."""
-        new_board = Board(0, self.board_size)
+        # Skips __init__, which would hash a board that is about to be replaced
+        new_board = Board.__new__(Board)
+        new_board.board_size = self.board_size
         new_board.board = list(self.board)
         new_board.current_player = self.current_player
         new_board.game_status = self.game_status
+        new_board._pits_hash = self._pits_hash
         return new_board
 
     def get_player_silo_index(self, player_id):
@@ -56,6 +231,28 @@ class Board:
                 legal_moves.append(i - player_holes_range.start)
         return legal_moves
 
+    def get_macro_moves(self, max_expanded=MACRO_EXPANSION_LIMIT):
+        """
+        Returns the distinct outcomes of the current player's whole turn, free
+        turns included, as a list of (moves, board): one entry per distinct
+        position reached, with a move sequence that reaches it.
+
+        With a finite `max_expanded` (the default), long free-turn chains are
+        cut short. Some entries then stop mid-turn, with `board.current_player`
+        still the same player. They are not positions where the turn ends.
+        Every other entry passes the move to the opponent or ends the game. Pass
+        `math.inf` to expand every turn completely, so that all entries are
+        ends of the turn. See `SearchBoard.macro_moves` for the order.
+        """
+        search_board = SearchBoard.from_board(self)
+        outcomes = []
+        for moves in search_board.macro_moves(max_expanded):
+            board = self
+            for move in moves:
+                board = board.make_move(move)
+            outcomes.append((moves, board))
+        return outcomes
+
     def make_move(self, hole_index):
         """
         Performs a move for the current player.
@@ -69,104 +266,38 @@ class Board:
 
         # 2. Create a new board state to modify (Immutability)
         next_board = self.clone()
-        player_id = next_board.current_player
-        player_holes_range = next_board.get_player_holes_range(player_id)
-        real_index = hole_index + player_holes_range.start
-
-        # 3. Perform the sowing logic
-        # print('hole_index:', hole_index)
-        # print('real_index:', real_index)
-        
-        last_sown_index = real_index
-        seeds_to_sow = next_board.board[real_index]
-        next_board.board[real_index] = 0
-
-        while seeds_to_sow > 0:
-            last_sown_index = (last_sown_index + 1) % len(next_board.board)
-            if last_sown_index == next_board.get_player_silo_index(
-                PlayerID.PLAYER_TWO
-                if player_id == PlayerID.PLAYER_ONE
-                else PlayerID.PLAYER_ONE
-            ):
-                continue
-            next_board.board[last_sown_index] += 1
-            seeds_to_sow -= 1
+        side = 0 if self.current_player == PlayerID.PLAYER_ONE else 1
 
-        # If the last seed lands in a non-empty hole (now > 1), continue sowing
-        while next_board.board[last_sown_index] > 1 and last_sown_index != next_board.get_player_silo_index(player_id):
-            seeds_to_sow = next_board.board[last_sown_index]
-            next_board.board[last_sown_index] = 0
-            while seeds_to_sow > 0:
-                last_sown_index = (last_sown_index + 1) % len(next_board.board)
-                if last_sown_index == next_board.get_player_silo_index(
-                    PlayerID.PLAYER_TWO
-                    if player_id == PlayerID.PLAYER_ONE
-                    else PlayerID.PLAYER_ONE
-                ):
-                    continue
-                next_board.board[last_sown_index] += 1
-                seeds_to_sow -= 1
-
-        # 4. Handle Capture ("Stealing") Logic
-        player_silo_index = next_board.get_player_silo_index(player_id)
-        if (
-            next_board.board[last_sown_index] == 1
-            and last_sown_index in player_holes_range
-        ):
-            opposite_index = (2 * self.board_size) - last_sown_index
-            if next_board.board[opposite_index] > 0:
-                stolen_seeds = next_board.board[opposite_index]
-                next_board.board[opposite_index] = 0
-                next_board.board[last_sown_index] = 0
-                next_board.board[player_silo_index] += stolen_seeds + 1
-
-        # 5. Determine the next player
-        if last_sown_index == player_silo_index:
+        # 3. Sow the seeds (with relay sowing) and handle capture ("stealing")
+        free_turn = sow_move(next_board.board, self.board_size, side, hole_index)
+
+        # 4. Determine the next player
+        if free_turn:
             # Player gets another turn, current_player remains the same
             pass
         else:
             next_board.current_player = (
                 PlayerID.PLAYER_TWO
-                if player_id == PlayerID.PLAYER_ONE
+                if self.current_player == PlayerID.PLAYER_ONE
                 else PlayerID.PLAYER_ONE
             )
 
-        # 6. Check for game over condition and return the new state
+        # 5. Check for game over condition and return the new state
         next_board._check_and_update_game_status()
-        
+
+        # 6. Update the hash for the pits whose seed count changed
+        for pit, (old_seeds, new_seeds) in enumerate(zip(self.board, next_board.board)):
+            if old_seeds != new_seeds:
+                next_board._pits_hash ^= (
+                    zobrist_key(self.board_size, pit, old_seeds)
+                    ^ zobrist_key(self.board_size, pit, new_seeds)
+                )
+
         return next_board
 
     def _check_and_update_game_status(self):
         """Checks if the game has ended and updates the status and final scores."""
-        p1_holes_range = self.get_player_holes_range(PlayerID.PLAYER_ONE)
-        p2_holes_range = self.get_player_holes_range(PlayerID.PLAYER_TWO)
-
-        p1_side_empty = all(self.board[i] == 0 for i in p1_holes_range)
-        p2_side_empty = all(self.board[i] == 0 for i in p2_holes_range)
-
-        if p1_side_empty or p2_side_empty:
-            # Game ends, sweep remaining seeds into silos
-            if p1_side_empty:
-                p2_remaining = sum(self.board[i] for i in p2_holes_range)
-                self.board[self.get_player_silo_index(PlayerID.PLAYER_TWO)] += p2_remaining
-                for i in p2_holes_range:
-                    self.board[i] = 0
-            if p2_side_empty:
-                p1_remaining = sum(self.board[i] for i in p1_holes_range)
-                self.board[self.get_player_silo_index(PlayerID.PLAYER_ONE)] += p1_remaining
-                for i in p1_holes_range:
-                    self.board[i] = 0
-
-            # Determine winner
-            p1_score = self.board[self.get_player_silo_index(PlayerID.PLAYER_ONE)]
-            p2_score = self.board[self.get_player_silo_index(PlayerID.PLAYER_TWO)]
-
-            if p1_score > p2_score:
-                self.game_status = GameStatus.PLAYER_ONE_WINS
-            elif p2_score > p1_score:
-                self.game_status = GameStatus.PLAYER_TWO_WINS
-            else:
-                self.game_status = GameStatus.DRAW
+        self.game_status = GameStatus(settle_game_status(self.board, self.board_size))
 
     def __str__(self):
         p2_holes_range = self.get_player_holes_range(PlayerID.PLAYER_TWO)
@@ -193,3 +324,250 @@ class Board:
             f"      {p1_indices}\n"
             f"--- Player 1 (Holes {0}-{self.board_size-1}) ---\n"
         )
+
+# --- Search Board: Mutable Board For Tree Search ---
+class SearchBoard:
+    """
+    Mutable board for tree search, with in-place `apply` and `undo`.
+
+    `Board.make_move` validates the move and copies the whole board, which is
+    right for the public API but too slow for visiting millions of nodes. A
+    SearchBoard keeps the seed counts in a flat array, the side to move as an
+    int (0 for Player 1, 1 for Player 2) and the status as a GameStatus value.
+    `apply` saves the state it overwrites into a preallocated undo stack, so
+    walking the tree creates no new boards or lists.
+
+    The Zobrist hash is only kept up to date with `track_hash=True`, since
+    searches without a transposition table do not need it. With
+    `track_eval=True`, `eval_terms` holds [P1 seeds in holes, P2 seeds in
+    holes, P1 stealing potential, P2 stealing potential], updated by `apply`
+    only for the hole pairs whose seed counts changed. The stealing potential
+    of a side is the sum of the seeds facing its empty holes.
+
+    It also has the read-only API used by the evaluation functions
+    (`board`, `board_size`, `current_player`, `game_status`,
+    `get_player_silo_index`, `get_player_holes_range`), so they work on either board.
+    """
+    __slots__ = (
+        "board_size", "board", "side", "status", "pits_hash", "ply", "num_seeds",
+        "track_hash", "track_eval", "eval_terms",
+        "_num_pits", "_key_stride", "_keys",
+        "_saved_pits", "_saved_sides", "_saved_statuses", "_saved_hashes", "_saved_terms",
+    )
+
+    def __init__(
+        self, board_size, pits, side=0, status=ONGOING, max_ply=64, track_hash=True, track_eval=False
+    ):
+        self.board_size = board_size
+        self.board = array("i", pits)
+        self.side = side
+        self.status = status
+        self.ply = 0
+        self.track_hash = track_hash
+        self._num_pits = len(self.board)
+        self._saved_pits = array("i", [0]) * (max_ply * self._num_pits)
+        self._saved_sides = array("b", [0]) * max_ply
+        self._saved_statuses = array("b", [0]) * max_ply
+        self._saved_hashes = array("Q", [0]) * max_ply
+        self._saved_terms = array("i", [0]) * (max_ply * 4)
+
+        self.track_eval = track_eval
+        self.eval_terms = array("i", [0, 0, 0, 0])
+        if track_eval:
+            for i in range(board_size):
+                self._add_pair_terms(self.board[i], self.board[(2 * board_size) - i], 1)
+
+        # Seeds are never created or destroyed, so the key table is fixed-size
+        num_seeds = self.num_seeds = sum(self.board)
+        self._key_stride = num_seeds + 1
+        self._keys = zobrist_keys(board_size, num_seeds) if track_hash else None
+        self.pits_hash = self._compute_pits_hash() if track_hash else 0
+
+    @classmethod
+    def from_board(cls, board, max_ply=64, track_hash=True, track_eval=False):
+        return cls(
+            board.board_size,
+            board.board,
+            0 if board.current_player == PlayerID.PLAYER_ONE else 1,
+            board.game_status.value,
+            max_ply,
+            track_hash,
+            track_eval,
+        )
+
+    def to_board(self):
+        """Returns an immutable `Board` with the same state."""
+        board = Board(0, self.board_size)
+        board.board = list(self.board)
+        board.current_player = self.current_player
+        board.game_status = self.game_status
+        board.refresh_hash()
+        return board
+
+    def _compute_pits_hash(self):
+        pits_hash = 0
+        for pit, seeds in enumerate(self.board):
+            pits_hash ^= zobrist_key(self.board_size, pit, seeds)
+        return pits_hash
+
+    @property
+    def current_player(self):
+        return PlayerID.PLAYER_ONE if self.side == 0 else PlayerID.PLAYER_TWO
+
+    @property
+    def game_status(self):
+        return GameStatus(self.status)
+
+    @property
+    def zobrist_hash(self):
+        pits_hash = self.pits_hash if self.track_hash else self._compute_pits_hash()
+        return pits_hash ^ ZOBRIST_SIDE_TO_MOVE if self.side else pits_hash
+
+    def get_player_silo_index(self, player_id):
+        return (
+            self.board_size
+            if player_id == PlayerID.PLAYER_ONE
+            else self._num_pits - 1
+        )
+
+    def get_player_holes_range(self, player_id):
+        if player_id == PlayerID.PLAYER_ONE:
+            return range(0, self.board_size)
+        else:
+            return range(self.board_size + 1, self._num_pits - 1)
+
+    def legal_moves(self):
+        """Returns the legal moves (hole indices) for the side to move."""
+        start = 0 if self.side == 0 else self.board_size + 1
+        pits = self.board
+        return [i for i in range(self.board_size) if pits[start + i]]
+
+    def macro_moves(self, max_expanded=MACRO_EXPANSION_LIMIT):
+        """
+        Expands the whole turn of the side to move, following free turns, into
+        the move sequences (tuples) that reach each distinct position where the
+        turn ends: the other side is to move or the game is over. A position
+        reached by several sequences, at the end of the turn or in the middle,
+        is only listed or expanded once, so every outcome appears once
+        whatever the order of its moves.
+
+        Free-turn chains can branch into millions of outcomes, so at most
+        `max_expanded` mid-turn positions are expanded, shortest sequences
+        first. Sequences to the mid-turn positions left over are listed as
+        they are, with the same side still to move, so every outcome of the
+        turn stays reachable from some listed position.
+
+        Outcomes are sorted by the mover's silo afterwards, most seeds first,
+        then in the order found. The board is left unchanged.
+        """
+        side = self.side
+        silo = self.get_player_silo_index(self.current_player)
+        outcomes = {}
+        mid_turn = set()  # Mid-turn positions queued so far
+        num_expanded = 0
+        queue = deque([()])
+        while queue:
+            prefix = queue.popleft()
+            for move in prefix:
+                self.apply(move)
+            if prefix and num_expanded >= max_expanded:
+                outcomes[self.zobrist_hash] = (-self.board[silo], len(outcomes), prefix)
+            else:
+                num_expanded += 1
+                for move in self.legal_moves():
+                    self.apply(move)
+                    key = self.zobrist_hash
+                    if self.status or self.side != side:
+                        if key not in outcomes:
+                            outcomes[key] = (-self.board[silo], len(outcomes), prefix + (move,))
+                    elif key not in mid_turn:
+                        mid_turn.add(key)
+                        queue.append(prefix + (move,))
+                    self.undo()
+            for _ in prefix:
+                self.undo()
+        return [moves for _, _, moves in sorted(outcomes.values())]
+
+    def apply(self, hole_index):
+        """Plays `hole_index` for the side to move, in place. The move is not validated."""
+        num_pits = self._num_pits
+        ply = self.ply
+        if ply == len(self._saved_sides):
+            self._grow()
+        base = ply * num_pits
+        saved_pits = self._saved_pits
+        pits = self.board
+        saved_pits[base:base + num_pits] = pits
+        self._saved_sides[ply] = self.side
+        self._saved_statuses[ply] = self.status
+        self._saved_hashes[ply] = self.pits_hash
+        if self.track_eval:
+            self._saved_terms[ply * 4:ply * 4 + 4] = self.eval_terms
+        self.ply = ply + 1
+
+        board_size = self.board_size
+        if not sow_move(pits, board_size, self.side, hole_index):
+            self.side ^= 1
+        self.status = settle_game_status(pits, board_size)
+
+        if self.track_hash:
+            keys = self._keys
+            stride = self._key_stride
+            pits_hash = self.pits_hash
+            for pit in range(num_pits):
+                new_seeds = pits[pit]
+                old_seeds = saved_pits[base + pit]
+                if old_seeds != new_seeds:
+                    pits_hash ^= keys[pit * stride + old_seeds] ^ keys[pit * stride + new_seeds]
+            self.pits_hash = pits_hash
+
+        if self.track_eval:
+            # Only the pairs of facing holes that changed are re-counted
+            last_hole = 2 * board_size
+            p1_seeds = p2_seeds = p1_steal = p2_steal = 0
+            for i in range(board_size):
+                j = last_hole - i
+                old_i = saved_pits[base + i]
+                old_j = saved_pits[base + j]
+                new_i = pits[i]
+                new_j = pits[j]
+                if old_i != new_i or old_j != new_j:
+                    p1_seeds += new_i - old_i
+                    p2_seeds += new_j - old_j
+                    p1_steal += (0 if new_i else new_j) - (0 if old_i else old_j)
+                    p2_steal += (0 if new_j else new_i) - (0 if old_j else old_i)
+            terms = self.eval_terms
+            terms[0] += p1_seeds
+            terms[1] += p2_seeds
+            terms[2] += p1_steal
+            terms[3] += p2_steal
+
+    def _add_pair_terms(self, p1_seeds, p2_seeds, sign):
+        """Adds (sign 1) or removes (sign -1) one pair of facing holes from `eval_terms`."""
+        terms = self.eval_terms
+        terms[0] += sign * p1_seeds
+        terms[1] += sign * p2_seeds
+        if p1_seeds == 0:
+            terms[2] += sign * p2_seeds
+        if p2_seeds == 0:
+            terms[3] += sign * p1_seeds
+
+    def undo(self):
+        """Takes back the last applied move."""
+        self.ply -= 1
+        ply = self.ply
+        base = ply * self._num_pits
+        self.board[:] = self._saved_pits[base:base + self._num_pits]
+        self.side = self._saved_sides[ply]
+        self.status = self._saved_statuses[ply]
+        self.pits_hash = self._saved_hashes[ply]
+        if self.track_eval:
+            self.eval_terms[:] = self._saved_terms[ply * 4:ply * 4 + 4]
+
+    def _grow(self):
+        """Doubles the undo stack once a line gets longer than it."""
+        self._saved_pits.extend(array("i", [0]) * len(self._saved_pits))
+        self._saved_sides.extend(array("b", [0]) * len(self._saved_sides))
+        self._saved_statuses.extend(array("b", [0]) * len(self._saved_statuses))
+        self._saved_hashes.extend(array("Q", [0]) * len(self._saved_hashes))
+        self._saved_terms.extend(array("i", [0]) * len(self._saved_terms))
@@ -0,0 +1,388 @@
+"""
+Game records: a compact file format for finished (or unfinished) games,
+bulk replay and batch analysis.
+
+A record file is an 8-byte header followed by one record per game:
+
+    GAME_HEADER  initial seeds, board size, final GameStatus, opening plies,
+                 number of moves, metadata length
+    metadata     JSON object in UTF-8, e.g. the player names (may be empty)
+    moves        two moves per byte, low nibble first
+
+so a typical 60-move game takes well under 100 bytes. The first
+`opening_plies` moves are a set opening that nobody chose, e.g. the random
+openings of `arena.py`; they are replayed but not analyzed.
+
+Positions are rebuilt lazily with `Board.make_move`, and `analyze` re-scores
+every position of every game with an `Algo` over a process pool, yielding one
+annotation per move as the games finish:
+
+    python game_record.py convert results.jsonl games.rec
+    python game_record.py analyze games.rec --algo minimax-v2 --depth 6 --flagged-only
+
+Scores are those of the algo, from Player 1's point of view: seed differences
+for "minimax", weighted ones for "minimax-v2" and win rates for MCTS. The
+--blunder and --swing defaults follow the algo.
+"""
+import argparse
+import copy
+import json
+import math
+import multiprocessing
+import os
+import struct
+import sys
+import time
+from game_components import Board, PlayerID, GameStatus
+from algo import Algo
+
+MAGIC = b"CGGR"
+VERSION = 1
+HEADER = struct.Struct("<4sH2x")  # magic, version
+# initial seeds, board size, status, opening plies, number of moves, metadata length
+GAME_HEADER = struct.Struct("<BBBBHH")
+# Moves are stored as 4-bit hole indices
+MAX_BOARD_SIZE = 16
+# Initial seeds and opening plies are stored in one byte each
+MAX_HEADER_BYTE = 255
+
+# --- Records ---
+
+def check_fits(initial_seeds: int, board_size: int, opening_plies: int = 0):
+    """Raises ValueError if games with these settings do not fit in a game record."""
+    if not 1 <= board_size <= MAX_BOARD_SIZE:
+        raise ValueError(f"Board size {board_size} does not fit in a game record (1 to {MAX_BOARD_SIZE})")
+    if not 0 <= initial_seeds <= MAX_HEADER_BYTE:
+        raise ValueError(f"{initial_seeds} initial seeds do not fit in a game record (0 to {MAX_HEADER_BYTE})")
+    if not 0 <= opening_plies <= MAX_HEADER_BYTE:
+        raise ValueError(f"{opening_plies} opening plies do not fit in a game record (0 to {MAX_HEADER_BYTE})")
+
+class GameRecord:
+    """The starting parameters and move list of one game, plus free-form metadata."""
+    def __init__(
+        self,
+        moves: list[int],
+        initial_seeds: int = 7,
+        board_size: int = 7,
+        status: GameStatus = GameStatus.ONGOING,
+        opening_plies: int = 0,
+        meta: dict | None = None,
+    ):
+        check_fits(initial_seeds, board_size, opening_plies)
+        self.moves = list(moves)
+        self.initial_seeds = initial_seeds
+        self.board_size = board_size
+        self.status = status
+        self.opening_plies = opening_plies
+        self.meta = meta or {}
+
+    def __len__(self):
+        return len(self.moves)
+
+    @classmethod
+    def from_arena_result(cls, result: dict) -> "GameRecord":
+        """Converts one result line of `arena.py`, keeping the player names and opening seed."""
+        meta = {"player_one": result["player_one"], "player_two": result["player_two"]}
+        for key in ("game", "opening_seed"):
+            if key in result:
+                meta[key] = result[key]
+        return cls(
+            result["opening"] + result["moves"],
+            result["initial_seeds"],
+            result["board_size"],
+            GameStatus[result["status"]],
+            len(result["opening"]),
+            meta,
+        )
+
+    def positions(self):
+        """
+        Yields (ply, board, move) for every move, where `board` is the position
+        the move was played from. Boards are built one move at a time, so
+        stopping early costs nothing for the rest of the game.
+        """
+        board = Board(self.initial_seeds, self.board_size)
+        for ply, move in enumerate(self.moves):
+            yield ply, board, move
+            board = board.make_move(move)
+
+    def final_board(self) -> Board:
+        board = Board(self.initial_seeds, self.board_size)
+        for move in self.moves:
+            board = board.make_move(move)
+        return board
+
+    def pack(self) -> bytes:
+        meta = json.dumps(self.meta, separators=(",", ":")).encode() if self.meta else b""
+        moves = bytearray((len(self.moves) + 1) // 2)
+        for ply, move in enumerate(self.moves):
+            moves[ply // 2] |= move << (4 * (ply % 2))
+        return GAME_HEADER.pack(
+            self.initial_seeds, self.board_size, self.status.value,
+            self.opening_plies, len(self.moves), len(meta),
+        ) + meta + moves
+
+    @classmethod
+    def unpack_from(cls, f) -> "GameRecord | None":
+        """Reads the next record from the binary file `f`, or returns None at the end."""
+        header = f.read(GAME_HEADER.size)
+        if not header:
+            return None
+        if len(header) != GAME_HEADER.size:
+            raise ValueError("Truncated game record")
+        initial_seeds, board_size, status, opening_plies, num_moves, meta_size = GAME_HEADER.unpack(header)
+        meta = f.read(meta_size)
+        packed = f.read((num_moves + 1) // 2)
+        if len(meta) != meta_size or len(packed) != (num_moves + 1) // 2:
+            raise ValueError("Truncated game record")
+        moves = [(packed[ply // 2] >> (4 * (ply % 2))) & 0xF for ply in range(num_moves)]
+        return cls(
+            moves, initial_seeds, board_size, GameStatus(status),
+            opening_plies, json.loads(meta) if meta else {},
+        )
+
+# --- Files ---
+
+class RecordWriter:
+    """Appends game records to a new record file."""
+    def __init__(self, path: str):
+        self.path = path
+        self.records_written = 0
+        self._file = open(path, "wb")
+        self._file.write(HEADER.pack(MAGIC, VERSION))
+
+    def write(self, record: GameRecord):
+        self._file.write(record.pack())
+        self.records_written += 1
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def write_records(records, path: str) -> int:
+    """Writes `records` to `path` and returns how many were written."""
+    with RecordWriter(path) as writer:
+        for record in records:
+            writer.write(record)
+    return writer.records_written
+
+def read_records(path: str):
+    """Yields the records of a record file one at a time."""
+    with open(path, "rb") as f:
+        header = f.read(HEADER.size)
+        if len(header) != HEADER.size or HEADER.unpack(header) != (MAGIC, VERSION):
+            raise ValueError(f"{path} is not a version {VERSION} Congklak game record file")
+        while (record := GameRecord.unpack_from(f)) is not None:
+            yield record
+
+def replay(records):
+    """Yields (game, ply, board, move) for every move of every record, lazily."""
+    for game, record in enumerate(records):
+        for ply, board, move in record.positions():
+            yield game, ply, board, move
+
+# --- Analysis ---
+
+# Defaults suit the seed-difference scores of the "minimax" entry
+BLUNDER_THRESHOLD = 4
+SWING_THRESHOLD = 8
+# (blunder, swing) defaults of the command line per `available_algos` entry
+THRESHOLDS = {
+    "minimax": (BLUNDER_THRESHOLD, SWING_THRESHOLD),
+    "minimax-v2": (40, 80),  # Seeds in the store weigh 10
+    "mcts": (0.15, 0.3),  # Win rates
+}
+
+# Each worker scores positions with its own copy of the algo, so `_score` can
+# lower its depth for one position without affecting the other workers.
+_worker_algo = None
+_worker_time_limit = None
+
+def _init_worker(algo: Algo, time_limit: float | None):
+    global _worker_algo, _worker_time_limit
+    _worker_algo = algo
+    _worker_time_limit = time_limit
+
+def _score(board: Board, max_depth: int | None = None) -> tuple:
+    """
+    (score for Player 1, best move for the side to move, depth) from the
+    worker's algo. `max_depth` caps the depth of engines with a `depth`.
+    """
+    algo = _worker_algo
+    if _worker_time_limit is not None:
+        if max_depth is not None:
+            return algo.get_best_choice_within(board, PlayerID.PLAYER_ONE, _worker_time_limit, max_depth)
+        return algo.get_best_choice_within(board, PlayerID.PLAYER_ONE, _worker_time_limit)
+    depth = getattr(algo, "depth", None)
+    if max_depth is None or depth is None:
+        return (*algo.get_best_choice(board, PlayerID.PLAYER_ONE), depth)
+    algo.depth = max_depth
+    try:
+        return (*algo.get_best_choice(board, PlayerID.PLAYER_ONE), max_depth)
+    finally:
+        algo.depth = depth
+
+def _loss(before, after, player: PlayerID) -> float:
+    """How much the position got worse for `player`, in Player 1 scores."""
+    if before == after:
+        return 0.0
+    return before - after if player == PlayerID.PLAYER_ONE else after - before
+
+def _json_score(score):
+    return score if math.isfinite(score) else str(score)
+
+def _analyze_game(job) -> list[dict]:
+    game, record, blunder_threshold, swing_threshold = job
+    has_depth = hasattr(_worker_algo, "depth")
+    boards = [board for _, board, _ in record.positions()]
+    if not boards:
+        return []
+    boards.append(boards[-1].make_move(record.moves[-1]))
+    scores = [None] * len(boards)
+    for ply in range(record.opening_plies, len(boards)):
+        scores[ply] = _score(boards[ply])
+
+    annotations = []
+    for ply in range(record.opening_plies, len(record.moves)):
+        board, move = boards[ply], record.moves[ply]
+        before, best_move, depth = scores[ply]
+        after = scores[ply + 1][0]
+        # The played move is scored one ply shallower than the position it
+        # was played from, as the search that found `best_move` scored it,
+        # so that the loss is not distorted by the horizon moving.
+        if has_depth and depth:
+            played = _score(boards[ply + 1], depth - 1)[0] if move != best_move else before
+        else:
+            played = after
+        loss = _loss(before, played, board.current_player)
+        swing = 0.0 if before == after else after - before
+        tags = []
+        if move != best_move and loss >= blunder_threshold:
+            tags.append("blunder")
+        if abs(swing) >= swing_threshold:
+            tags.append("swing")
+        annotations.append({
+            "game": game,
+            "ply": ply,
+            "player": board.current_player.name,
+            "move": move,
+            "best_move": best_move,
+            "score_before": _json_score(before),
+            "score_played": _json_score(played),
+            "score_after": _json_score(after),
+            "loss": _json_score(loss),
+            "swing": _json_score(swing),
+            "tags": tags,
+        })
+    return annotations
+
+def analyze(
+    records,
+    algo: Algo,
+    workers: int | None = None,
+    time_limit: float | None = None,
+    blunder_threshold: float = BLUNDER_THRESHOLD,
+    swing_threshold: float = SWING_THRESHOLD,
+):
+    """
+    Re-scores every position after the opening of every record with `algo`
+    over a process pool and yields one annotation dict per move, game by game
+    in record order.
+
+    Every position is searched from Player 1's point of view. A move's loss
+    is how much worse its score is than that of the algo's choice for the
+    player who moved; it is a "blunder" if that is at least
+    `blunder_threshold`. A "swing" is a change of at least `swing_threshold`,
+    in either direction, between the scores of consecutive positions, which
+    also catches what the search of the previous position missed.
+
+    Engines with a fixed `depth` score the played move by a search one ply
+    shallower, as their search of the position before did. Others, such as
+    MCTS, score it by the position after it.
+    """
+    jobs = ((game, record, blunder_threshold, swing_threshold) for game, record in enumerate(records))
+    with multiprocessing.Pool(workers, initializer=_init_worker, initargs=(algo, time_limit)) as pool:
+        for annotations in pool.imap(_analyze_game, jobs, chunksize=4):
+            yield from annotations
+
+# --- Command Line ---
+
+def _convert(args):
+    def arena_records():
+        with open(args.results) as f:
+            for line in f:
+                if line.strip():
+                    yield GameRecord.from_arena_result(json.loads(line))
+
+    count = write_records(arena_records(), args.out)
+    print(f"Wrote {count} games to {args.out} ({os.path.getsize(args.out)} bytes)", file=sys.stderr)
+
+def _analyze(args):
+    from main import available_algos
+    from minimax.search import MinimaxSearchAlgo
+
+    algo = copy.deepcopy(available_algos[args.algo])
+    if args.depth is not None and isinstance(algo, MinimaxSearchAlgo):
+        algo.depth = args.depth
+
+    blunder, swing = THRESHOLDS.get(args.algo, (BLUNDER_THRESHOLD, SWING_THRESHOLD))
+    if args.blunder is not None:
+        blunder = args.blunder
+    if args.swing is not None:
+        swing = args.swing
+
+    out = open(args.out, "w") if args.out else sys.stdout
+    moves = flagged = 0
+    start = time.perf_counter()
+    try:
+        for annotation in analyze(
+            read_records(args.records), algo, args.workers, args.time_limit, blunder, swing
+        ):
+            moves += 1
+            flagged += bool(annotation["tags"])
+            if annotation["tags"] or not args.flagged_only:
+                out.write(json.dumps(annotation) + "\n")
+                out.flush()
+    finally:
+        if args.out:
+            out.close()
+    print(
+        f"Analyzed {moves} moves in {time.perf_counter() - start:.1f}s, {flagged} flagged",
+        file=sys.stderr,
+    )
+
+def main(argv=None):
+    from main import available_algos
+
+    parser = argparse.ArgumentParser(description="Convert, replay and analyze Congklak game records.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    convert = commands.add_parser("convert", help="Convert arena.py JSONL results to a record file")
+    convert.add_argument("results", help="JSONL file written by arena.py --out")
+    convert.add_argument("out", help="Record file to write")
+    convert.set_defaults(run=_convert)
+
+    analyze_parser = commands.add_parser("analyze", help="Annotate every move of a record file")
+    analyze_parser.add_argument("records", help="Record file to analyze")
+    analyze_parser.add_argument("--algo", choices=list(available_algos), default="minimax-v2")
+    analyze_parser.add_argument("--depth", type=int, help="Search depth for the minimax entries")
+    analyze_parser.add_argument("--time-limit", type=float, help="Per-position budget in seconds instead of fixed depth")
+    analyze_parser.add_argument("--workers", type=int, default=os.cpu_count())
+    analyze_parser.add_argument("--blunder", type=float,
+                                help="Smallest loss of a blunder, in the algo's scores (default: per algo)")
+    analyze_parser.add_argument("--swing", type=float,
+                                help="Smallest score change that is flagged as a swing (default: per algo)")
+    analyze_parser.add_argument("--flagged-only", action="store_true", help="Only write flagged moves")
+    analyze_parser.add_argument("--out", help="JSONL file for the annotations (default: stdout)")
+    analyze_parser.set_defaults(run=_analyze)
+
+    args = parser.parse_args(argv)
+    args.run(args)
+
+if __name__ == "__main__":
+    main()
@@ -1,28 +1,73 @@
+import sys
 from game_components import Board, PlayerID, GameStatus
 from minimax.minimax_module import MinimaxAlgo
 from minimax.minimax_module_v2 import MinimaxAlgoV2
-from algo import Algo
+from mcts.mcts_module import MCTSAlgo
+from algo import Algo, SearchStats
+from ponder import Ponderer
 
 available_algos = {
     "minimax": MinimaxAlgo(depth=4),
     "minimax-v2": MinimaxAlgoV2(depth=4),
+    "mcts": MCTSAlgo(),
 }
 
 # --- Player Class (Decision Maker) ---
 class Player:
-    def __init__(self, player_id: PlayerID, algo: Algo | None = None):
+    def __init__(self, player_id: PlayerID, algo: Algo | None = None, time_limit: float | None = None):
         self.player_id = player_id
         self.algo = algo
+        # Per-move search budget in seconds, None searches the algo's fixed depth
+        self.time_limit = time_limit
+        # SearchStats of each of this player's moves, when the algo collects them
+        self.move_stats = []
+        # Searches the AI's likely next positions while the opponent is on move
+        self.ponderer = None
+
+    def enable_pondering(self):
+        if self.algo is not None:
+            self.ponderer = Ponderer(self.algo, self.player_id, self.time_limit)
+
+    def ponder(self, board: Board):
+        """
+        Starts pondering on `board`, where the opponent is to move. Pondering
+        that started earlier in the opponent's turn (before a free turn) goes on.
+        """
+        if self.ponderer is not None and not self.ponderer.active:
+            self.ponderer.start(board)
+
+    def stop_pondering(self):
+        if self.ponderer is not None:
+            self.ponderer.stop()
 
     def choose_move(self, board: Board):
         legal_moves = board.get_legal_moves()
         if not legal_moves:
+            self.stop_pondering()
             return None
 
         if self.algo:
             print(f"AI ({self.player_id.name}) is thinking using {self.algo.name}...")
-            best_score, best_move = self.algo.get_best_choice(board, self.player_id)
+            pondered = self.ponderer.take(board) if self.ponderer is not None else None
+            if pondered is not None:
+                best_score, best_move, depth, stats = pondered
+                print("AI had already searched this position while pondering.")
+            else:
+                self.algo.last_stats = None
+                if self.time_limit is not None:
+                    best_score, best_move, depth = self.algo.get_best_choice_within(
+                        board, self.player_id, self.time_limit
+                    )
+                else:
+                    best_score, best_move = self.algo.get_best_choice(board, self.player_id)
+                    depth = None
+                stats = self.algo.last_stats
+            if depth is not None:
+                print(f"AI searched to depth {depth} in {self.time_limit}s.")
             print(f"AI chose move {best_move} with an estimated score of {best_score}.")
+            if stats is not None:
+                self.move_stats.append(stats)
+                print(f"AI stats: {stats.summary()}")
             return best_move
         else:
             # Human player input
@@ -42,8 +87,13 @@ class Player:
 
 # --- Game Orchestrator ---
 class CongklakGame:
-    def __init__(self):
+    def __init__(self, collect_stats: bool = False, ponder: bool = False):
         self.board = Board(initial_seeds=7, board_size=7)
+        # Print search stats per move and per game for the AI players
+        self.collect_stats = collect_stats
+        # Let AI players search while a human opponent is thinking. Not done
+        # against another AI, whose search would then share the interpreter.
+        self.ponder = ponder
         self.players = {
             PlayerID.PLAYER_ONE: Player(PlayerID.PLAYER_ONE),
             PlayerID.PLAYER_TWO: Player(PlayerID.PLAYER_TWO),
@@ -80,6 +130,14 @@ class CongklakGame:
 
         p2_algo = self._select_player_type(PlayerID.PLAYER_TWO)
         self.players[PlayerID.PLAYER_TWO].algo = p2_algo
+
+        if self.collect_stats:
+            for algo in (p1_algo, p2_algo):
+                if algo is not None:
+                    algo.enable_stats()
+        if self.ponder and (p1_algo is None) != (p2_algo is None):
+            for player in self.players.values():
+                player.enable_pondering()
         print("="*20)
 
 
@@ -91,6 +149,9 @@ class CongklakGame:
             current_player_obj = self.players[self.board.current_player]
             print(f"Turn: {current_player_obj.player_id.name}")
 
+            for player in self.players.values():
+                if player is not current_player_obj:
+                    player.ponder(self.board)
             move = current_player_obj.choose_move(self.board)
 
             if move is None:
@@ -104,6 +165,9 @@ class CongklakGame:
 
             self.board = self.board.make_move(move)
 
+        for player in self.players.values():
+            player.stop_pondering()
+
         # Game Over
         print("\n" + "=" * 30)
         print("--- GAME OVER ---")
@@ -113,7 +177,12 @@ class CongklakGame:
         p2_score = self.board.board[self.board.get_player_silo_index(PlayerID.PLAYER_TWO)]
         print(f"Final Score -> Player 1: {p1_score}, Player 2: {p2_score}")
 
+        for player in self.players.values():
+            if player.move_stats:
+                total = SearchStats.total(player.move_stats)
+                print(f"{player.player_id.name} search stats over {len(player.move_stats)} moves: {total.summary()}")
+
 
 if __name__ == "__main__":
-    game = CongklakGame()
+    game = CongklakGame(collect_stats="--stats" in sys.argv[1:], ponder="--ponder" in sys.argv[1:])
     game.play()
\ No newline at end of file
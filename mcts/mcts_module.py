@@ -0,0 +1,308 @@
+import math
+import random
+import time
+from array import array
+from game_components import (
+    Board, SearchBoard, PlayerID, GameStatus, ONGOING, PLAYER_ONE_WINS, PLAYER_TWO_WINS,
+    sow_move, settle_game_status,
+)
+from algo import Algo
+
+# These are tunable parameters.
+DEFAULT_ITERATIONS = 2000
+EXPLORATION = math.sqrt(2)  # UCT exploration constant
+MAX_NODES = 4_000_000
+# How many plies below the old root to look for the new position, enough for
+# our move, the opponent's reply and a few free turns in between.
+REUSE_DEPTH = 6
+
+# The clock and `stop_requested` are read once every DEADLINE_CHECK_MASK + 1 playouts.
+DEADLINE_CHECK_MASK = 15
+
+NO_NODE = -1
+
+# --- Node Store ---
+class NodeStore:
+    """
+    Search tree stored as parallel typed arrays, indexed by node number, so a
+    node costs 31 bytes instead of a Python object per node.
+
+    The children of a node are created together and stored contiguously, from
+    `first_child` to `first_child + num_children - 1`, in ascending move order.
+    `value` is the total reward of the playouts through a node for `mover`,
+    the side (0 or 1) that played the move into it, so UCT can read it directly.
+    `hash` is the Zobrist hash of the node's position, set on its first visit.
+    """
+    def __init__(self):
+        self.parent = array("i")
+        self.first_child = array("i")
+        self.num_children = array("B")
+        self.move = array("b")
+        self.mover = array("b")
+        self.visits = array("I")
+        self.value = array("d")
+        self.hash = array("Q")
+
+    def __len__(self):
+        return len(self.parent)
+
+    def memory_bytes(self) -> int:
+        return sum(
+            column.itemsize * len(column)
+            for column in (
+                self.parent, self.first_child, self.num_children, self.move,
+                self.mover, self.visits, self.value, self.hash,
+            )
+        )
+
+    def add(self, parent: int, move: int, mover: int, visits=0, value=0.0, node_hash=0) -> int:
+        """Appends a node without children and returns its index."""
+        self.parent.append(parent)
+        self.first_child.append(NO_NODE)
+        self.num_children.append(0)
+        self.move.append(move)
+        self.mover.append(mover)
+        self.visits.append(visits)
+        self.value.append(value)
+        self.hash.append(node_hash)
+        return len(self.parent) - 1
+
+    def expand(self, node: int, moves: list[int], mover: int):
+        """Creates the children of `node`, one per move."""
+        self.first_child[node] = len(self.parent)
+        self.num_children[node] = len(moves)
+        for move in moves:
+            self.add(node, move, mover)
+
+    def find(self, node_hash: int, max_depth: int) -> int:
+        """
+        Returns the shallowest visited node within `max_depth` plies of the root
+        whose position has `node_hash`, or NO_NODE.
+        """
+        level = [0]
+        for _ in range(max_depth + 1):
+            next_level = []
+            for node in level:
+                if self.hash[node] == node_hash and self.visits[node]:
+                    return node
+                first = self.first_child[node]
+                next_level.extend(range(first, first + self.num_children[node]))
+            level = next_level
+        return NO_NODE
+
+    def subtree(self, root: int) -> "NodeStore":
+        """Copies the subtree under `root` into a new, compact store rooted at index 0."""
+        tree = NodeStore()
+        tree.add(NO_NODE, self.move[root], self.mover[root], self.visits[root], self.value[root], self.hash[root])
+        queue = [(root, 0)]
+        for old, new in queue:
+            count = self.num_children[old]
+            if not count:
+                continue
+            first = self.first_child[old]
+            tree.first_child[new] = len(tree)
+            tree.num_children[new] = count
+            for child in range(first, first + count):
+                copy = tree.add(
+                    new, self.move[child], self.mover[child],
+                    self.visits[child], self.value[child], self.hash[child],
+                )
+                queue.append((child, copy))
+        return tree
+
+# --- MCTS Engine ---
+class MCTSAlgo(Algo):
+    """
+    Monte Carlo Tree Search with UCT selection and uniformly random playouts.
+
+    Each iteration walks down the tree picking children by UCB1, adds the
+    children of the leaf it reaches once that leaf has been visited before,
+    plays one random game to the end and credits the result to every node on
+    the way. The most visited root move is played, and its score is its win
+    rate (a draw counts half) for `player_id`.
+
+    The tree is kept between calls: the next search starts from the node for
+    the position actually reached, if the tree has it, and only that subtree
+    is kept. Searches run for `iterations` playouts, or until the time limit in
+    `get_best_choice_within`. `playouts_per_second` reports the speed of the
+    last search.
+    """
+    def __init__(
+        self,
+        iterations: int = DEFAULT_ITERATIONS,
+        exploration: float = EXPLORATION,
+        max_nodes: int = MAX_NODES,
+        reuse_tree: bool = True,
+        seed: int | None = None,
+    ):
+        if iterations < 1:
+            raise ValueError(f"MCTS needs at least one playout per search, got {iterations}")
+        super().__init__(f"MCTS ({iterations} playouts)")
+        self.iterations = iterations
+        self.exploration = exploration
+        self.max_nodes = max_nodes
+        self.reuse_tree = reuse_tree
+        self.rng = random.Random(seed)
+        self.tree = NodeStore()
+        self.playouts = 0
+        self.playouts_per_second = 0.0
+        self.reused_visits = 0
+        self.max_depth = 0
+        self._rollout_pits = array("i")
+
+    def get_best_choice(self, board: Board, player_id: PlayerID) -> tuple[float, int | None]:
+        return self._search(board, player_id, self.iterations, None)
+
+    def get_best_choice_within(
+        self, board: Board, player_id: PlayerID, time_limit: float
+    ) -> tuple[float, int | None, int]:
+        score, move = self._search(board, player_id, None, time.perf_counter() + time_limit)
+        return score, move, self.max_depth
+
+    def _search(self, board: Board, player_id: PlayerID, iterations, deadline) -> tuple[float, int | None]:
+        side = player_id.value - 1
+        if board.game_status != GameStatus.ONGOING:
+            return self._result_for(board.game_status.value, side), None
+
+        stats = self._new_stats() if self.collect_stats else None
+        self._set_root(board)
+        tree_size_at_start = len(self.tree)
+        search_board = SearchBoard.from_board(board)
+        self.max_depth = 0
+        playouts = 0
+        start = time.perf_counter()
+        while iterations is None or playouts < iterations:
+            if (
+                playouts
+                and not playouts & DEADLINE_CHECK_MASK
+                and (self.stop_requested or (deadline is not None and time.perf_counter() >= deadline))
+            ):
+                break
+            self._iterate(search_board)
+            playouts += 1
+        elapsed = time.perf_counter() - start
+        self.playouts = playouts
+        self.playouts_per_second = playouts / elapsed if elapsed > 0 else 0.0
+        if stats is not None:
+            stats.playouts = playouts
+            stats.nodes = len(self.tree) - tree_size_at_start
+            self._report_stats(stats, self.max_depth)
+
+        # The most visited move, the lowest one among equals
+        tree = self.tree
+        first = tree.first_child[0]
+        best = max(range(first, first + tree.num_children[0]), key=lambda child: (tree.visits[child], -child))
+        win_rate = tree.value[best] / tree.visits[best]
+        return (win_rate if tree.mover[best] == side else 1.0 - win_rate), tree.move[best]
+
+    def _set_root(self, board: Board):
+        """Makes `board` the root, keeping its subtree from the last search if there is one."""
+        root_hash = board.zobrist_hash
+        tree = self.tree
+        root = tree.find(root_hash, REUSE_DEPTH) if self.reuse_tree and len(tree) else NO_NODE
+        if root == NO_NODE:
+            self.tree = NodeStore()
+            self.tree.add(NO_NODE, -1, -1, node_hash=root_hash)
+            self.reused_visits = 0
+        else:
+            if root != 0:
+                self.tree = tree.subtree(root)
+            self.reused_visits = self.tree.visits[0]
+
+    def _iterate(self, board: SearchBoard):
+        """Runs one selection, expansion, playout and backpropagation pass."""
+        tree = self.tree
+        num_children = tree.num_children
+        first_child = tree.first_child
+        visits = tree.visits
+        value = tree.value
+        exploration = self.exploration
+
+        # --- Selection And Expansion ---
+        node = 0
+        depth = 0
+        while True:
+            count = num_children[node]
+            if not count:
+                # Leaves get children on their second visit, the root on its first
+                if board.status or (node and not visits[node]) or len(tree) >= self.max_nodes:
+                    break
+                tree.expand(node, board.legal_moves(), board.side)
+                count = num_children[node]
+
+            first = first_child[node]
+            log_term = exploration * math.sqrt(math.log(visits[node])) if visits[node] else 0.0
+            best, best_ucb = first, -math.inf
+            for child in range(first, first + count):
+                child_visits = visits[child]
+                if not child_visits:
+                    best = child
+                    break
+                ucb = value[child] / child_visits + log_term / math.sqrt(child_visits)
+                if ucb > best_ucb:
+                    best, best_ucb = child, ucb
+
+            board.apply(tree.move[best])
+            depth += 1
+            node = best
+            if not visits[node]:
+                tree.hash[node] = board.zobrist_hash
+
+        if depth > self.max_depth:
+            self.max_depth = depth
+
+        # --- Playout And Backpropagation ---
+        p1_result = self._playout(board)
+        mover = tree.mover
+        parent = tree.parent
+        while node != NO_NODE:
+            visits[node] += 1
+            value[node] += p1_result if mover[node] == 0 else 1.0 - p1_result
+            node = parent[node]
+
+        for _ in range(depth):
+            board.undo()
+
+    def _playout(self, board: SearchBoard) -> float:
+        """
+        Plays uniformly random moves from `board` to the end of the game on a
+        reused scratch array, and returns the result for Player 1.
+        """
+        status = board.status
+        if status == ONGOING:
+            pits = self._rollout_pits
+            if len(pits) != len(board.board):
+                pits = self._rollout_pits = array("i", board.board)
+            else:
+                pits[:] = board.board
+            board_size = board.board_size
+            side = board.side
+            random_fraction = self.rng.random
+            while True:
+                start = 0 if side == 0 else board_size + 1
+                end = start + board_size
+                legal_count = 0
+                for pit in range(start, end):
+                    if pits[pit]:
+                        legal_count += 1
+                pick = int(random_fraction() * legal_count)
+                for pit in range(start, end):
+                    if pits[pit]:
+                        if not pick:
+                            break
+                        pick -= 1
+                if not sow_move(pits, board_size, side, pit - start):
+                    side ^= 1
+                status = settle_game_status(pits, board_size)
+                if status:
+                    break
+        return self._result_for(status, 0)
+
+    @staticmethod
+    def _result_for(status: int, side: int) -> float:
+        """The reward of a finished game for `side`: 1 for a win, 0.5 for a draw, 0 for a loss."""
+        if status == (PLAYER_ONE_WINS if side == 0 else PLAYER_TWO_WINS):
+            return 1.0
+        elif status == (PLAYER_TWO_WINS if side == 0 else PLAYER_ONE_WINS):
+            return 0.0
+        return 0.5
@@ -1,25 +1,90 @@
-import math
-from game_components import Board, PlayerID, GameStatus
-from algo import Algo
+import json
+from game_components import Board, SearchBoard, PlayerID
+from minimax.search import MinimaxSearchAlgo, heuristic_order
+from minimax.transposition import TranspositionTable
 
 # This is a tunable parameter.
 DEFAULT_DEPTH = 4
 
-class MinimaxAlgoV2(Algo):
-    def __init__(self, depth: int = DEFAULT_DEPTH):
-        super().__init__(f"Minimax (Depth: {depth})")
-        self.depth = depth
+# --- Default weights for each component (tune these to change AI behavior) ---
+W_SILO = 10.0  # Weight for seeds in the silo
+W_ON_BOARD = 1.0   # Weight for seeds still on the player's side
+W_STEAL_OFF = 2.0  # Weight for potential to steal from opponent
+W_STEAL_DEF = -2.0 # Weight for opponent's potential to steal from us
+
+WEIGHT_NAMES = ("w_silo", "w_on_board", "w_steal_off", "w_steal_def")
+
+# --- Weight Files ---
+# A JSON object with the weights under "weights", e.g. as written by
+# `minimax.tuning`, which may also record how they were found.
+
+def load_weights(path: str) -> dict[str, float]:
+    with open(path) as f:
+        weights = json.load(f)["weights"]
+    unknown = set(weights) - set(WEIGHT_NAMES)
+    if unknown:
+        raise ValueError(f"{path} has unknown weights: {sorted(unknown)}")
+    return {name: float(value) for name, value in weights.items()}
+
+def save_weights(path: str, weights: dict[str, float], **info):
+    with open(path, "w") as f:
+        json.dump({"weights": dict(weights), **info}, f, indent=2)
+        f.write("\n")
+
+class MinimaxAlgoV2(MinimaxSearchAlgo):
+    # Leaf evaluation reads the incrementally updated SearchBoard.eval_terms
+    uses_eval_terms = True
+
+    def __init__(
+        self,
+        depth: int = DEFAULT_DEPTH,
+        move_ordering=heuristic_order,
+        transposition_table: TranspositionTable | None = None,
+        tablebase=None,
+        macro_moves: bool = False,
+        w_silo: float = W_SILO,
+        w_on_board: float = W_ON_BOARD,
+        w_steal_off: float = W_STEAL_OFF,
+        w_steal_def: float = W_STEAL_DEF,
+        weights_file: str | None = None,
+    ):
+        super().__init__(
+            f"Minimax (Depth: {depth}{' turns' if macro_moves else ''})",
+            depth, move_ordering, transposition_table, tablebase, macro_moves,
+        )
+        self.w_silo = w_silo
+        self.w_on_board = w_on_board
+        self.w_steal_off = w_steal_off
+        self.w_steal_def = w_steal_def
+        # Weights in the file replace the ones passed in
+        if weights_file is not None:
+            for name, value in load_weights(weights_file).items():
+                setattr(self, name, value)
+
+    @property
+    def weights(self) -> dict[str, float]:
+        return {name: getattr(self, name) for name in WEIGHT_NAMES}
 
     def _evaluate_board(self, board: Board, player_id: PlayerID) -> int:
         """
         A more advanced heuristic evaluation function.
         It considers silo score, on-board seeds, and stealing potential.
+        On a SearchBoard that tracks its eval terms this is O(1).
         """
-        # --- Weights for each component (tune these to change AI behavior) ---
-        W_SILO = 10.0  # Weight for seeds in the silo
-        W_ON_BOARD = 1.0   # Weight for seeds still on the player's side
-        W_STEAL_OFF = 2.0  # Weight for potential to steal from opponent
-        W_STEAL_DEF = -2.0 # Weight for opponent's potential to steal from us
+        if isinstance(board, SearchBoard) and board.track_eval:
+            side = player_id.value - 1
+            terms = board.eval_terms
+            pits = board.board
+            my_silo, opponent_silo = (
+                (board.board_size, -1) if side == 0 else (-1, board.board_size)
+            )
+            final_score = (
+                (self.w_silo * (pits[my_silo] - pits[opponent_silo])) +
+                (self.w_on_board * (terms[side] - terms[1 - side])) +
+                (self.w_steal_off * terms[2 + side]) +
+                (self.w_steal_def * terms[3 - side])
+            )
+            return int(final_score)
 
         # --- Basic Score Components ---
         my_silo_index = board.get_player_silo_index(player_id)
@@ -57,61 +122,12 @@ class MinimaxAlgoV2(Algo):
 
         # --- Final Weighted Score ---
         final_score = (
-            (W_SILO * silo_score) +
-            (W_ON_BOARD * on_board_score) +
-            (W_STEAL_OFF * my_stealing_potential) +
-            (W_STEAL_DEF * opponent_stealing_potential)
+            (self.w_silo * silo_score) +
+            (self.w_on_board * on_board_score) +
+            (self.w_steal_off * my_stealing_potential) +
+            (self.w_steal_def * opponent_stealing_potential)
         )
         
         # print('final score:', final_score)
 
         return int(final_score)
-
-    def get_best_choice(self, board: Board, player_id: PlayerID) -> tuple[int, int | None]:
-        """
-        Public method to start the minimax calculation.
-        """
-        return self._minimax(board, self.depth, player_id)
-
-    def _minimax(self, board: Board, depth: int, maximizing_player_id: PlayerID) -> tuple[int, int | None]:
-        """
-        Minimax algorithm to find the optimal move.
-        Returns a tuple: (best_score, best_move_index).
-        """
-        # --- Base Cases ---
-        if board.game_status != GameStatus.ONGOING:
-            if board.game_status == GameStatus.PLAYER_ONE_WINS:
-                return (math.inf if maximizing_player_id == PlayerID.PLAYER_ONE else -math.inf, None)
-            elif board.game_status == GameStatus.PLAYER_TWO_WINS:
-                return (-math.inf if maximizing_player_id == PlayerID.PLAYER_ONE else math.inf, None)
-            else: # Draw
-                return (0, None)
-
-        if depth == 0:
-            return (self._evaluate_board(board, maximizing_player_id), None)
-
-        # --- Recursive Step ---
-        legal_moves = board.get_legal_moves()
-        if not legal_moves:
-            return (self._evaluate_board(board, maximizing_player_id), None)
-
-        best_move = legal_moves[0]
-
-        if board.current_player == maximizing_player_id: # Maximizing player
-            max_eval = -math.inf
-            for move in legal_moves:
-                next_board = board.make_move(move)
-                current_eval, _ = self._minimax(next_board, depth - 1, maximizing_player_id)
-                if current_eval > max_eval:
-                    max_eval = current_eval
-                    best_move = move
-            return max_eval, best_move
-        else: # Minimizing player
-            min_eval = math.inf
-            for move in legal_moves:
-                next_board = board.make_move(move)
-                current_eval, _ = self._minimax(next_board, depth - 1, maximizing_player_id)
-                if current_eval < min_eval:
-                    min_eval = current_eval
-                    best_move = move
-            return min_eval, best_move
\ No newline at end of file
@@ -0,0 +1,196 @@
+import argparse
+import math
+import multiprocessing
+import time
+from game_components import Board, SearchBoard, PlayerID, GameStatus
+from algo import Algo
+from minimax.search import MinimaxSearchAlgo
+from minimax.minimax_module_v2 import MinimaxAlgoV2
+
+# --- Worker Process State ---
+# Set once per worker by `_init_worker`, so the engine and the shared bound are
+# sent when the pool starts rather than with every task.
+_worker_engine = None
+_worker_bound = None
+
+def _init_worker(engine: MinimaxSearchAlgo, shared_bound):
+    global _worker_engine, _worker_bound
+    _worker_engine = engine
+    _worker_bound = shared_bound
+
+def _search_root_move(board_size, pits, side, move, depth, player_value):
+    """
+    Searches one root move in a worker, starting from the best root score any
+    worker has published so far and picking up better ones published while it
+    runs, then publishes its own score if it is better. Returns (move, score, nodes).
+    """
+    engine = _worker_engine
+    player_id = PlayerID(player_value)
+    maximizing = side == player_value - 1
+    board = engine._new_search_board(board_size, pits, side)
+
+    # Search just short of the best score so far, so that a move tying it is
+    # still scored exactly and ties can be broken like the sequential search.
+    bound = _worker_bound.value
+    if maximizing:
+        alpha, beta = math.nextafter(bound, -math.inf), math.inf
+    else:
+        alpha, beta = -math.inf, math.nextafter(bound, math.inf)
+
+    engine._start_search()
+    score = engine._search_root_move(board, move, depth, alpha, beta, player_id, _worker_bound)
+
+    with _worker_bound.get_lock():
+        if (score > _worker_bound.value) if maximizing else (score < _worker_bound.value):
+            _worker_bound.value = score
+    return move, score, engine.nodes
+
+class ParallelMinimaxAlgo(Algo):
+    """
+    Splits the root moves of a minimax engine across a pool of worker processes.
+
+    The first root move in the engine's move ordering is searched on its own to
+    get a good bound. The remaining moves are then searched in parallel
+    ("young brothers wait"). Workers share the best root score found so far
+    through shared memory, start each move's search from it and keep re-reading
+    it while they search, so they can prune against each other's results.
+
+    The pool starts on the first call and is reused for every later move until
+    `close()`. Without a transposition table, the result is the same (score, move)
+    as `engine.get_best_choice`, including how ties are broken.
+    """
+    def __init__(self, engine: MinimaxSearchAlgo | None = None, workers: int | None = None):
+        self.engine = engine if engine is not None else MinimaxAlgoV2()
+        self.workers = workers or multiprocessing.cpu_count()
+        super().__init__(f"Parallel {self.engine.name} x{self.workers}")
+        self.nodes = 0
+        self._pool = None
+        self._shared_bound = None
+
+    def _get_pool(self):
+        if self._pool is None:
+            self._shared_bound = multiprocessing.Value("d", 0.0)
+            self._pool = multiprocessing.Pool(
+                self.workers, initializer=_init_worker, initargs=(self.engine, self._shared_bound)
+            )
+        return self._pool
+
+    def close(self):
+        """Shuts down the worker pool. It is restarted by the next search."""
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool.join()
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __getstate__(self):
+        # A pool cannot be sent to another process, so copies start their own
+        state = self.__dict__.copy()
+        state["_pool"] = None
+        state["_shared_bound"] = None
+        return state
+
+    def get_best_choice(self, board: Board, player_id: PlayerID) -> tuple[int, int | None]:
+        stats = self._new_stats() if self.collect_stats else None
+        best = self._split_search(board, player_id)
+        if stats is not None:
+            stats.nodes = self.nodes
+            self._report_stats(stats, self.engine.depth)
+        return best
+
+    def _split_search(self, board: Board, player_id: PlayerID) -> tuple[int, int | None]:
+        legal_moves = board.get_legal_moves()
+        depth = self.engine.depth
+        if (
+            board.game_status != GameStatus.ONGOING
+            or depth == 0
+            or len(legal_moves) < 2
+            or self.engine.macro_moves  # Splits moves, not turns
+        ):
+            best = self.engine.get_best_choice(board, player_id)
+            self.nodes = self.engine.nodes
+            return best
+
+        pool = self._get_pool()
+        maximizing = board.current_player == player_id
+        side = board.current_player.value - 1
+        ordered_moves = self.engine.move_ordering(
+            SearchBoard.from_board(board, track_hash=False), legal_moves, None
+        )
+        self._shared_bound.value = -math.inf if maximizing else math.inf
+        task_args = [
+            (board.board_size, list(board.board), side, move, depth, player_id.value)
+            for move in ordered_moves
+        ]
+
+        # Young brothers wait: the eldest move sets the bound, then the rest split
+        results = [pool.apply(_search_root_move, task_args[0])]
+        results.extend(pool.imap_unordered(_search_root_unpacked, task_args[1:]))
+        self.nodes = sum(nodes for _, _, nodes in results) + 1
+
+        best_score, best_move = None, None
+        for move, score, _ in results:
+            if (
+                best_move is None
+                or (score > best_score if maximizing else score < best_score)
+                or (score == best_score and move < best_move)
+            ):
+                best_score, best_move = score, move
+        return best_score, best_move
+
+def _search_root_unpacked(args):
+    return _search_root_move(*args)
+
+def measure_speedup(
+    board: Board, depth: int, core_counts: list[int], engine_class=MinimaxAlgoV2
+) -> list[dict]:
+    """
+    Times the sequential engine and the parallel search at each core count on
+    `board`, checking that they agree. Pool startup is not timed: the pool is
+    warmed up with one search first, as it would be after the first move of a game.
+    """
+    player_id = board.current_player
+    sequential = engine_class(depth)
+    start = time.perf_counter()
+    expected = sequential.get_best_choice(board, player_id)
+    sequential_seconds = time.perf_counter() - start
+
+    rows = [{"workers": 0, "seconds": sequential_seconds, "speedup": 1.0, "result": expected}]
+    for workers in core_counts:
+        with ParallelMinimaxAlgo(engine_class(depth), workers) as algo:
+            algo.get_best_choice(board, player_id)
+            start = time.perf_counter()
+            result = algo.get_best_choice(board, player_id)
+            seconds = time.perf_counter() - start
+        if result != expected:
+            raise AssertionError(f"Parallel search with {workers} workers returned {result}, expected {expected}")
+        rows.append({
+            "workers": workers,
+            "seconds": seconds,
+            "speedup": sequential_seconds / seconds,
+            "result": result,
+        })
+    return rows
+
+# Run from the repository root: python -m minimax.parallel --depth 7 --cores 1 2 4 8
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Report the parallel root-split speedup per core count.")
+    parser.add_argument("--depth", type=int, default=7)
+    parser.add_argument("--cores", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--opening", type=int, nargs="*", default=[2, 5],
+                        help="Moves played from the initial board before searching")
+    args = parser.parse_args()
+
+    board = Board()
+    for move in args.opening:
+        board = board.make_move(move)
+
+    print(f"{'Workers':>8} {'Seconds':>8} {'Speedup':>8}  Result")
+    for row in measure_speedup(board, args.depth, args.cores):
+        label = "seq" if row["workers"] == 0 else row["workers"]
+        print(f"{label:>8} {row['seconds']:>8.2f} {row['speedup']:>8.2f}  {row['result']}")
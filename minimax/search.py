@@ -0,0 +1,782 @@
+import math
+import random
+import time
+from abc import abstractmethod
+from game_components import (
+    Board, SearchBoard, PlayerID, GameStatus, PLAYER_ONE_WINS, PLAYER_TWO_WINS, DRAW,
+    MACRO_EXPANSION_LIMIT,
+)
+from algo import Algo
+from minimax.transposition import (
+    TranspositionTable, EXACT, LOWER_BOUND, UPPER_BOUND, PERSPECTIVE_KEY,
+)
+
+# The clock is read once every DEADLINE_CHECK_MASK + 1 nodes during timed searches.
+DEADLINE_CHECK_MASK = 63
+
+class SearchTimeout(Exception):
+    """Raised inside the search when a time-budgeted search runs past its deadline."""
+    pass
+
+# Score of a finished game, indexed by [maximizing side][GameStatus value]
+_TERMINAL_SCORES = (
+    (None, math.inf, -math.inf, 0),  # Maximizing for Player 1
+    (None, -math.inf, math.inf, 0),  # Maximizing for Player 2
+)
+
+class _ProfiledSearchBoard(SearchBoard):
+    """A SearchBoard that counts and times move generation and moves into `stats`."""
+    __slots__ = ("stats",)
+
+    def __init__(self, stats, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = stats
+
+    def legal_moves(self):
+        start = time.perf_counter()
+        moves = SearchBoard.legal_moves(self)
+        stats = self.stats
+        stats.movegen_seconds += time.perf_counter() - start
+        stats.movegen_calls += 1
+        stats.moves_generated += len(moves)
+        return moves
+
+    def apply(self, hole_index):
+        start = time.perf_counter()
+        SearchBoard.apply(self, hole_index)
+        self.stats.apply_seconds += time.perf_counter() - start
+
+# --- Move Ordering ---
+# An ordering takes (board, legal_moves, hint_move) and returns the same moves
+# in the order the search should try them. `board` is the `SearchBoard` being
+# searched. Orderings must be stable so that moves they consider equal keep
+# their natural (ascending) order.
+
+def natural_order(board: SearchBoard, moves: list[int], hint_move: int | None = None) -> list[int]:
+    """Searches moves in ascending hole order, exactly like plain minimax."""
+    return moves
+
+def heuristic_order(board: SearchBoard, moves: list[int], hint_move: int | None = None) -> list[int]:
+    """
+    Searches the hint move first, then free turns, then captures, then the rest.
+
+    A move is a free turn when its last seed reaches the mover's silo, and a
+    capture when its first lap ends in an empty own hole facing a non-empty
+    one. Relay sowing is not followed, since it changes the board too much to
+    predict cheaply.
+    """
+    pits = board.board
+    board_size = board.board_size
+    start = 0 if board.side == 0 else board_size + 1
+    cycle = 2 * board_size + 1  # Active pits, the opponent's silo is skipped
+
+    def key(move):
+        seeds = pits[start + move]
+        landing = move + seeds
+        is_capture = (
+            landing < board_size
+            and pits[start + landing] == 0
+            and pits[(2 * board_size) - (start + landing)] > 0
+        )
+        return (move != hint_move, seeds % cycle != board_size - move, not is_capture)
+
+    return sorted(moves, key=key)
+
+class MinimaxSearchAlgo(Algo):
+    """
+    Shared search core for the minimax family of algorithms.
+
+    Subclasses only provide `_evaluate_board`. `get_best_choice` runs an
+    alpha-beta search that returns exactly the same (score, move) as `_minimax`
+    at equal depth, including which move wins a tie, so it is a pure speedup.
+
+    With a `transposition_table`, positions reached through different move
+    orders are searched once. Entries from deeper searches are reused at
+    shallower depths, so scores may then differ from (and improve on)
+    `_minimax` at the same depth.
+
+    With a `tablebase` (a `tablebase.EndgameTablebase`), positions it covers
+    are scored by their perfect result instead of being searched, which can
+    likewise only improve on `_minimax`.
+
+    With `macro_moves`, depth counts whole turns instead of moves: every
+    node's children are the distinct positions its side's turn can end in
+    (see `SearchBoard.macro_moves`), so free-turn chains cost no depth and
+    positions reached through different chain orders are searched once. The
+    rest of the chosen turn is remembered and played without searching
+    again. Depths in the transposition table are then turns too.
+
+    With stats enabled (`enable_stats`), searches also count and time
+    evaluations, move generation and moves through wrappers that are only
+    installed then, so the search loop itself is unchanged.
+    """
+    # Set by engines whose evaluation reads `SearchBoard.eval_terms`
+    uses_eval_terms = False
+    # Mid-turn positions expanded per node in macro mode, see `SearchBoard.macro_moves`
+    macro_expansion_limit = MACRO_EXPANSION_LIMIT
+
+    def __init__(
+        self,
+        name: str,
+        depth: int,
+        move_ordering=heuristic_order,
+        transposition_table: TranspositionTable | None = None,
+        tablebase=None,
+        macro_moves: bool = False,
+    ):
+        super().__init__(name)
+        self.depth = depth
+        self.move_ordering = move_ordering
+        self.transposition_table = transposition_table
+        self.tablebase = tablebase
+        self.macro_moves = macro_moves
+        # Rest of the last turn chosen in macro mode: (position hash, side) -> (score, move)
+        self._macro_plan = {}
+        self.nodes = 0
+        self.cutoffs = 0
+        self.tablebase_hits = 0
+        self._killers = {}
+        self._pv_table = {}
+        self._prev_pv = ()
+        self._follow_pv = False
+        self._deadline = None
+        # Best root score published by other processes searching sibling root
+        # moves (a `multiprocessing.Value`), see `_search_root_move`
+        self._shared_bound = None
+        self._root_maximizing = True
+        self._alpha_floor = -math.inf
+        self._beta_ceiling = math.inf
+        self._reached_horizon = False
+        self._stats = None
+        self._tt_counts_at_start = (0, 0)
+        self._max_side = 0
+        self._terminal_scores = _TERMINAL_SCORES[0]
+        self._perspective_key = 0
+
+    @abstractmethod
+    def _evaluate_board(self, board: Board, player_id: PlayerID) -> int:
+        """Heuristic score of a non-terminal board from `player_id`'s point of view."""
+        pass
+
+    def get_best_choice(self, board: Board, player_id: PlayerID) -> tuple[int, int | None]:
+        """
+        Public method to start the alpha-beta search.
+        """
+        planned = self._planned_move(board, player_id)
+        if planned is not None:
+            return planned
+        self._start_search()
+        try:
+            result = self._search_root(self._search_board(board), self.depth, player_id)
+        except SearchTimeout:
+            # Only a stopped search times out here, see `request_stop`
+            result = (self._evaluate_board(board, player_id), None)
+        if self._stats is not None:
+            self._finish_stats(self.depth)
+        return result
+
+    def get_best_choice_within(
+        self, board: Board, player_id: PlayerID, time_limit: float, max_depth: int | None = None
+    ) -> tuple[int, int | None, int]:
+        """
+        Iterative deepening: searches depth 1, 2, 3, ... until `time_limit`
+        seconds have passed, `max_depth` is reached, or the whole game tree
+        has been searched. Each iteration tries the previous principal
+        variation first. An iteration cut off by the deadline is discarded.
+        Depth 1 always completes so that a move is always returned.
+        """
+        planned = self._planned_move(board, player_id)
+        if planned is not None:
+            return (*planned, 0)
+        self._start_search()
+        search_board = self._search_board(board)
+        deadline = time.perf_counter() + time_limit
+        result = (self._evaluate_board(board, player_id), None, 0)
+
+        depth = 1
+        while max_depth is None or depth <= max_depth:
+            self._deadline = deadline if depth > 1 else None
+            if self.stop_requested:
+                break
+            self._reached_horizon = False
+            try:
+                best_score, best_move = self._search_root(search_board, depth, player_id)
+            except SearchTimeout:
+                break
+            finally:
+                self._deadline = None
+                self._follow_pv = False
+
+            result = (best_score, best_move, depth)
+            self._prev_pv = self._pv_table.get(0, ())
+            if best_move is None or not self._reached_horizon:
+                break  # Game over, or the whole tree fits within this depth
+            if time.perf_counter() >= deadline:
+                break
+            depth += 1
+
+        if self._stats is not None:
+            self._finish_stats(result[2])
+        return result
+
+    def _search_board(self, board: Board) -> SearchBoard:
+        return self._new_search_board(
+            board.board_size, board.board, board.current_player.value - 1, board.game_status.value
+        )
+
+    def _new_search_board(self, board_size: int, pits, side: int, status: int = 0) -> SearchBoard:
+        """Creates a SearchBoard that tracks what this engine needs: the hash and/or eval terms."""
+        if self._stats is not None:
+            return _ProfiledSearchBoard(
+                self._stats,
+                board_size,
+                pits,
+                side,
+                status,
+                track_hash=self.transposition_table is not None or self.macro_moves,
+                track_eval=self.uses_eval_terms,
+            )
+        return SearchBoard(
+            board_size,
+            pits,
+            side,
+            status,
+            track_hash=self.transposition_table is not None or self.macro_moves,
+            track_eval=self.uses_eval_terms,
+        )
+
+    def _start_search(self):
+        self.nodes = 0
+        self.cutoffs = 0
+        self.tablebase_hits = 0
+        self._killers = {}
+        self._pv_table = {}
+        self._prev_pv = ()
+        self._follow_pv = False
+        self._deadline = 0.0 if self.stop_requested else None
+        self._reached_horizon = False
+        self._alpha_floor = -math.inf
+        self._beta_ceiling = math.inf
+        tt = self.transposition_table
+        if tt is not None:
+            tt.new_search()
+        self._stats = self._new_stats() if self.collect_stats else None
+        if self._stats is not None and tt is not None:
+            self._tt_counts_at_start = (tt.hits, tt.misses)
+
+    def request_stop(self):
+        # A deadline in the past makes the next deadline check abort the
+        # search. The flag is set first so that a search setting its own
+        # deadline meanwhile sees it.
+        super().request_stop()
+        self._deadline = 0.0
+
+    # --- Search Statistics ---
+    def enable_stats(self, listener=None):
+        super().enable_stats(listener)
+        self._evaluate_board = self._profiled_evaluate_board
+
+    def disable_stats(self):
+        super().disable_stats()
+        self.__dict__.pop("_evaluate_board", None)
+
+    def _profiled_evaluate_board(self, board, player_id: PlayerID):
+        start = time.perf_counter()
+        score = type(self)._evaluate_board(self, board, player_id)
+        stats = self._stats
+        if stats is not None:
+            stats.eval_seconds += time.perf_counter() - start
+            stats.evaluations += 1
+        return score
+
+    def _finish_stats(self, depth: int):
+        stats = self._stats
+        self._stats = None
+        stats.nodes = self.nodes
+        stats.cutoffs = self.cutoffs
+        stats.tablebase_hits = self.tablebase_hits
+        tt = self.transposition_table
+        if tt is not None:
+            hits, misses = self._tt_counts_at_start
+            stats.tt_hits = tt.hits - hits
+            stats.tt_probes = stats.tt_hits + tt.misses - misses
+        self._report_stats(stats, depth)
+
+    def _terminal_score(self, board: Board, maximizing_player_id: PlayerID):
+        return _TERMINAL_SCORES[maximizing_player_id.value - 1][board.game_status.value]
+
+    def _tablebase_score(self, board: SearchBoard):
+        """
+        The perfect score of `board` from the endgame tablebase, or None if the
+        tablebase does not cover it.
+        """
+        tb = self.tablebase
+        pits = board.board
+        board_size = board.board_size
+        if (
+            tb.board_size != board_size
+            or board.num_seeds - pits[board_size] - pits[-1] > tb.max_seeds
+        ):
+            return None
+        margin = tb.probe_pits(pits, board.side)
+        final_lead = pits[board_size] - pits[-1] + (margin if board.side == 0 else -margin)
+        if final_lead > 0:
+            return self._terminal_scores[PLAYER_ONE_WINS]
+        elif final_lead < 0:
+            return self._terminal_scores[PLAYER_TWO_WINS]
+        return self._terminal_scores[DRAW]
+
+    def _minimax(self, board: Board, depth: int, maximizing_player_id: PlayerID) -> tuple[int, int | None]:
+        """
+        Plain minimax algorithm, kept as the reference the alpha-beta search must
+        match, see `verify_against_minimax`.
+        Returns a tuple: (best_score, best_move_index).
+        """
+        # --- Base Cases ---
+        if board.game_status != GameStatus.ONGOING:
+            return (self._terminal_score(board, maximizing_player_id), None)
+
+        if depth == 0:
+            return (self._evaluate_board(board, maximizing_player_id), None)
+
+        # --- Recursive Step ---
+        legal_moves = board.get_legal_moves()
+        if not legal_moves:
+            return (self._evaluate_board(board, maximizing_player_id), None)
+
+        best_move = legal_moves[0]
+
+        if board.current_player == maximizing_player_id: # Maximizing player
+            max_eval = -math.inf
+            for move in legal_moves:
+                next_board = board.make_move(move)
+                current_eval, _ = self._minimax(next_board, depth - 1, maximizing_player_id)
+                if current_eval > max_eval:
+                    max_eval = current_eval
+                    best_move = move
+            return max_eval, best_move
+        else: # Minimizing player
+            min_eval = math.inf
+            for move in legal_moves:
+                next_board = board.make_move(move)
+                current_eval, _ = self._minimax(next_board, depth - 1, maximizing_player_id)
+                if current_eval < min_eval:
+                    min_eval = current_eval
+                    best_move = move
+            return min_eval, best_move
+
+    def _search_root(self, board: SearchBoard, depth: int, maximizing_player_id: PlayerID):
+        if self.macro_moves:
+            return self._macro_root(board, depth, maximizing_player_id)
+        return self._alphabeta_root(board, depth, maximizing_player_id)
+
+    def _alphabeta_root(
+        self, board: SearchBoard, depth: int, maximizing_player_id: PlayerID
+    ) -> tuple[int, int | None]:
+        """
+        Root of the alpha-beta search.
+
+        Plain minimax keeps the lowest-index move among equally scored ones. Since
+        move ordering may search a higher-index move first, lower-index moves are
+        searched with a bound just short of the current best, so that a tie with
+        it comes back as an exact score rather than a fail-low bound.
+        """
+        max_side = self._set_root_player(maximizing_player_id)
+        self._pv_table[0] = ()
+        if board.status:
+            return (self._terminal_scores[board.status], None)
+
+        if depth == 0:
+            self._reached_horizon = True
+            return (self._evaluate_board(board, maximizing_player_id), None)
+
+        legal_moves = board.legal_moves()
+        if not legal_moves:
+            return (self._evaluate_board(board, maximizing_player_id), None)
+
+        maximizing = board.side == max_side
+        best_score, best_move = None, None
+
+        hint_move = self._killers.get(0)
+        tt = self.transposition_table
+        if tt is not None:
+            key = board.zobrist_hash ^ self._perspective_key
+            entry = tt.probe(key)
+            if entry is not None and entry[3] is not None:
+                hint_move = entry[3]
+        pv_move = self._prev_pv[0] if self._prev_pv else None
+        if pv_move in legal_moves:
+            hint_move = pv_move
+
+        for move in self.move_ordering(board, legal_moves, hint_move):
+            alpha, beta = -math.inf, math.inf
+            if best_move is not None:
+                if maximizing:
+                    alpha = best_score if move > best_move else math.nextafter(best_score, -math.inf)
+                else:
+                    beta = best_score if move > best_move else math.nextafter(best_score, math.inf)
+
+            self._follow_pv = move == pv_move
+            board.apply(move)
+            current_eval, _ = self._alphabeta(
+                board, depth - 1, alpha, beta, maximizing_player_id, 1
+            )
+            board.undo()
+            self._follow_pv = False
+
+            if (
+                best_move is None
+                or (current_eval > best_score if maximizing else current_eval < best_score)
+                or (current_eval == best_score and move < best_move)
+            ):
+                best_score, best_move = current_eval, move
+                self._pv_table[0] = (move,) + self._pv_table.get(1, ())
+
+        if tt is not None:
+            tt.store(key, depth, EXACT, best_score, best_move, self._reached_horizon)
+        return best_score, best_move
+
+    def _set_root_player(self, maximizing_player_id: PlayerID) -> int:
+        """Sets up the per-search tables for `maximizing_player_id`, returns its side."""
+        max_side = self._max_side = maximizing_player_id.value - 1
+        self._terminal_scores = _TERMINAL_SCORES[max_side]
+        self._perspective_key = PERSPECTIVE_KEY if max_side else 0
+        return max_side
+
+    def _search_root_move(
+        self, board: SearchBoard, move: int, depth: int, alpha, beta, maximizing_player_id: PlayerID,
+        shared_bound=None,
+    ):
+        """
+        Searches a single root move with the window (alpha, beta) and returns
+        its fail-soft score. Used to split the root moves across processes.
+
+        `shared_bound` holds the best root score found so far by the processes
+        searching the other root moves. It is re-read every
+        DEADLINE_CHECK_MASK + 1 nodes and tightens the window of every node
+        entered from then on, as alpha (or beta) at the root would have.
+        """
+        max_side = self._set_root_player(maximizing_player_id)
+        self._shared_bound = shared_bound
+        self._root_maximizing = board.side == max_side
+        board.apply(move)
+        try:
+            score, _ = self._alphabeta(board, depth - 1, alpha, beta, maximizing_player_id, 1)
+        finally:
+            board.undo()
+            self._shared_bound = None
+            self._alpha_floor = -math.inf
+            self._beta_ceiling = math.inf
+        return score
+
+    def _read_shared_bound(self):
+        # Just short of the best score, so a root move tying it is still scored exactly
+        bound = self._shared_bound.value
+        if self._root_maximizing:
+            self._alpha_floor = max(self._alpha_floor, math.nextafter(bound, -math.inf))
+        else:
+            self._beta_ceiling = min(self._beta_ceiling, math.nextafter(bound, math.inf))
+
+    def _alphabeta(
+        self, board: SearchBoard, depth: int, alpha, beta, maximizing_player_id: PlayerID, ply: int = 1
+    ) -> tuple[int, int | None]:
+        """
+        Fail-soft alpha-beta search.
+        Returns a tuple: (score, best_move_index). The score is exact when it lies
+        strictly inside (alpha, beta), otherwise it is a bound on the exact score.
+        """
+        self.nodes += 1
+        if not self.nodes & DEADLINE_CHECK_MASK:
+            if self._deadline is not None and time.perf_counter() >= self._deadline:
+                raise SearchTimeout()
+            if self._shared_bound is not None:
+                self._read_shared_bound()
+        self._pv_table[ply] = ()
+
+        # --- Base Cases ---
+        if board.status:
+            return (self._terminal_scores[board.status], None)
+
+        if self.tablebase is not None:
+            score = self._tablebase_score(board)
+            if score is not None:
+                self.tablebase_hits += 1
+                return (score, None)
+
+        if depth == 0:
+            self._reached_horizon = True
+            return (self._evaluate_board(board, maximizing_player_id), None)
+
+        # --- Recursive Step ---
+        legal_moves = board.legal_moves()
+        if not legal_moves:
+            return (self._evaluate_board(board, maximizing_player_id), None)
+
+        # --- Root Bound Shared By Other Processes ---
+        # Only applied where it leaves the window non-empty, so every score
+        # still bounds or equals the exact one (see the flags stored below).
+        alpha_floor = self._alpha_floor
+        beta_ceiling = self._beta_ceiling
+        if alpha < alpha_floor < beta:
+            alpha = alpha_floor
+        if alpha < beta_ceiling < beta:
+            beta = beta_ceiling
+        alpha_entry, beta_entry = alpha, beta
+
+        # --- Transposition Table Lookup ---
+        hint_move = self._killers.get(ply)
+        tt = self.transposition_table
+        if tt is not None:
+            key = board.zobrist_hash ^ self._perspective_key
+            entry = tt.probe(key)
+            if entry is not None:
+                entry_depth, flag, score, entry_move, entry_horizon = entry
+                if entry_depth >= depth and (
+                    flag == EXACT
+                    or (flag == LOWER_BOUND and score >= beta)
+                    or (flag == UPPER_BOUND and score <= alpha)
+                ):
+                    if entry_horizon:
+                        self._reached_horizon = True
+                    return score, entry_move
+                if entry_move is not None:
+                    hint_move = entry_move
+            alpha_orig, beta_orig = alpha, beta
+            # Whether this node's own subtree reaches the horizon, for its entry
+            horizon_above = self._reached_horizon
+            self._reached_horizon = False
+
+        # --- Principal Variation From The Previous Iteration ---
+        pv_move = None
+        if self._follow_pv:
+            if ply < len(self._prev_pv) and self._prev_pv[ply] in legal_moves:
+                pv_move = hint_move = self._prev_pv[ply]
+            else:
+                self._follow_pv = False
+
+        ordered_moves = self.move_ordering(board, legal_moves, hint_move)
+        best_move = ordered_moves[0]
+
+        if board.side == self._max_side: # Maximizing player
+            max_eval = -math.inf
+            for move in ordered_moves:
+                self._follow_pv = pv_move is not None and move == pv_move
+                board.apply(move)
+                current_eval, _ = self._alphabeta(
+                    board, depth - 1, alpha, beta, maximizing_player_id, ply + 1
+                )
+                board.undo()
+                self._follow_pv = False
+                if current_eval > max_eval:
+                    max_eval = current_eval
+                    best_move = move
+                    self._pv_table[ply] = (move,) + self._pv_table.get(ply + 1, ())
+                alpha = max(alpha, max_eval)
+                if alpha >= beta or (max_eval >= self._beta_ceiling and max_eval > alpha_entry):
+                    self._killers[ply] = move
+                    self.cutoffs += 1
+                    break
+            best_eval = max_eval
+        else: # Minimizing player
+            min_eval = math.inf
+            for move in ordered_moves:
+                self._follow_pv = pv_move is not None and move == pv_move
+                board.apply(move)
+                current_eval, _ = self._alphabeta(
+                    board, depth - 1, alpha, beta, maximizing_player_id, ply + 1
+                )
+                board.undo()
+                self._follow_pv = False
+                if current_eval < min_eval:
+                    min_eval = current_eval
+                    best_move = move
+                    self._pv_table[ply] = (move,) + self._pv_table.get(ply + 1, ())
+                beta = min(beta, min_eval)
+                if alpha >= beta or (min_eval <= self._alpha_floor and min_eval < beta_entry):
+                    self._killers[ply] = move
+                    self.cutoffs += 1
+                    break
+            best_eval = min_eval
+
+        if tt is not None:
+            if best_eval <= alpha_orig:
+                flag = UPPER_BOUND
+            elif best_eval >= beta_orig:
+                flag = LOWER_BOUND
+            # A shared bound raised during the search turns scores past it into bounds too
+            elif best_eval <= self._alpha_floor:
+                flag = UPPER_BOUND
+            elif best_eval >= self._beta_ceiling:
+                flag = LOWER_BOUND
+            else:
+                flag = EXACT
+            tt.store(key, depth, flag, best_eval, best_move, self._reached_horizon)
+            self._reached_horizon |= horizon_above
+        return best_eval, best_move
+
+    # --- Macro-Ply Search ---
+    def _planned_move(self, board: Board, player_id: PlayerID) -> tuple[int, int] | None:
+        """The next move of the turn chosen by the last macro search, if `board` is on its way."""
+        if not self._macro_plan:
+            return None
+        planned = self._macro_plan.pop((board.zobrist_hash, player_id), None)
+        if planned is None:
+            self._macro_plan = {}
+        return planned
+
+    def _macro_root(
+        self, board: SearchBoard, depth: int, maximizing_player_id: PlayerID
+    ) -> tuple[int, int | None]:
+        """
+        Root of the macro-ply search. Returns the first move of the best turn
+        and plans the rest of it. Equally scored turns keep the first found.
+        """
+        max_side = self._set_root_player(maximizing_player_id)
+        if board.status:
+            return (self._terminal_scores[board.status], None)
+
+        if depth == 0:
+            self._reached_horizon = True
+            return (self._evaluate_board(board, maximizing_player_id), None)
+
+        maximizing = board.side == max_side
+        alpha, beta = -math.inf, math.inf
+        best_score, best_turn = None, None
+        for turn in board.macro_moves(self.macro_expansion_limit):
+            for move in turn:
+                board.apply(move)
+            current_eval, _ = self._macro_alphabeta(board, depth - 1, alpha, beta, maximizing_player_id)
+            for _ in turn:
+                board.undo()
+            if best_turn is None or (current_eval > best_score if maximizing else current_eval < best_score):
+                best_score, best_turn = current_eval, turn
+                if maximizing:
+                    alpha = max(alpha, current_eval)
+                else:
+                    beta = min(beta, current_eval)
+
+        # Key the rest of the turn by the positions it is played from. Set
+        # only now, so a deeper iteration cut off by the deadline keeps the
+        # plan of the last one that completed.
+        plan = {}
+        for move, next_move in zip(best_turn, best_turn[1:]):
+            board.apply(move)
+            plan[(board.zobrist_hash, maximizing_player_id)] = (best_score, next_move)
+        for _ in best_turn[:-1]:
+            board.undo()
+        self._macro_plan = plan
+        return best_score, best_turn[0]
+
+    def _macro_alphabeta(
+        self, board: SearchBoard, depth: int, alpha, beta, maximizing_player_id: PlayerID
+    ) -> tuple[int, None]:
+        """Fail-soft alpha-beta search over whole turns. `depth` counts turns."""
+        self.nodes += 1
+        if (
+            self._deadline is not None
+            and not self.nodes & DEADLINE_CHECK_MASK
+            and time.perf_counter() >= self._deadline
+        ):
+            raise SearchTimeout()
+
+        # --- Base Cases ---
+        if board.status:
+            return (self._terminal_scores[board.status], None)
+
+        if self.tablebase is not None:
+            score = self._tablebase_score(board)
+            if score is not None:
+                self.tablebase_hits += 1
+                return (score, None)
+
+        if depth == 0:
+            self._reached_horizon = True
+            return (self._evaluate_board(board, maximizing_player_id), None)
+
+        # --- Transposition Table Lookup ---
+        tt = self.transposition_table
+        if tt is not None:
+            key = board.zobrist_hash ^ self._perspective_key
+            entry = tt.probe(key)
+            if entry is not None:
+                entry_depth, flag, score, _, entry_horizon = entry
+                if entry_depth >= depth and (
+                    flag == EXACT
+                    or (flag == LOWER_BOUND and score >= beta)
+                    or (flag == UPPER_BOUND and score <= alpha)
+                ):
+                    if entry_horizon:
+                        self._reached_horizon = True
+                    return score, None
+            alpha_orig, beta_orig = alpha, beta
+            horizon_above = self._reached_horizon
+            self._reached_horizon = False
+
+        # --- Recursive Step ---
+        maximizing = board.side == self._max_side
+        best_eval = -math.inf if maximizing else math.inf
+        for turn in board.macro_moves(self.macro_expansion_limit):
+            for move in turn:
+                board.apply(move)
+            current_eval, _ = self._macro_alphabeta(board, depth - 1, alpha, beta, maximizing_player_id)
+            for _ in turn:
+                board.undo()
+            if maximizing:
+                best_eval = max(best_eval, current_eval)
+                alpha = max(alpha, best_eval)
+            else:
+                best_eval = min(best_eval, current_eval)
+                beta = min(beta, best_eval)
+            if alpha >= beta:
+                self.cutoffs += 1
+                break
+
+        if tt is not None:
+            if best_eval <= alpha_orig:
+                flag = UPPER_BOUND
+            elif best_eval >= beta_orig:
+                flag = LOWER_BOUND
+            else:
+                flag = EXACT
+            tt.store(key, depth, flag, best_eval, None, self._reached_horizon)
+            self._reached_horizon |= horizon_above
+        return best_eval, None
+
+# --- Checking Against Plain Minimax ---
+
+def verify_against_minimax(
+    engine: MinimaxSearchAlgo,
+    num_positions: int = 50,
+    max_depth: int = 4,
+    seed: int = 0,
+    initial_seeds: int = 7,
+    board_size: int = 7,
+) -> int:
+    """
+    Searches `num_positions` positions from seeded random games, at random
+    depths up to `max_depth` and for a random player, with both the alpha-beta
+    search of `engine` and its plain `_minimax`, and checks that they return
+    the same (score, move), ties included. `engine` must not use a
+    transposition table, a tablebase or macro moves, which `_minimax` does not
+    model. Returns the number of positions checked. Raises AssertionError on
+    a mismatch.
+    """
+    if engine.transposition_table is not None or engine.tablebase is not None or engine.macro_moves:
+        raise ValueError(f"{engine.name} must search without a table, a tablebase or macro moves")
+    rng = random.Random(seed)
+    saved_depth = engine.depth
+    try:
+        for _ in range(num_positions):
+            board = Board(initial_seeds, board_size)
+            for _ in range(rng.randrange(40)):
+                if board.game_status != GameStatus.ONGOING:
+                    break
+                board = board.make_move(rng.choice(board.get_legal_moves()))
+            player_id = rng.choice((PlayerID.PLAYER_ONE, PlayerID.PLAYER_TWO))
+            engine.depth = rng.randint(1, max_depth)
+            expected = engine._minimax(board, engine.depth, player_id)
+            result = engine.get_best_choice(board, player_id)
+            assert result == expected, (board.board, board.current_player, player_id, engine.depth, result, expected)
+    finally:
+        engine.depth = saved_depth
+    return num_positions
@@ -0,0 +1,136 @@
+from array import array
+
+# --- Entry Bound Types ---
+EXACT = 0        # The stored score is the exact minimax value
+LOWER_BOUND = 1  # The search failed high, the exact value is >= score
+UPPER_BOUND = 2  # The search failed low, the exact value is <= score
+# Set in the stored flag when the search below the entry stopped at its depth
+# limit somewhere. Without it the score holds however deep one searches.
+HORIZON = 4
+
+EMPTY = -1       # Marks a slot that has never been written
+NO_MOVE = -1
+
+# Scores are stored from the maximizing player's point of view, so the hash is
+# XOR-ed with this key when Player 2 is the maximizing player.
+PERSPECTIVE_KEY = 0xD6E8FEB86659FD93
+
+class TranspositionTable:
+    """
+    Fixed-size transposition table keyed by `Board.zobrist_hash`.
+
+    Entries live in flat typed arrays, so the memory used is fixed by
+    `max_memory_mb` when the table is created and never grows. Replacement:
+    - "two-tier" (default): each bucket has two slots. The first keeps the
+      deepest entry of the current search and the second always takes the
+      newest one, including entries pushed out of the first slot.
+    - "depth-preferred": each bucket has one slot. A new entry replaces it
+      when it is at least as deep or when the stored one is from an older search.
+    """
+    # key (Q) + score (d) + depth (h) + flag (b) + move (b) + generation (B)
+    ENTRY_BYTES = 8 + 8 + 2 + 1 + 1 + 1
+    REPLACEMENT_SCHEMES = ("two-tier", "depth-preferred")
+
+    def __init__(self, max_memory_mb: float = 16, replacement: str = "two-tier"):
+        if replacement not in self.REPLACEMENT_SCHEMES:
+            raise ValueError(
+                f"Unknown replacement scheme: {replacement} is not in {self.REPLACEMENT_SCHEMES}"
+            )
+        self.replacement = replacement
+        self.slots_per_bucket = 2 if replacement == "two-tier" else 1
+        self.num_buckets = max(
+            1, int(max_memory_mb * 2**20) // (self.ENTRY_BYTES * self.slots_per_bucket)
+        )
+        size = self.num_buckets * self.slots_per_bucket
+
+        self._keys = array("Q", [0]) * size
+        self._scores = array("d", [0.0]) * size
+        self._depths = array("h", [0]) * size
+        self._flags = array("b", [EMPTY]) * size
+        self._moves = array("b", [NO_MOVE]) * size
+        self._generations = array("B", [0]) * size
+        self.generation = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+
+    def __len__(self):
+        return sum(1 for flag in self._flags if flag != EMPTY)
+
+    def new_search(self):
+        """Ages existing entries so they are replaced before entries from the new search."""
+        self.generation = (self.generation + 1) & 0xFF
+
+    def clear(self):
+        for i in range(len(self._flags)):
+            self._flags[i] = EMPTY
+        self.hits = self.misses = self.stores = 0
+
+    def probe(self, key: int):
+        """
+        Looks up `key`.
+        Returns a tuple (depth, flag, score, move, horizon) or None. `move` is
+        None if the entry has no best move, and `horizon` tells whether the
+        stored search reached its depth limit anywhere.
+        """
+        slot = (key % self.num_buckets) * self.slots_per_bucket
+        for i in range(slot, slot + self.slots_per_bucket):
+            if self._flags[i] != EMPTY and self._keys[i] == key:
+                self.hits += 1
+                move = self._moves[i]
+                score = self._scores[i]
+                flag = self._flags[i]
+                return (
+                    self._depths[i],
+                    flag & ~HORIZON,
+                    int(score) if score.is_integer() else score,
+                    None if move == NO_MOVE else move,
+                    bool(flag & HORIZON),
+                )
+        self.misses += 1
+        return None
+
+    def store(self, key: int, depth: int, flag: int, score, move: int | None, horizon: bool = True):
+        slot = (key % self.num_buckets) * self.slots_per_bucket
+
+        # Overwrite an entry for the same position wherever it lives
+        target = None
+        for i in range(slot, slot + self.slots_per_bucket):
+            if self._flags[i] != EMPTY and self._keys[i] == key:
+                target = i
+                break
+
+        if target is None:
+            if (
+                self._flags[slot] == EMPTY
+                or self._generations[slot] != self.generation
+                or depth >= self._depths[slot]
+            ):
+                target = slot
+                if self.replacement == "two-tier" and self._flags[slot] != EMPTY:
+                    self._copy_slot(slot, slot + 1)
+            elif self.replacement == "two-tier":
+                target = slot + 1
+            else:
+                return
+
+        self._keys[target] = key
+        self._depths[target] = depth
+        self._flags[target] = flag | HORIZON if horizon else flag
+        self._scores[target] = score
+        self._moves[target] = NO_MOVE if move is None else move
+        self._generations[target] = self.generation
+        self.stores += 1
+
+    def _copy_slot(self, source: int, target: int):
+        self._keys[target] = self._keys[source]
+        self._depths[target] = self._depths[source]
+        self._flags[target] = self._flags[source]
+        self._scores[target] = self._scores[source]
+        self._moves[target] = self._moves[source]
+        self._generations[target] = self._generations[source]
+
+    def hit_rate(self) -> float:
+        probes = self.hits + self.misses
+        return self.hits / probes if probes else 0.0
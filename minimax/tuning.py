@@ -0,0 +1,390 @@
+"""
+Tuning the weights of the `MinimaxAlgoV2` evaluation.
+
+Two methods, both writing a weight file for `MinimaxAlgoV2(weights_file=...)`:
+
+- texel: fits the weights to game results. Labelled positions (self-play
+  shards from `rl.selfplay` or game records from `game_record`) are loaded
+  into NumPy arrays, the four evaluation features of every position are
+  computed in one vectorized pass (checked against the engine's own
+  evaluation on a sample first), and the weights minimise the squared
+  error between each position's result (1 win, 0.5 draw, 0 loss for the side
+  to move) and sigmoid(K * evaluation). K is fitted to the starting weights
+  first, so that the scale of the weights stays put.
+- spsa: tunes the weights by play. Each iteration plays games between two
+  randomly perturbed copies of the weights over a process pool and moves the
+  weights towards the perturbation that scored better.
+
+Either way the result can be checked with a match against the starting
+weights, also played over the process pool. Run from the repository root:
+
+    python -m minimax.tuning texel --shards data/selfplay/*.bin --out v2.json --verify-games 200
+    python -m minimax.tuning spsa --iterations 200 --pairs 8 --depth 2 --out v2.json
+
+Requires NumPy.
+"""
+import argparse
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from game_components import Board, PlayerID, GameStatus
+from minimax.minimax_module_v2 import (
+    MinimaxAlgoV2, WEIGHT_NAMES, W_SILO, W_ON_BOARD, W_STEAL_OFF, W_STEAL_DEF, save_weights,
+)
+from arena import opening_moves
+
+DEFAULT_WEIGHTS = np.array([W_SILO, W_ON_BOARD, W_STEAL_OFF, W_STEAL_DEF])
+
+# --- Labelled Positions ---
+# A position set is a dict of arrays: "pits" (N, 2 * board_size + 2), "side"
+# (N,) with 0 when Player 1 is to move, and "result" (N,) for the side to move.
+
+def load_shards(paths: list[str]) -> dict[str, np.ndarray]:
+    """Loads the positions of `rl.selfplay` shards."""
+    from rl.selfplay import open_shard
+
+    shards = [open_shard(path) for path in paths]
+    if not sum(len(shard) for shard in shards):
+        raise ValueError(f"no positions in {len(paths)} shard file(s)")
+    records = np.concatenate(shards)
+    return {
+        "pits": records["pits"].astype(np.int32),
+        "side": records["side"].astype(np.int8),
+        "result": (records["outcome"].astype(np.float64) + 1) / 2,
+    }
+
+def load_records(path: str) -> dict[str, np.ndarray]:
+    """Loads every position after the opening of the finished games in a `game_record` file."""
+    from game_record import read_records
+
+    pits, side, result = [], [], []
+    for record in read_records(path):
+        if record.status == GameStatus.ONGOING:
+            continue
+        for ply, board, _ in record.positions():
+            if ply < record.opening_plies:
+                continue
+            mover = board.current_player.value - 1
+            pits.append(board.board)
+            side.append(mover)
+            if record.status == GameStatus.DRAW:
+                result.append(0.5)
+            else:
+                result.append(1.0 if record.status.value - 1 == mover else 0.0)
+    if not pits:
+        raise ValueError(f"no positions from finished games in {path}")
+    return {
+        "pits": np.array(pits, dtype=np.int32),
+        "side": np.array(side, dtype=np.int8),
+        "result": np.array(result, dtype=np.float64),
+    }
+
+def features(pits: np.ndarray, side: np.ndarray) -> np.ndarray:
+    """
+    The (N, 4) features of the V2 evaluation for the side to move, in
+    `WEIGHT_NAMES` order: silo difference, seeds-in-holes difference, own
+    stealing potential and the opponent's stealing potential.
+    """
+    board_size = (pits.shape[1] - 2) // 2
+    p1_holes = pits[:, :board_size]
+    p2_holes = pits[:, board_size + 1:2 * board_size + 1]
+    facing_p1 = p2_holes[:, ::-1]  # Pit 2 * board_size - i faces hole i
+    p1_steal = np.where(p1_holes == 0, facing_p1, 0).sum(axis=1)
+    p2_steal = np.where(facing_p1 == 0, p1_holes, 0).sum(axis=1)
+    # +1 from Player 1's point of view, -1 from Player 2's
+    sign = 1 - 2 * side.astype(np.int64)
+    is_p1 = side == 0
+    return np.stack([
+        sign * (pits[:, board_size] - pits[:, -1]),
+        sign * (p1_holes.sum(axis=1) - p2_holes.sum(axis=1)),
+        np.where(is_p1, p1_steal, p2_steal),
+        np.where(is_p1, p2_steal, p1_steal),
+    ], axis=1).astype(np.float64)
+
+def check_features(positions: dict[str, np.ndarray], sample: int = 256, seed: int = 0):
+    """
+    Checks `features` against `MinimaxAlgoV2._evaluate_board` on a random
+    sample of `positions`, so the weights are fitted to the evaluation the
+    engine really computes. Raises ValueError on the first mismatch.
+    """
+    pits, side = positions["pits"], positions["side"]
+    rng = np.random.default_rng(seed)
+    indices = rng.choice(len(pits), size=min(sample, len(pits)), replace=False)
+    predicted = features(pits[indices], side[indices]) @ DEFAULT_WEIGHTS
+    algo = MinimaxAlgoV2(1)
+    for i, value in zip(indices, predicted):
+        board = Board(0, (pits.shape[1] - 2) // 2)
+        board.board = [int(seeds) for seeds in pits[i]]
+        board.current_player = PlayerID.PLAYER_ONE if side[i] == 0 else PlayerID.PLAYER_TWO
+        expected = algo._evaluate_board(board, board.current_player)
+        if int(value) != expected:
+            raise ValueError(f"features give {int(value)} but the engine evaluates {expected} for pits {board.board}")
+
+# --- Texel Tuning ---
+
+def _sigmoid(x):
+    return 1 / (1 + np.exp(-np.clip(x, -50, 50)))
+
+def texel_error(x: np.ndarray, result: np.ndarray, weights: np.ndarray, k: float) -> float:
+    """Mean squared error of sigmoid(k * x @ weights) against `result`."""
+    return float(np.mean((result - _sigmoid(k * (x @ weights))) ** 2))
+
+def fit_k(x: np.ndarray, result: np.ndarray, weights: np.ndarray) -> float:
+    """The scale K that minimises the error of `weights`, by golden-section search on log K."""
+    low, high = math.log(1e-5), math.log(10.0)
+    ratio = (math.sqrt(5) - 1) / 2
+    for _ in range(60):
+        a = high - ratio * (high - low)
+        b = low + ratio * (high - low)
+        if texel_error(x, result, weights, math.exp(a)) < texel_error(x, result, weights, math.exp(b)):
+            high = b
+        else:
+            low = a
+    return math.exp((low + high) / 2)
+
+def texel_tune(
+    positions: dict[str, np.ndarray],
+    start: np.ndarray = DEFAULT_WEIGHTS,
+    iterations: int = 2000,
+    learning_rate: float = 0.5,
+    progress=None,
+) -> tuple[np.ndarray, dict]:
+    """
+    Full-batch gradient descent on the Texel error. Steps are scaled per
+    weight by the mean square of its feature, so the features need no
+    normalising. Returns the weights and a summary of the fit.
+    `progress(iteration, error)` is called every 100 iterations.
+    """
+    check_features(positions)
+    x = features(positions["pits"], positions["side"])
+    result = positions["result"]
+    weights = np.array(start, dtype=np.float64)
+    k = fit_k(x, result, weights)
+    start_error = texel_error(x, result, weights, k)
+    scale = learning_rate / (k * k * np.maximum(np.mean(x * x, axis=0), 1e-9))
+    for iteration in range(1, iterations + 1):
+        predicted = _sigmoid(k * (x @ weights))
+        # d/dw of mean (result - p)^2, with dp/dw = k p (1 - p) x
+        gradient = -2 * k * ((result - predicted) * predicted * (1 - predicted)) @ x / len(x)
+        weights -= scale * gradient
+        if progress is not None and iteration % 100 == 0:
+            progress(iteration, texel_error(x, result, weights, k))
+    return weights, {
+        "method": "texel",
+        "positions": len(x),
+        "k": k,
+        "start_error": start_error,
+        "error": texel_error(x, result, weights, k),
+    }
+
+# --- Matches ---
+
+def _as_dict(weights) -> dict[str, float]:
+    return {name: float(value) for name, value in zip(WEIGHT_NAMES, weights)}
+
+def play_weighted_game(
+    weights_one, weights_two, opening: list[int], depth: int, initial_seeds: int = 7, board_size: int = 7
+) -> float:
+    """Plays one game between two sets of V2 weights. Returns Player 1's points."""
+    algos = {
+        PlayerID.PLAYER_ONE: MinimaxAlgoV2(depth, **_as_dict(weights_one)),
+        PlayerID.PLAYER_TWO: MinimaxAlgoV2(depth, **_as_dict(weights_two)),
+    }
+    board = Board(initial_seeds, board_size)
+    for move in opening:
+        board = board.make_move(move)
+    while board.game_status == GameStatus.ONGOING:
+        _, move = algos[board.current_player].get_best_choice(board, board.current_player)
+        board = board.make_move(move)
+    if board.game_status == GameStatus.PLAYER_ONE_WINS:
+        return 1.0
+    elif board.game_status == GameStatus.PLAYER_TWO_WINS:
+        return 0.0
+    return 0.5
+
+def _play_pair(args) -> float:
+    """Plays `opening` twice with colours swapped. Returns the points of `weights_a` out of 2."""
+    weights_a, weights_b, opening, depth, initial_seeds, board_size = args
+    return (
+        play_weighted_game(weights_a, weights_b, opening, depth, initial_seeds, board_size)
+        + 1.0 - play_weighted_game(weights_b, weights_a, opening, depth, initial_seeds, board_size)
+    )
+
+def play_match(
+    pool,
+    weights_a,
+    weights_b,
+    pairs: int,
+    depth: int,
+    seed: int,
+    opening_plies: int = 4,
+    initial_seeds: int = 7,
+    board_size: int = 7,
+) -> float:
+    """Plays `pairs` game pairs over `pool`. Returns the score rate of `weights_a`."""
+    jobs = [
+        (
+            weights_a,
+            weights_b,
+            opening_moves(seed * 1_000_003 + k, opening_plies, initial_seeds, board_size),
+            depth,
+            initial_seeds,
+            board_size,
+        )
+        for k in range(pairs)
+    ]
+    return sum(pool.map(_play_pair, jobs)) / (2 * pairs)
+
+def elo_difference(score_rate: float) -> float:
+    if score_rate <= 0.0 or score_rate >= 1.0:
+        return math.copysign(math.inf, score_rate - 0.5)
+    return -400 * math.log10(1 / score_rate - 1)
+
+def verify(
+    weights,
+    baseline=DEFAULT_WEIGHTS,
+    games: int = 200,
+    depth: int = 3,
+    workers: int | None = None,
+    seed: int = 1,
+    initial_seeds: int = 7,
+    board_size: int = 7,
+) -> dict:
+    """Plays `weights` against `baseline` and returns its score rate and Elo difference."""
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        score = play_match(
+            pool, weights, baseline, max(games // 2, 1), depth, seed,
+            initial_seeds=initial_seeds, board_size=board_size,
+        )
+    return {
+        "games": 2 * max(games // 2, 1),
+        "depth": depth,
+        "initial_seeds": initial_seeds,
+        "board_size": board_size,
+        "score": score,
+        "elo": elo_difference(score),
+    }
+
+# --- SPSA ---
+
+def spsa_tune(
+    start: np.ndarray = DEFAULT_WEIGHTS,
+    iterations: int = 100,
+    pairs: int = 8,
+    depth: int = 2,
+    a: float = 0.1,
+    c: float = 0.2,
+    workers: int | None = None,
+    seed: int = 0,
+    progress=None,
+    initial_seeds: int = 7,
+    board_size: int = 7,
+) -> tuple[np.ndarray, dict]:
+    """
+    Simultaneous perturbation stochastic approximation over match results.
+
+    Weights are tuned relative to the size of their starting values, so `c`
+    (the perturbation) and `a` (the step) are fractions of each weight, and
+    weights that start at 0 move in units of 1. Iteration k plays `pairs`
+    game pairs between start * (theta + c_k delta) and start * (theta - c_k delta)
+    for a random sign vector delta, and steps theta by a_k times the
+    estimated gradient of the score. Games start from `initial_seeds` in each
+    of `board_size` holes. `progress(k, weights, score)` is called after
+    every iteration.
+    """
+    rng = np.random.default_rng(seed)
+    scale = np.where(start != 0, np.abs(start), 1.0)
+    theta = np.array(start, dtype=np.float64) / scale
+    stability = iterations / 10  # Keeps the first steps small
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for k in range(iterations):
+            a_k = a / (k + 1 + stability) ** 0.602
+            c_k = c / (k + 1) ** 0.101
+            delta = rng.choice((-1.0, 1.0), size=len(theta))
+            plus = (theta + c_k * delta) * scale
+            minus = (theta - c_k * delta) * scale
+            score = play_match(
+                pool, plus, minus, pairs, depth, seed * 100_003 + k,
+                initial_seeds=initial_seeds, board_size=board_size,
+            )
+            # score_plus - score_minus = 2 * score - 1
+            theta += a_k * (2 * score - 1) / (2 * c_k * delta)
+            if progress is not None:
+                progress(k + 1, theta * scale, score)
+    return theta * scale, {
+        "method": "spsa",
+        "iterations": iterations,
+        "games_per_iteration": 2 * pairs,
+        "depth": depth,
+        "initial_seeds": initial_seeds,
+        "board_size": board_size,
+    }
+
+# --- Command Line ---
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tune the MinimaxAlgoV2 evaluation weights.")
+    commands = parser.add_subparsers(dest="method", required=True)
+
+    texel = commands.add_parser("texel", help="Fit the weights to the results of labelled positions")
+    source = texel.add_mutually_exclusive_group(required=True)
+    source.add_argument("--shards", nargs="+", help="Self-play shards from rl.selfplay")
+    source.add_argument("--records", help="Game record file from game_record")
+    texel.add_argument("--iterations", type=int, default=2000)
+    texel.add_argument("--learning-rate", type=float, default=0.5)
+
+    spsa = commands.add_parser("spsa", help="Tune the weights by self-play matches")
+    spsa.add_argument("--iterations", type=int, default=100)
+    spsa.add_argument("--pairs", type=int, default=8, help="Game pairs per iteration")
+    spsa.add_argument("--depth", type=int, default=2, help="Search depth of the tuning games")
+    spsa.add_argument("--seed", type=int, default=0)
+
+    for command in (texel, spsa):
+        command.add_argument("--out", required=True, help="Weight file to write")
+        command.add_argument("--workers", type=int, default=os.cpu_count())
+        command.add_argument("--initial-seeds", type=int, default=7, help="Seeds per hole in the tuning and verification games")
+        command.add_argument("--board-size", type=int, default=7, help="Holes per side in the tuning and verification games")
+        command.add_argument("--verify-games", type=int, default=0,
+                             help="Games against the default weights afterwards (0 to skip)")
+        command.add_argument("--verify-depth", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    if args.method == "texel":
+        positions = load_shards(args.shards) if args.shards else load_records(args.records)
+        print(f"Loaded {len(positions['result'])} positions")
+        position_board_size = (positions["pits"].shape[1] - 2) // 2
+        if position_board_size != args.board_size:
+            texel.error(
+                f"The positions are from a {position_board_size}-hole board, not --board-size {args.board_size}"
+            )
+        weights, info = texel_tune(
+            positions, DEFAULT_WEIGHTS, args.iterations, args.learning_rate,
+            progress=lambda i, error: print(f"iteration {i}: error {error:.6f}"),
+        )
+        print(f"Error {info['start_error']:.6f} -> {info['error']:.6f} (K = {info['k']:.5f})")
+    else:
+        weights, info = spsa_tune(
+            DEFAULT_WEIGHTS, args.iterations, args.pairs, args.depth, workers=args.workers, seed=args.seed,
+            initial_seeds=args.initial_seeds, board_size=args.board_size,
+            progress=lambda k, w, score: print(
+                f"iteration {k}: score {score:.3f}, " + ", ".join(f"{v:.3f}" for v in w)
+            ),
+        )
+    info["seconds"] = round(time.perf_counter() - start, 1)
+
+    if args.verify_games:
+        info["verification"] = verify(
+            weights, DEFAULT_WEIGHTS, args.verify_games, args.verify_depth, args.workers,
+            initial_seeds=args.initial_seeds, board_size=args.board_size,
+        )
+        v = info["verification"]
+        print(f"Against the defaults: {v['score']:.1%} over {v['games']} games ({v['elo']:+.0f} Elo)")
+
+    save_weights(args.out, _as_dict(weights), **info)
+    print(f"Wrote {args.out}: " + ", ".join(f"{name} {value:.4f}" for name, value in _as_dict(weights).items()))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+"""
+Opening book: precomputed best moves for every position near the start.
+
+`build_book` searches every position reachable within the first `plies` moves
+of `Board(initial_seeds, board_size)` with a deep engine and writes the result
+to a compact file keyed by `Board.zobrist_hash`. Every move is a ply, so the
+positions in the middle of a free-turn chain, where the same side moves again,
+are in the book too. All replies are included, not only the book moves, so
+the book stays useful when the opponent deviates.
+
+`BookAlgo` wraps any `Algo`: it answers book positions with one binary search
+and hands every other position to the wrapped engine.
+
+    python opening_book.py --plies 4 --depth 8 --out opening.book
+"""
+import argparse
+import os
+import struct
+import time
+from array import array
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
+from game_components import Board, PlayerID, GameStatus
+from algo import Algo
+
+MAGIC = b"CGOB"
+VERSION = 1
+# magic, version, board_size, initial_seeds, plies, depth, number of entries
+HEADER = struct.Struct("<4sHHHHHI")
+
+# --- Book File ---
+# After the header come four columns of `count` entries each, sorted by key:
+# keys (uint64), scores (float32, for the side to move), moves (int8) and the
+# search depth (uint8). That is 14 bytes per position.
+
+class OpeningBook:
+    """An in-memory opening book. `lookup` is a binary search over sorted keys."""
+    def __init__(
+        self,
+        board_size: int,
+        initial_seeds: int,
+        plies: int,
+        depth: int,
+        entries: dict[int, tuple[float, int, int]],
+    ):
+        self.board_size = board_size
+        self.initial_seeds = initial_seeds
+        self.plies = plies
+        self.depth = depth
+        ordered = sorted(entries.items())
+        self._keys = array("Q", [key for key, _ in ordered])
+        self._scores = array("f", [entry[0] for _, entry in ordered])
+        self._moves = array("b", [entry[1] for _, entry in ordered])
+        self._depths = array("B", [entry[2] for _, entry in ordered])
+
+    def __len__(self):
+        return len(self._keys)
+
+    def lookup(self, board: Board) -> tuple[float, int, int] | None:
+        """Returns (score, move, depth) for the side to move, or None if out of book."""
+        if board.board_size != self.board_size:
+            return None
+        key = board.zobrist_hash
+        index = bisect_left(self._keys, key)
+        if index == len(self._keys) or self._keys[index] != key:
+            return None
+        score = self._scores[index]
+        return (int(score) if score.is_integer() else score), self._moves[index], self._depths[index]
+
+    def save(self, path: str):
+        with open(path, "wb") as f:
+            f.write(HEADER.pack(
+                MAGIC, VERSION, self.board_size, self.initial_seeds,
+                self.plies, self.depth, len(self._keys),
+            ))
+            for column in (self._keys, self._scores, self._moves, self._depths):
+                column.tofile(f)
+
+    @classmethod
+    def load(cls, path: str) -> "OpeningBook":
+        with open(path, "rb") as f:
+            magic, version, board_size, initial_seeds, plies, depth, count = HEADER.unpack(
+                f.read(HEADER.size)
+            )
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"{path} is not a version {VERSION} Congklak opening book")
+            book = cls(board_size, initial_seeds, plies, depth, {})
+            for column in (book._keys, book._scores, book._moves, book._depths):
+                column.fromfile(f, count)
+        return book
+
+# --- Building ---
+
+def book_positions(plies: int, initial_seeds: int = 7, board_size: int = 7) -> list[Board]:
+    """
+    Every distinct ongoing position fewer than `plies` moves from the start,
+    i.e. every position the first `plies` moves of a game are played from.
+    Positions reached by different move orders are listed once.
+    """
+    start = Board(initial_seeds, board_size)
+    positions = {start.zobrist_hash: start}
+    frontier = [start]
+    for _ in range(plies - 1):
+        next_frontier = []
+        for board in frontier:
+            for move in board.get_legal_moves():
+                child = board.make_move(move)
+                if child.game_status == GameStatus.ONGOING and child.zobrist_hash not in positions:
+                    positions[child.zobrist_hash] = child
+                    next_frontier.append(child)
+        frontier = next_frontier
+    return list(positions.values())
+
+# Each worker keeps its engine for all the positions it is given, so entries
+# from one book position's search are still in the transposition table when
+# the worker searches a neighbouring position.
+_worker_engine = None
+
+def _init_worker(engine: Algo):
+    global _worker_engine
+    _worker_engine = engine
+
+def _search_position(board: Board) -> tuple[int, float, int]:
+    score, move = _worker_engine.get_best_choice(board, board.current_player)
+    return board.zobrist_hash, score, move
+
+def build_book(
+    engine: Algo,
+    plies: int,
+    initial_seeds: int = 7,
+    board_size: int = 7,
+    workers: int | None = None,
+    progress=None,
+) -> OpeningBook:
+    """
+    Searches every book position with `engine` over a process pool.
+    `progress(done, total)` is called as positions finish.
+    """
+    positions = book_positions(plies, initial_seeds, board_size)
+    depth = getattr(engine, "depth", 0)
+    entries = {}
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(engine,)) as pool:
+        results = pool.map(_search_position, positions, chunksize=16)
+        for done, (key, score, move) in enumerate(results, start=1):
+            entries[key] = (score, move, depth)
+            if progress is not None:
+                progress(done, len(positions))
+    return OpeningBook(board_size, initial_seeds, plies, depth, entries)
+
+# --- Book Player ---
+
+class BookAlgo(Algo):
+    """Plays from an opening book while in book, then defers to `engine`."""
+    def __init__(self, book: OpeningBook | str, engine: Algo):
+        self.book = OpeningBook.load(book) if isinstance(book, str) else book
+        self.engine = engine
+        super().__init__(f"Book + {engine.name}")
+        self.book_hits = 0
+
+    def _lookup(self, board: Board, player_id: PlayerID):
+        if board.current_player != player_id:
+            return None
+        stats = self._new_stats() if self.collect_stats else None
+        entry = self.book.lookup(board)
+        if entry is not None:
+            self.book_hits += 1
+            if stats is not None:
+                stats.book_hits = 1
+                self._report_stats(stats, entry[2])
+        return entry
+
+    def request_stop(self):
+        super().request_stop()
+        self.engine.request_stop()
+
+    def clear_stop(self):
+        super().clear_stop()
+        self.engine.clear_stop()
+
+    # --- Search Statistics ---
+    # Out of book, the wrapped engine's stats are passed on as this algo's own.
+    def enable_stats(self, listener=None):
+        super().enable_stats(listener)
+        if self._relay_stats not in self.engine._stats_listeners:
+            self.engine.enable_stats(self._relay_stats)
+
+    def disable_stats(self):
+        super().disable_stats()
+        self.engine.disable_stats()
+
+    def _relay_stats(self, stats):
+        if self.collect_stats:
+            self.last_stats = stats
+            for listener in self._stats_listeners:
+                listener(stats)
+
+    def get_best_choice(self, board: Board, player_id: PlayerID) -> tuple[int, int | None]:
+        entry = self._lookup(board, player_id)
+        if entry is not None:
+            score, move, _ = entry
+            return score, move
+        return self.engine.get_best_choice(board, player_id)
+
+    def get_best_choice_within(
+        self, board: Board, player_id: PlayerID, time_limit: float
+    ) -> tuple[int, int | None, int]:
+        entry = self._lookup(board, player_id)
+        if entry is not None:
+            return entry
+        return self.engine.get_best_choice_within(board, player_id, time_limit)
+
+if __name__ == "__main__":
+    from minimax.minimax_module_v2 import MinimaxAlgoV2
+    from minimax.transposition import TranspositionTable
+
+    parser = argparse.ArgumentParser(description="Build a Congklak opening book.")
+    parser.add_argument("--plies", type=int, default=4, help="Moves from the start to cover")
+    parser.add_argument("--depth", type=int, default=8, help="Search depth per position")
+    parser.add_argument("--initial-seeds", type=int, default=7)
+    parser.add_argument("--board-size", type=int, default=7)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--out", required=True)
+    args = parser.parse_args()
+
+    engine = MinimaxAlgoV2(args.depth, transposition_table=TranspositionTable())
+    start = time.perf_counter()
+    book = build_book(
+        engine,
+        args.plies,
+        args.initial_seeds,
+        args.board_size,
+        args.workers,
+        progress=lambda done, total: print(f"\r{done}/{total} positions", end="", flush=True),
+    )
+    book.save(args.out)
+    print(f"\nWrote {len(book)} positions to {args.out} in {time.perf_counter() - start:.1f}s")
@@ -0,0 +1,143 @@
+"""
+Pondering: searching on the opponent's time.
+
+While the opponent thinks, a `Ponderer` searches, in a background thread, the
+positions the AI may be asked to move from next: every position where it is
+the AI's turn again after one opponent move, or after a whole free-turn chain
+of them. They are searched with the same settings as a normal move (fixed
+depth, or `time_limit`), most likely replies first, and the results are kept
+by Zobrist hash. When the opponent has moved, `take` returns
+
+- the stored result at once if that position was already searched,
+- the result of the search in progress if it is of that position, once it
+  finishes,
+- None otherwise, after stopping the background search, so the caller
+  searches as usual. Engines with a transposition table or a kept MCTS tree
+  still start warm.
+
+The engine is used by the background thread, so nothing else may search with
+it between `start` and `take` (or `stop`). Pondering only pays off while the
+opponent does not need the interpreter itself, e.g. while waiting for a human
+or for a reply over the network: the threads share one interpreter lock.
+"""
+import threading
+from game_components import Board, PlayerID, GameStatus
+
+# Positions searched at most per opponent turn
+MAX_POSITIONS = 16
+
+def reply_positions(board: Board, max_positions: int = MAX_POSITIONS) -> list[Board]:
+    """
+    The distinct ongoing positions, at most `max_positions`, where the player
+    not to move on `board` is on move again once the player to move has made
+    one move or a free-turn chain of moves. The likeliest come first: those
+    that leave the opponent more seeds in their store, then fewer moves deep.
+    """
+    mover = board.current_player
+    store = board.get_player_silo_index(mover)
+    positions = {}
+    frontier = [board]
+    while frontier and len(positions) < max_positions:
+        next_frontier = []
+        for position in frontier:
+            for move in position.get_legal_moves():
+                child = position.make_move(move)
+                if child.game_status != GameStatus.ONGOING:
+                    continue
+                if child.current_player == mover:
+                    next_frontier.append(child)
+                else:
+                    positions.setdefault(child.zobrist_hash, child)
+        frontier = next_frontier
+    ordered = sorted(positions.values(), key=lambda child: -child.board[store])
+    return ordered[:max_positions]
+
+class Ponderer:
+    """Searches an AI player's likely next positions in a background thread."""
+    def __init__(
+        self,
+        algo,
+        player_id: PlayerID,
+        time_limit: float | None = None,
+        max_positions: int = MAX_POSITIONS,
+    ):
+        self.algo = algo
+        self.player_id = player_id
+        self.time_limit = time_limit
+        self.max_positions = max_positions
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._thread = None
+        self._results = {}
+        self._searching = None
+        self._finish_current = False
+        self._cancelled = False
+
+    @property
+    def active(self) -> bool:
+        return self._thread is not None
+
+    def start(self, board: Board):
+        """Starts pondering the replies to `board`, where the opponent is to move."""
+        self.stop()
+        self._results = {}
+        self._finish_current = False
+        self._cancelled = False
+        positions = reply_positions(board, self.max_positions)
+        if not positions:
+            return
+        self._thread = threading.Thread(target=self._run, args=(positions,), name="ponder", daemon=True)
+        self._thread.start()
+
+    def _run(self, positions: list[Board]):
+        algo = self.algo
+        for board in positions:
+            with self._lock:
+                if self._cancelled or self._finish_current:
+                    return
+                self._searching = board.zobrist_hash
+            algo.last_stats = None
+            if self.time_limit is not None:
+                result = algo.get_best_choice_within(board, self.player_id, self.time_limit)
+            else:
+                result = (*algo.get_best_choice(board, self.player_id), None)
+            with self._lock:
+                self._searching = None
+                if not algo.stop_requested:
+                    self._results[board.zobrist_hash] = (*result, algo.last_stats)
+
+    def take(self, board: Board):
+        """
+        Ends pondering and returns (score, move, depth, stats) for `board` if
+        it was pondered, else None. `depth` is None for fixed-depth searches,
+        and `stats` is None unless the engine collects them.
+        """
+        if self._thread is None:
+            return None
+        key = board.zobrist_hash
+        with self._lock:
+            result = self._results.get(key)
+            if result is None and self._searching == key:
+                self._finish_current = True
+        if result is None and self._finish_current:
+            self._thread.join()
+            result = self._results.get(key)
+        self.stop()
+        if result is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return result
+
+    def stop(self):
+        """Stops the background search, if any, and waits for the thread to end."""
+        if self._thread is None:
+            return
+        with self._lock:
+            self._cancelled = True
+            self.algo.request_stop()
+        self._thread.join()
+        self._thread = None
+        self._searching = None
+        self.algo.clear_stop()
@@ -0,0 +1,254 @@
+"""
+Self-play training data for the rl/ work.
+
+Games are played in parallel worker processes by `MinimaxAlgoV2` or a random
+policy, each after its own random opening so that the games differ. Every
+searched position becomes one fixed-width record of (position, side to move,
+search value, chosen move, final outcome), and records stream through
+generators into binary shards:
+
+    records = generate_records(1000, policy="minimax-v2", depth=3)
+    paths = write_shards(records, "data/selfplay")
+    for batch in read_batches(paths, batch_size=4096):
+        batch["pits"], batch["outcome"], ...
+
+A shard is a 16-byte header followed by packed records, so it can be opened
+with `numpy.memmap` at offset `HEADER.size` using `record_dtype(board_size)`.
+Run from the repository root:
+
+    python -m rl.selfplay --games 1000 --depth 3 --out-dir data/selfplay
+
+Reading requires NumPy.
+"""
+import argparse
+import math
+import multiprocessing
+import os
+import random
+import struct
+import time
+import numpy as np
+from game_components import Board, GameStatus
+from arena import opening_moves
+
+MAGIC = b"CGSP"
+VERSION = 1
+HEADER = struct.Struct("<4sHHI4x")  # magic, version, board_size, record size
+POLICIES = ("minimax-v2", "random")
+
+# --- Record Layout ---
+# pits (int16 per pit), side to move (0 or 1), chosen move, outcome for the
+# side to move (1 win, 0 draw, -1 loss), search value for the side to move
+# (NaN for the random policy), game number and ply within the game.
+
+def record_struct(board_size: int) -> struct.Struct:
+    return struct.Struct(f"<{2 * board_size + 2}hbbbfIH")
+
+def record_dtype(board_size: int) -> np.dtype:
+    """The NumPy dtype of one record. It has the same packed layout as `record_struct`."""
+    return np.dtype([
+        ("pits", "<i2", (2 * board_size + 2,)),
+        ("side", "i1"),
+        ("move", "i1"),
+        ("outcome", "i1"),
+        ("value", "<f4"),
+        ("game", "<u4"),
+        ("ply", "<u2"),
+    ])
+
+def _outcome_for(status: GameStatus, side: int) -> int:
+    if status == GameStatus.DRAW:
+        return 0
+    winner = 0 if status == GameStatus.PLAYER_ONE_WINS else 1
+    return 1 if winner == side else -1
+
+# --- Game Generation ---
+
+def play_selfplay_game(
+    game: int,
+    policy: str,
+    depth: int,
+    seed: int,
+    opening_plies: int,
+    initial_seeds: int = 7,
+    board_size: int = 7,
+) -> list[tuple]:
+    """
+    Plays one game and returns its records as tuples in `record_struct` field
+    order. The random opening moves are played but not recorded.
+    """
+    from minimax.minimax_module_v2 import MinimaxAlgoV2
+
+    rng = random.Random(seed)
+    algo = MinimaxAlgoV2(depth) if policy == "minimax-v2" else None
+    board = Board(initial_seeds, board_size)
+    for move in opening_moves(seed, opening_plies, initial_seeds, board_size):
+        board = board.make_move(move)
+
+    positions = []
+    while board.game_status == GameStatus.ONGOING:
+        side = board.current_player.value - 1
+        if algo is not None:
+            value, move = algo.get_best_choice(board, board.current_player)
+        else:
+            value, move = math.nan, rng.choice(board.get_legal_moves())
+        positions.append((board.board, side, move, value))
+        board = board.make_move(move)
+
+    return [
+        (*pits, side, move, _outcome_for(board.game_status, side), value, game, ply)
+        for ply, (pits, side, move, value) in enumerate(positions)
+    ]
+
+def _play_job(args):
+    return play_selfplay_game(*args)
+
+def generate_records(
+    num_games: int,
+    policy: str = "minimax-v2",
+    depth: int = 3,
+    workers: int | None = None,
+    seed: int = 0,
+    opening_plies: int = 6,
+    initial_seeds: int = 7,
+    board_size: int = 7,
+):
+    """
+    Yields records from `num_games` games played over a process pool, game by
+    game as they finish, so memory stays bounded by the games in flight.
+    """
+    if policy not in POLICIES:
+        raise ValueError(f"Unknown policy: {policy} is not in {POLICIES}")
+    jobs = (
+        (game, policy, depth, seed * 1_000_003 + game, opening_plies, initial_seeds, board_size)
+        for game in range(num_games)
+    )
+    with multiprocessing.Pool(workers) as pool:
+        for records in pool.imap_unordered(_play_job, jobs, chunksize=4):
+            yield from records
+
+# --- Shards ---
+
+class ShardWriter:
+    """
+    Writes records to numbered shards of at most `records_per_shard` records.
+    Records are packed into a buffer and written `batch_records` at a time.
+    """
+    def __init__(
+        self,
+        out_dir: str,
+        board_size: int = 7,
+        records_per_shard: int = 1_000_000,
+        batch_records: int = 8192,
+        prefix: str = "selfplay",
+    ):
+        self.out_dir = out_dir
+        self.board_size = board_size
+        self.records_per_shard = records_per_shard
+        self.batch_records = batch_records
+        self.prefix = prefix
+        self.paths = []
+        self.records_written = 0
+        self._record = record_struct(board_size)
+        self._buffer = bytearray()
+        self._buffered = 0
+        self._file = None
+        self._in_shard = 0
+        os.makedirs(out_dir, exist_ok=True)
+
+    def write(self, record: tuple):
+        self._buffer += self._record.pack(*record)
+        self._buffered += 1
+        if self._buffered >= self.batch_records or self._in_shard + self._buffered >= self.records_per_shard:
+            self.flush()
+
+    def flush(self):
+        if not self._buffered:
+            return
+        if self._file is None:
+            path = os.path.join(self.out_dir, f"{self.prefix}-{len(self.paths):05d}.bin")
+            self._file = open(path, "wb")
+            self._file.write(HEADER.pack(MAGIC, VERSION, self.board_size, self._record.size))
+            self.paths.append(path)
+        self._file.write(self._buffer)
+        self._in_shard += self._buffered
+        self.records_written += self._buffered
+        self._buffer.clear()
+        self._buffered = 0
+        if self._in_shard >= self.records_per_shard:
+            self._file.close()
+            self._file = None
+            self._in_shard = 0
+
+    def close(self):
+        self.flush()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def write_shards(records, out_dir: str, board_size: int = 7, **writer_options) -> list[str]:
+    """Drains `records` into shards in `out_dir` and returns their paths."""
+    with ShardWriter(out_dir, board_size, **writer_options) as writer:
+        for record in records:
+            writer.write(record)
+    return writer.paths
+
+def open_shard(path: str) -> np.memmap:
+    """Memory-maps a shard as a structured array of records."""
+    with open(path, "rb") as f:
+        magic, version, board_size, record_size = HEADER.unpack(f.read(HEADER.size))
+    dtype = record_dtype(board_size)
+    if magic != MAGIC or version != VERSION or record_size != dtype.itemsize:
+        raise ValueError(f"{path} is not a version {VERSION} self-play shard")
+    if os.path.getsize(path) == HEADER.size:
+        return np.zeros(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode="r", offset=HEADER.size)
+
+def read_batches(paths: list[str], batch_size: int = 4096, shuffle_seed: int | None = None):
+    """
+    Yields structured arrays of up to `batch_size` records, reading only one
+    batch of each memory-mapped shard at a time. With `shuffle_seed`, shards
+    and the batches within each shard are visited in a random order.
+    """
+    rng = np.random.default_rng(shuffle_seed) if shuffle_seed is not None else None
+    paths = list(paths)
+    if rng is not None:
+        rng.shuffle(paths)
+    for path in paths:
+        records = open_shard(path)
+        starts = np.arange(0, len(records), batch_size)
+        if rng is not None:
+            rng.shuffle(starts)
+        for start in starts:
+            yield np.array(records[start:start + batch_size])
+        del records
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate Congklak self-play training shards.")
+    parser.add_argument("--games", type=int, default=100)
+    parser.add_argument("--policy", choices=POLICIES, default="minimax-v2")
+    parser.add_argument("--depth", type=int, default=3, help="Search depth for minimax-v2")
+    parser.add_argument("--opening-plies", type=int, default=6, help="Random plies before recording starts")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--initial-seeds", type=int, default=7)
+    parser.add_argument("--board-size", type=int, default=7)
+    parser.add_argument("--records-per-shard", type=int, default=1_000_000)
+    parser.add_argument("--out-dir", required=True)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    records = generate_records(
+        args.games, args.policy, args.depth, args.workers, args.seed,
+        args.opening_plies, args.initial_seeds, args.board_size,
+    )
+    paths = write_shards(records, args.out_dir, args.board_size, records_per_shard=args.records_per_shard)
+    total = sum(len(open_shard(path)) for path in paths)
+    print(f"Wrote {total} records from {args.games} games to {len(paths)} shards "
+          f"in {time.perf_counter() - start:.1f}s")
@@ -0,0 +1,412 @@
+"""
+Asyncio game server hosting many concurrent Congklak games.
+
+Clients speak JSON lines over a local TCP port, a Unix socket or stdio. Each
+request is one JSON object with an "op" and an optional "id" that is echoed
+back in the response; responses may arrive out of order.
+
+    {"id": 1, "op": "new", "initial_seeds": 7, "board_size": 7}
+    {"id": 2, "op": "move", "game": 1, "hole": 3}
+    {"id": 3, "op": "ai_move", "game": 1, "algo": "minimax-v2", "deadline": 2.0}
+    {"id": 4, "op": "state", "game": 1}
+    {"id": 5, "op": "close", "game": 1}
+    {"id": 6, "op": "metrics"}
+
+A game is stored as one small serialized board (see `encode_board`), not as a
+`CongklakGame`. AI moves run in a bounded process pool so a deep search never
+blocks the event loop. When too many searches are queued, new ones are turned
+away at once with "server busy", and each connection reads no further
+requests while it has too many in flight. An "ai_move" with a "deadline"
+(seconds) fails with "deadline exceeded" if no move is ready by then, and the
+game is left unchanged. "time_limit" instead asks the engine for an
+iterative-deepening search of that many seconds. A request line longer
+than --max-line-bytes is skipped and answered with "request too long".
+
+    python server.py --port 8765
+    python server.py --unix /tmp/congklak.sock
+    python server.py --stdio
+"""
+import argparse
+import asyncio
+import json
+import math
+import multiprocessing
+import os
+import struct
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from game_components import Board, PlayerID, GameStatus
+
+# --- Board Serialization ---
+# board_size, side to move (0 or 1) and GameStatus value, then one int16 per pit.
+# The standard board takes 36 bytes.
+BOARD_HEADER = struct.Struct("<HBB")
+
+def encode_board(board: Board) -> bytes:
+    side = 0 if board.current_player == PlayerID.PLAYER_ONE else 1
+    header = BOARD_HEADER.pack(board.board_size, side, board.game_status.value)
+    return header + struct.pack(f"<{len(board.board)}h", *board.board)
+
+def decode_board(data: bytes) -> Board:
+    board_size, side, status = BOARD_HEADER.unpack_from(data)
+    board = Board(0, board_size)
+    board.board = list(struct.unpack_from(f"<{2 * board_size + 2}h", data, BOARD_HEADER.size))
+    board.current_player = PlayerID.PLAYER_ONE if side == 0 else PlayerID.PLAYER_TWO
+    board.game_status = GameStatus(status)
+    board.refresh_hash()
+    return board
+
+def board_state(board: Board) -> dict:
+    return {
+        "board": board.board,
+        "current_player": board.current_player.name,
+        "status": board.game_status.name,
+        "legal_moves": board.get_legal_moves() if board.game_status == GameStatus.ONGOING else [],
+    }
+
+# --- Worker Process ---
+
+def _search_move(algo_name: str, board_data: bytes, time_limit: float | None) -> tuple:
+    """Runs in a pool worker. Returns (score, move, depth)."""
+    from main import available_algos
+
+    algo = available_algos[algo_name]
+    board = decode_board(board_data)
+    if time_limit is not None:
+        return algo.get_best_choice_within(board, board.current_player, time_limit)
+    score, move = algo.get_best_choice(board, board.current_player)
+    return score, move, getattr(algo, "depth", None)
+
+# Default longest request line, the asyncio stream reader's own default limit
+MAX_LINE_BYTES = 2**16
+
+class RequestError(Exception):
+    """A request that cannot be served. Its message is sent back to the client."""
+    pass
+
+# --- Server ---
+
+class GameServer:
+    def __init__(
+        self,
+        workers: int | None = None,
+        max_queue: int | None = None,
+        max_in_flight: int = 16,
+        max_sessions: int = 100_000,
+        latency_window: int = 1000,
+        max_line_bytes: int = MAX_LINE_BYTES,
+    ):
+        from main import available_algos
+
+        self.algo_names = list(available_algos)
+        self.workers = workers or os.cpu_count()
+        # Searches waiting for or running in the pool before new ones are refused
+        self.max_queue = max_queue or 4 * self.workers
+        # Requests one connection may have in flight before it is read no further
+        self.max_in_flight = max_in_flight
+        self.max_sessions = max_sessions
+        # Longest request line read, larger ones are skipped and refused
+        self.max_line_bytes = max_line_bytes
+        # Spawned rather than forked: a forked worker would keep a copy of every
+        # client socket open at the time, so closing a connection here would
+        # not end it for the client
+        self.pool = ProcessPoolExecutor(
+            max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+        )
+
+        self.sessions = {}  # game id -> encode_board bytes
+        self._busy_games = set()
+        self._next_game = 1
+
+        self.queue_depth = 0
+        self.max_queue_depth = 0
+        self.connections = 0
+        self.requests = 0
+        self.ai_moves = 0
+        self.rejected = 0
+        self.timeouts = 0
+        self._latencies = deque(maxlen=latency_window)
+
+    def close(self):
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+    # --- Connections ---
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections += 1
+        in_flight = asyncio.Semaphore(self.max_in_flight)
+        write_lock = asyncio.Lock()
+        tasks = set()
+
+        async def respond(line: bytes | None):
+            try:
+                if line is None:
+                    self.requests += 1
+                    response = {"id": None, "ok": False, "error": "request too long"}
+                else:
+                    response = await self.handle_line(line)
+                async with write_lock:
+                    writer.write(json.dumps(response).encode() + b"\n")
+                    await writer.drain()
+            except ConnectionError:
+                pass
+            finally:
+                in_flight.release()
+
+        try:
+            while True:
+                # Waiting here before reading is what pushes back on a busy client
+                await in_flight.acquire()
+                try:
+                    line = await reader.readuntil(b"\n")
+                except asyncio.IncompleteReadError as e:
+                    line = e.partial  # Last line without a newline, or b"" at EOF
+                except asyncio.LimitOverrunError as e:
+                    line = None
+                    if not await self._skip_line(reader, e.consumed):
+                        line = b""
+                except ConnectionError:
+                    line = b""
+                if line == b"":
+                    in_flight.release()
+                    break
+                task = asyncio.create_task(respond(line))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        finally:
+            # Replies still being searched for are sent before the connection closes
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+            self.connections -= 1
+            writer.close()
+
+    @staticmethod
+    async def _skip_line(reader: asyncio.StreamReader, consumed: int) -> bool:
+        """
+        Discards the rest of a request line that is over the reader's limit,
+        `consumed` bytes of which are buffered without its newline. Returns
+        False if the connection ended first.
+        """
+        while True:
+            try:
+                await reader.readexactly(consumed)
+                await reader.readuntil(b"\n")
+                return True
+            except asyncio.LimitOverrunError as e:
+                consumed = e.consumed
+            except (asyncio.IncompleteReadError, ConnectionError):
+                return False
+
+    async def handle_line(self, line: bytes) -> dict:
+        self.requests += 1
+        try:
+            request = json.loads(line)
+        except json.JSONDecodeError:
+            return {"ok": False, "error": "invalid JSON"}
+        if not isinstance(request, dict):
+            return {"ok": False, "error": "a request must be a JSON object"}
+
+        response = {"id": request.get("id")}
+        handler = getattr(self, f"_op_{request.get('op')}", None)
+        if handler is None:
+            response.update(ok=False, error=f"unknown op: {request.get('op')}")
+            return response
+        try:
+            response.update(await handler(request))
+            response["ok"] = True
+        except RequestError as e:
+            response.update(ok=False, error=str(e))
+        except Exception as e:
+            # A bug, or an engine failing in a pool worker: the client still gets a reply
+            response.update(ok=False, error=f"internal error: {type(e).__name__}: {e}")
+        return response
+
+    # --- Request Fields ---
+    def _known_game(self, request: dict) -> int:
+        game = request.get("game")
+        if not isinstance(game, int) or isinstance(game, bool) or game not in self.sessions:
+            raise RequestError(f"unknown game: {game}")
+        return game
+
+    def _game_id(self, request: dict) -> int:
+        """A known game that is free to change."""
+        game = self._known_game(request)
+        if game in self._busy_games:
+            raise RequestError(f"game {game} is already handling a request")
+        return game
+
+    @staticmethod
+    def _seconds(request: dict, field: str) -> float | None:
+        value = request.get(field)
+        if value is None:
+            return None
+        if not isinstance(value, (int, float)) or isinstance(value, bool) or not 0 < value < math.inf:
+            raise RequestError(f"{field} must be a positive number of seconds")
+        return value
+
+    # --- Operations ---
+    async def _op_new(self, request: dict) -> dict:
+        if len(self.sessions) >= self.max_sessions:
+            raise RequestError("too many games")
+        initial_seeds = request.get("initial_seeds", 7)
+        board_size = request.get("board_size", 7)
+        if not (isinstance(initial_seeds, int) and isinstance(board_size, int)) or not (
+            0 < board_size <= 50 and 0 < initial_seeds <= 100
+        ):
+            raise RequestError("initial_seeds must be 1-100 and board_size 1-50")
+        game = self._next_game
+        self._next_game += 1
+        board = Board(initial_seeds, board_size)
+        self.sessions[game] = encode_board(board)
+        return {"game": game, "state": board_state(board)}
+
+    async def _op_state(self, request: dict) -> dict:
+        game = self._known_game(request)
+        return {"game": game, "state": board_state(decode_board(self.sessions[game]))}
+
+    async def _op_close(self, request: dict) -> dict:
+        game = self._game_id(request)
+        del self.sessions[game]
+        return {"game": game}
+
+    async def _op_move(self, request: dict) -> dict:
+        game = self._game_id(request)
+        board = decode_board(self.sessions[game])
+        if board.game_status != GameStatus.ONGOING:
+            raise RequestError(f"game {game} is over")
+        hole = request.get("hole")
+        if not isinstance(hole, int) or isinstance(hole, bool):
+            raise RequestError(f"hole must be an integer, got {hole!r}")
+        try:
+            board = board.make_move(hole)
+        except ValueError as e:
+            raise RequestError(str(e))
+        self.sessions[game] = encode_board(board)
+        return {"game": game, "state": board_state(board)}
+
+    async def _op_ai_move(self, request: dict) -> dict:
+        game = self._game_id(request)
+        time_limit = self._seconds(request, "time_limit")
+        deadline = self._seconds(request, "deadline")
+        algo_name = request.get("algo", self.algo_names[0])
+        if algo_name not in self.algo_names:
+            raise RequestError(f"unknown algo: {algo_name}, choose from {self.algo_names}")
+        board_data = self.sessions[game]
+        if decode_board(board_data).game_status != GameStatus.ONGOING:
+            raise RequestError(f"game {game} is over")
+        if self.queue_depth >= self.max_queue:
+            self.rejected += 1
+            raise RequestError("server busy, retry later")
+
+        self._busy_games.add(game)
+        self.queue_depth += 1
+        self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+        start = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(
+            self.pool, _search_move, algo_name, board_data, time_limit
+        )
+
+        # A search that is already running cannot be stopped, so after a missed
+        # deadline it still counts as queued, and keeps its game, until it ends.
+        def release(_):
+            self.queue_depth -= 1
+            self._busy_games.discard(game)
+        future.add_done_callback(release)
+
+        try:
+            score, move, depth = await asyncio.wait_for(asyncio.shield(future), deadline)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise RequestError("deadline exceeded")
+
+        latency = time.perf_counter() - start
+        self._latencies.append(latency)
+        self.ai_moves += 1
+        board = decode_board(board_data).make_move(move)
+        self.sessions[game] = encode_board(board)
+        return {
+            "game": game,
+            "move": move,
+            "score": score if math.isfinite(score) else str(score),
+            "depth": depth,
+            "latency_ms": round(latency * 1000, 3),
+            "state": board_state(board),
+        }
+
+    async def _op_metrics(self, request: dict) -> dict:
+        return {"metrics": self.metrics()}
+
+    def metrics(self) -> dict:
+        latencies = sorted(self._latencies)
+
+        def percentile(p):
+            if not latencies:
+                return None
+            return round(latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000, 3)
+
+        return {
+            "sessions": len(self.sessions),
+            "connections": self.connections,
+            "requests": self.requests,
+            "ai_moves": self.ai_moves,
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+            "queue_capacity": self.max_queue,
+            "rejected": self.rejected,
+            "timeouts": self.timeouts,
+            "latency_ms": {
+                "window": len(latencies),
+                "mean": round(sum(latencies) / len(latencies) * 1000, 3) if latencies else None,
+                "p50": percentile(0.50),
+                "p95": percentile(0.95),
+                "max": percentile(1.0),
+            },
+        }
+
+# --- Transports ---
+
+async def serve_stdio(server: GameServer):
+    """Serves one client on stdin/stdout, which must be pipes, as when a front end spawns the server."""
+    loop = asyncio.get_running_loop()
+    reader = asyncio.StreamReader(limit=server.max_line_bytes)
+    await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin)
+    transport, protocol = await loop.connect_write_pipe(asyncio.streams.FlowControlMixin, sys.stdout)
+    writer = asyncio.StreamWriter(transport, protocol, reader, loop)
+    await server.handle_connection(reader, writer)
+
+async def serve(server: GameServer, host: str = "127.0.0.1", port: int | None = None, unix_path: str | None = None):
+    if unix_path is not None:
+        listener = await asyncio.start_unix_server(server.handle_connection, unix_path, limit=server.max_line_bytes)
+    else:
+        listener = await asyncio.start_server(server.handle_connection, host, port, limit=server.max_line_bytes)
+    async with listener:
+        await listener.serve_forever()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve concurrent Congklak games over JSON lines.")
+    transport = parser.add_mutually_exclusive_group(required=True)
+    transport.add_argument("--port", type=int, help="TCP port on --host")
+    transport.add_argument("--unix", help="Unix socket path")
+    transport.add_argument("--stdio", action="store_true", help="Serve one client on stdin/stdout")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Search processes")
+    parser.add_argument("--max-queue", type=int, help="Queued searches before refusing more (default: 4 per worker)")
+    parser.add_argument("--max-in-flight", type=int, default=16, help="Requests in flight per connection")
+    parser.add_argument("--max-line-bytes", type=int, default=MAX_LINE_BYTES, help="Longest request line")
+    args = parser.parse_args(argv)
+
+    server = GameServer(args.workers, args.max_queue, args.max_in_flight, max_line_bytes=args.max_line_bytes)
+    try:
+        if args.stdio:
+            asyncio.run(serve_stdio(server))
+        else:
+            asyncio.run(serve(server, args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+
+if __name__ == "__main__":
+    main()
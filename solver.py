@@ -0,0 +1,332 @@
+"""
+Exact solver for small Congklak variants.
+
+Computes the game-theoretic value of a position: the final silo margin the
+side to move will still gain over the opponent under perfect play by both
+sides, which is the value stored by `tablebase.py` too. Seeds already in the
+silos never move again, so the final score difference is the current one plus
+this value, and for the starting position it is the final score difference
+itself.
+
+The search is MTD(f): a sequence of null-window alpha-beta searches that
+converges on the exact value, every one of them down to the end of the game.
+Their results are kept in a cache of (lower bound, upper bound, best move) per
+position. As in the tablebase, a position is its hole counts seen from the
+side to move, so the cache serves any seed count and either side. The game is
+acyclic (see `tablebase._Solver`), so bounds never depend on how a position
+was reached. Every cache entry is valid on its own, so the cache can be saved
+at any moment, including in the middle of a search, and a later run loads it
+and carries on:
+
+    python solver.py --board-size 4 --seeds 4 --cache solver_4.cache
+    python solver.py --board-size 3 4 5 --seeds 3 4 5 --out results.json
+"""
+import argparse
+import json
+import os
+import struct
+import sys
+import time
+from array import array
+from game_components import Board, SearchBoard, PlayerID, GameStatus
+from algo import Algo
+from minimax.search import heuristic_order
+
+MAGIC = b"CGSV"
+VERSION = 1
+HEADER = struct.Struct("<4sHHI")  # magic, version, board_size, number of entries
+NO_MOVE = -1
+
+# Seconds between automatic checkpoints of the cache, when it has a path
+CHECKPOINT_INTERVAL = 300
+# The clock is read once every CHECK_MASK + 1 nodes
+CHECK_MASK = 4095
+
+class ExactSolver:
+    """
+    Solves positions on boards of `board_size` holes per side.
+
+    With `cache_path`, the cache is loaded from that file if it exists and
+    saved to it by `checkpoint`, which also runs every `checkpoint_interval`
+    seconds during long solves. With a `tablebase` (a
+    `tablebase.EndgameTablebase` for the same board size), positions it
+    covers are not searched.
+    """
+    def __init__(
+        self,
+        board_size: int,
+        cache_path: str | None = None,
+        checkpoint_interval: float = CHECKPOINT_INTERVAL,
+        tablebase=None,
+    ):
+        self.board_size = board_size
+        self.cache_path = cache_path
+        self.checkpoint_interval = checkpoint_interval
+        self.tablebase = tablebase
+        # Hole counts seen from the side to move (`_key`) -> (lower, upper, best move)
+        self.cache = {}
+        self.nodes = 0
+        self.cache_hits = 0
+        self.tablebase_hits = 0
+        self._last_checkpoint = time.perf_counter()
+        if cache_path is not None and os.path.exists(cache_path):
+            self.load(cache_path)
+
+    # --- Cache Files ---
+    # After the header come the keys (8 * board_size bytes each, the hole
+    # counts as int32), then the lower bounds and upper bounds (int16) and the
+    # best moves (int8) of all entries in the same order.
+
+    def _key_size(self) -> int:
+        return 2 * self.board_size * array("i").itemsize
+
+    def load(self, path: str):
+        with open(path, "rb") as f:
+            magic, version, board_size, count = HEADER.unpack(f.read(HEADER.size))
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"{path} is not a version {VERSION} Congklak solver cache")
+            if board_size != self.board_size:
+                raise ValueError(f"{path} is for {board_size} holes, not {self.board_size}")
+            keys = f.read(count * self._key_size())
+            lowers, uppers, moves = array("h"), array("h"), array("b")
+            lowers.fromfile(f, count)
+            uppers.fromfile(f, count)
+            moves.fromfile(f, count)
+        size = self._key_size()
+        for i in range(count):
+            self.cache[keys[i * size:(i + 1) * size]] = (lowers[i], uppers[i], moves[i])
+
+    def save(self, path: str):
+        """Writes the cache to `path`, replacing the old file only once the new one is complete."""
+        entries = list(self.cache.items())
+        partial_path = path + ".partial"
+        with open(partial_path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, VERSION, self.board_size, len(entries)))
+            f.write(b"".join(key for key, _ in entries))
+            array("h", [entry[0] for _, entry in entries]).tofile(f)
+            array("h", [entry[1] for _, entry in entries]).tofile(f)
+            array("b", [entry[2] for _, entry in entries]).tofile(f)
+        os.replace(partial_path, path)
+
+    def checkpoint(self):
+        if self.cache_path is not None:
+            self.save(self.cache_path)
+        self._last_checkpoint = time.perf_counter()
+
+    # --- Search ---
+
+    def _key(self, board: SearchBoard) -> bytes:
+        pits = board.board
+        n = self.board_size
+        own, other = (pits[0:n], pits[n + 1:2 * n + 1]) if board.side == 0 else (pits[n + 1:2 * n + 1], pits[0:n])
+        return own.tobytes() + other.tobytes()
+
+    def _alphabeta(self, board: SearchBoard, alpha: int, beta: int) -> int:
+        """
+        Fail-soft alpha-beta search to the end of the game. Returns the margin
+        to come for the side to move, exact when strictly inside (alpha, beta)
+        and a bound on it otherwise.
+        """
+        self.nodes += 1
+        if not self.nodes & CHECK_MASK and self.cache_path is not None:
+            if time.perf_counter() - self._last_checkpoint >= self.checkpoint_interval:
+                self.checkpoint()
+
+        if self.tablebase is not None:
+            value = self.tablebase.probe_pits(board.board, board.side)
+            if value is not None:
+                self.tablebase_hits += 1
+                return value
+
+        key = self._key(board)
+        entry = self.cache.get(key)
+        hint_move = None
+        if entry is not None:
+            lower, upper, hint_move = entry
+            if lower >= beta or upper <= alpha or lower == upper:
+                self.cache_hits += 1
+                return lower if lower >= beta or lower == upper else upper
+            alpha = max(alpha, lower)
+            beta = min(beta, upper)
+        else:
+            lower, upper = -board.num_seeds, board.num_seeds
+
+        pits = board.board
+        side = board.side
+        own_silo = self.board_size if side == 0 else 2 * self.board_size + 1
+        other_silo = 2 * self.board_size + 1 if side == 0 else self.board_size
+        best, best_move = -board.num_seeds - 1, NO_MOVE
+        window_alpha = alpha
+        for move in heuristic_order(board, board.legal_moves(), hint_move):
+            before = pits[own_silo] - pits[other_silo]
+            board.apply(move)
+            gain = pits[own_silo] - pits[other_silo] - before
+            if board.status:
+                value = gain
+            elif board.side == side:
+                value = gain + self._alphabeta(board, alpha - gain, beta - gain)
+            else:
+                value = gain - self._alphabeta(board, gain - beta, gain - alpha)
+            board.undo()
+            if value > best:
+                best, best_move = value, move
+                if best > alpha:
+                    alpha = best
+                    if alpha >= beta:
+                        break
+
+        if best <= window_alpha:
+            upper = min(upper, best)
+        elif best >= beta:
+            lower = max(lower, best)
+        else:
+            lower = upper = best
+        self.cache[key] = (lower, upper, best_move)
+        return best
+
+    def _mtdf(self, board: SearchBoard, guess: int = 0) -> int:
+        """Narrows [lower, upper] around the exact value with null-window searches."""
+        lower, upper = -board.num_seeds, board.num_seeds
+        value = guess
+        while lower < upper:
+            beta = value + 1 if value == lower else value
+            value = self._alphabeta(board, beta - 1, beta)
+            if value < beta:
+                upper = value
+            else:
+                lower = value
+        return value
+
+    def value(self, board: Board) -> int:
+        """The exact margin to come for the side to move on `board`."""
+        if board.game_status != GameStatus.ONGOING:
+            return 0
+        search_board = SearchBoard.from_board(board, track_hash=False)
+        entry = self.cache.get(self._key(search_board))
+        return self._mtdf(search_board, entry[0] if entry is not None else 0)
+
+    def solve(self, board: Board) -> dict:
+        """
+        Solves `board`: its exact value, the exact value of every legal move
+        for the side to move, the optimal moves, and the final result and
+        score difference under perfect play, with the nodes and time it took.
+        """
+        start = time.perf_counter()
+        nodes, cache_hits, tablebase_hits = self.nodes, self.cache_hits, self.tablebase_hits
+        mover = board.current_player
+        own_silo = board.get_player_silo_index(mover)
+        other_silo = board.get_player_silo_index(
+            PlayerID.PLAYER_TWO if mover == PlayerID.PLAYER_ONE else PlayerID.PLAYER_ONE
+        )
+
+        move_values = {}
+        for move in board.get_legal_moves():
+            child = board.make_move(move)
+            gain = (child.board[own_silo] - child.board[other_silo]) - (board.board[own_silo] - board.board[other_silo])
+            if child.game_status != GameStatus.ONGOING:
+                move_values[move] = gain
+            elif child.current_player == mover:
+                move_values[move] = gain + self.value(child)
+            else:
+                move_values[move] = gain - self.value(child)
+        value = max(move_values.values()) if move_values else 0
+
+        # Final score difference for the side to move, then for Player 1
+        margin = board.board[own_silo] - board.board[other_silo] + value
+        p1_margin = margin if mover == PlayerID.PLAYER_ONE else -margin
+        if p1_margin > 0:
+            result = GameStatus.PLAYER_ONE_WINS
+        elif p1_margin < 0:
+            result = GameStatus.PLAYER_TWO_WINS
+        else:
+            result = GameStatus.DRAW
+        if board.game_status != GameStatus.ONGOING:
+            result = board.game_status
+        return {
+            "board_size": board.board_size,
+            "to_move": mover.name,
+            "value": value,
+            "move_values": move_values,
+            "best_moves": [move for move, move_value in move_values.items() if move_value == value],
+            "final_margin": p1_margin,
+            "result": result.name,
+            "nodes": self.nodes - nodes,
+            "cache_hits": self.cache_hits - cache_hits,
+            "tablebase_hits": self.tablebase_hits - tablebase_hits,
+            "cache_entries": len(self.cache),
+            "seconds": round(time.perf_counter() - start, 3),
+        }
+
+# --- Perfect Player ---
+
+class SolverAlgo(Algo):
+    """
+    Plays perfectly by solving every position it is asked about. Only
+    practical for small variants. Scores are the final score difference for
+    `player_id` under perfect play.
+    """
+    def __init__(self, solver: ExactSolver):
+        super().__init__(f"Exact solver ({solver.board_size} holes)")
+        self.solver = solver
+
+    def get_best_choice(self, board: Board, player_id: PlayerID) -> tuple[int, int | None]:
+        if board.game_status != GameStatus.ONGOING:
+            own = board.board[board.get_player_silo_index(player_id)]
+            return 2 * own - sum(board.board), None
+        stats = self._new_stats() if self.collect_stats else None
+        solved = self.solver.solve(board)
+        if stats is not None:
+            stats.nodes = solved["nodes"]
+            stats.tt_hits = solved["cache_hits"]
+            stats.tablebase_hits = solved["tablebase_hits"]
+            self._report_stats(stats)
+        margin = solved["final_margin"]
+        return (margin if player_id == PlayerID.PLAYER_ONE else -margin), solved["best_moves"][0]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Solve small Congklak variants exactly.")
+    parser.add_argument("--board-size", type=int, nargs="+", default=[3], help="Holes per side")
+    parser.add_argument("--seeds", type=int, nargs="+", default=[3], help="Initial seeds per hole")
+    parser.add_argument("--cache", help="Cache file to resume from and checkpoint to, "
+                                        "with the board size appended when several are solved")
+    parser.add_argument("--checkpoint-interval", type=float, default=CHECKPOINT_INTERVAL)
+    parser.add_argument("--tablebase", help="Endgame tablebase for the board size")
+    parser.add_argument("--out", help="JSON file for the results")
+    args = parser.parse_args()
+    # The search recurses once per move; lines on small boards stay far below
+    # the default limit, this leaves room for larger variants
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), 10_000))
+
+    tablebase = None
+    if args.tablebase:
+        from tablebase import EndgameTablebase
+        tablebase = EndgameTablebase(args.tablebase)
+
+    results = []
+    print(f"{'Holes':>5} {'Seeds':>5} {'Value':>6} {'Result':<16} {'Best':<8} {'Nodes':>12} {'Entries':>10} {'Seconds':>8}")
+    for board_size in args.board_size:
+        cache_path = args.cache
+        if cache_path is not None and len(args.board_size) > 1:
+            cache_path = f"{cache_path}.{board_size}"
+        solver = ExactSolver(
+            board_size, cache_path, args.checkpoint_interval,
+            tablebase if tablebase is not None and tablebase.board_size == board_size else None,
+        )
+        try:
+            for seeds in args.seeds:
+                solved = solver.solve(Board(seeds, board_size))
+                solved["initial_seeds"] = seeds
+                results.append(solved)
+                print(
+                    f"{board_size:>5} {seeds:>5} {solved['value']:>+6} {solved['result']:<16} "
+                    f"{','.join(map(str, solved['best_moves'])):<8} {solved['nodes']:>12,} "
+                    f"{solved['cache_entries']:>10,} {solved['seconds']:>8.2f}",
+                    flush=True,
+                )
+        finally:
+            solver.checkpoint()
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(results, f, indent=2)
+            f.write("\n")
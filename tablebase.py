@@ -0,0 +1,238 @@
+"""
+Endgame tablebase: perfect results for every position with few seeds left.
+
+`generate` enumerates every position with at most `max_seeds` seeds in the
+holes of a board of `board_size`, and solves them all by retrograde analysis
+using the exact rules of `Board.make_move` (the shared `sow_move` and
+`settle_game_status` kernel). `EndgameTablebase` probes the resulting file
+through `mmap`, so a probe is one rank computation and one byte read, and the
+file is never loaded into memory as a whole.
+
+What is stored is the final silo margin still to come for the side to move:
+(seeds the mover will still get into their silo) - (seeds the opponent will),
+under perfect play by both sides. Seeds already in the silos never move again,
+so the final score difference is the current one plus this margin.
+
+File layout: a 16-byte header (magic, version, board_size, max_seeds) and one
+signed byte per position, at the position's combinatorial rank.
+
+    python tablebase.py --board-size 7 --max-seeds 8 --out endgame_7x8.tb
+"""
+import argparse
+import mmap
+import struct
+import time
+from array import array
+from math import comb
+from game_components import (
+    Board, SearchBoard, PlayerID, ONGOING, sow_move, settle_game_status,
+)
+
+MAGIC = b"CGTB"
+VERSION = 1
+HEADER = struct.Struct("<4sHHH6x")  # magic, version, board_size, max_seeds
+UNSOLVED = -128
+
+# --- Position Ranking ---
+# A position is the 2 * board_size hole counts seen from the side to move:
+# the mover's holes first, then the opponent's. Boards are symmetric under
+# swapping the two sides, so a position with Player 2 to move is ranked as
+# the same position with Player 1 to move, and the table needs no side bit.
+#
+# Hole counts b_0..b_{m-1} with b_0 + ... + b_{m-1} <= max_seeds map one to one
+# onto the m-subsets {c_0 < ... < c_{m-1}} of range(max_seeds + m), with
+# c_i = b_0 + ... + b_i + i, and the subsets are ranked in colex order as
+# sum(comb(c_i, i + 1)). This packs the table with no gaps.
+
+def table_size(board_size: int, max_seeds: int) -> int:
+    """Number of positions with at most `max_seeds` seeds in the holes."""
+    return comb(max_seeds + 2 * board_size, 2 * board_size)
+
+def _binomials(board_size: int, max_seeds: int) -> list[list[int]]:
+    """binomials[c][k] == comb(c, k) for every c and k used by `rank`."""
+    m = 2 * board_size
+    return [[comb(c, k) for k in range(m + 1)] for c in range(max_seeds + m)]
+
+def mover_holes(pits, board_size: int, side: int) -> list[int]:
+    """The hole counts seen from `side`: its own holes, then the opponent's."""
+    p1_holes = list(pits[0:board_size])
+    p2_holes = list(pits[board_size + 1:2 * board_size + 1])
+    return p1_holes + p2_holes if side == 0 else p2_holes + p1_holes
+
+def rank(holes, binomials) -> int:
+    position_rank = 0
+    c = -1
+    for i, seeds in enumerate(holes):
+        c += seeds + 1
+        position_rank += binomials[c][i + 1]
+    return position_rank
+
+# --- Retrograde Solver ---
+
+def sowing_potential(holes, board_size: int) -> int:
+    """sum(seeds * hole index) over both sides, each side's holes indexed from 0."""
+    return sum(seeds * (i % board_size) for i, seeds in enumerate(holes))
+
+def _positions(board_size: int, seeds: int, potential: int):
+    """Yields every hole list with `seeds` seeds in total and the given sowing potential."""
+    m = 2 * board_size
+    # Lightest and heaviest hole weight among holes i..m-1. Every potential
+    # between the two extremes can be reached, so no branch is a dead end.
+    lightest = [0 if i <= board_size else i - board_size for i in range(m)]
+    heaviest = board_size - 1
+    holes = [0] * m
+
+    def fill(i, seeds_left, potential_left):
+        weight = i % board_size
+        if i == m - 1:
+            if seeds_left * weight == potential_left:
+                holes[i] = seeds_left
+                yield holes
+            return
+        for k in range(seeds_left + 1):
+            rest, rest_potential = seeds_left - k, potential_left - k * weight
+            if lightest[i + 1] * rest <= rest_potential <= heaviest * rest:
+                holes[i] = k
+                yield from fill(i + 1, rest, rest_potential)
+        holes[i] = 0
+
+    yield from fill(0, seeds, potential)
+
+class _Solver:
+    """
+    Solves positions by retrograde analysis, with no recursion.
+
+    Every move either puts seeds into a silo, so that fewer seeds are left in
+    the holes, or moves seeds forward within the mover's own holes without
+    reaching the silo. The latter strictly increases the sowing potential,
+    sum(seeds * hole index) over both sides, which is unchanged by swapping the
+    sides. So no position can ever be reached again, and solving positions by
+    increasing seeds in the holes, and by decreasing potential among positions
+    with as many seeds, finds every position's successors already solved.
+    """
+    def __init__(self, board_size: int, max_seeds: int):
+        self.board_size = board_size
+        self.max_seeds = max_seeds
+        self.binomials = _binomials(board_size, max_seeds)
+        self.values = array("b", [UNSOLVED]) * table_size(board_size, max_seeds)
+
+    def solve_all(self, progress=None):
+        """Solves every position. `progress(count, total)` is called every 100,000 positions."""
+        n = self.board_size
+        count = 0
+        for seeds in range(self.max_seeds + 1):
+            for potential in range(seeds * (n - 1), -1, -1):
+                for holes in _positions(n, seeds, potential):
+                    self.values[rank(holes, self.binomials)] = self._position_value(holes)
+                    count += 1
+                    if progress is not None and count % 100_000 == 0:
+                        progress(count, len(self.values))
+        return count
+
+    def value(self, holes: list[int]) -> int:
+        """The margin to come for the side to move (Player 1 in `holes`), once solved."""
+        return self.values[rank(holes, self.binomials)]
+
+    def _position_value(self, holes: list[int]) -> int:
+        n = self.board_size
+        if not any(holes[:n]) or not any(holes[n:]):
+            # Game over: each side sweeps its own holes
+            return sum(holes[:n]) - sum(holes[n:])
+        return max(self._move_value(holes, move) for move in range(n) if holes[move])
+
+    def _move_value(self, holes: list[int], move: int) -> int:
+        n = self.board_size
+        pits = holes[:n] + [0] + holes[n:] + [0]
+        free_turn = sow_move(pits, n, 0, move)
+        status = settle_game_status(pits, n)
+        margin = pits[n] - pits[2 * n + 1]
+        if status != ONGOING:
+            return margin
+        if free_turn:
+            return margin + self.value(mover_holes(pits, n, 0))
+        return margin - self.value(mover_holes(pits, n, 1))
+
+def generate(board_size: int, max_seeds: int, path: str, progress=None) -> int:
+    """
+    Solves every position with at most `max_seeds` seeds in the holes and
+    writes the table to `path`. Returns the number of positions.
+    """
+    if max_seeds > 127:
+        raise ValueError(f"max_seeds must be at most 127 to fit margins in a byte, got {max_seeds}")
+    solver = _Solver(board_size, max_seeds)
+    solver.solve_all(progress)
+
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, board_size, max_seeds))
+        solver.values.tofile(f)
+    return len(solver.values)
+
+# --- Probing ---
+
+class EndgameTablebase:
+    """
+    Read-only, memory-mapped view of a tablebase file.
+    `probe` returns the exact margin to come for the side to move, or None if
+    the position has more seeds in its holes than the table covers.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.board_size, self.max_seeds = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} Congklak tablebase")
+        expected = HEADER.size + table_size(self.board_size, self.max_seeds)
+        if len(self._map) != expected:
+            raise ValueError(f"{path} has {len(self._map)} bytes, expected {expected}")
+        self._binomials = _binomials(self.board_size, self.max_seeds)
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __getstate__(self):
+        # A memory map cannot be sent to another process, so copies map the file again
+        return self.path
+
+    def __setstate__(self, path):
+        self.__init__(path)
+
+    def probe_pits(self, pits, side: int) -> int | None:
+        """Probes raw pit counts with `side` (0 or 1) to move."""
+        n = self.board_size
+        if len(pits) != 2 * n + 2:
+            return None
+        holes = mover_holes(pits, n, side)
+        if sum(holes) > self.max_seeds:
+            return None
+        value = self._map[HEADER.size + rank(holes, self._binomials)]
+        return value - 256 if value > 127 else value
+
+    def probe(self, board: Board | SearchBoard) -> int | None:
+        side = 0 if board.current_player == PlayerID.PLAYER_ONE else 1
+        return self.probe_pits(board.board, side)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a Congklak endgame tablebase.")
+    parser.add_argument("--board-size", type=int, default=7)
+    parser.add_argument("--max-seeds", type=int, default=8, help="Most seeds left in the holes")
+    parser.add_argument("--out", required=True)
+    args = parser.parse_args()
+
+    size = table_size(args.board_size, args.max_seeds)
+    print(f"Solving {size} positions...")
+    start = time.perf_counter()
+    generate(
+        args.board_size,
+        args.max_seeds,
+        args.out,
+        progress=lambda count, total: print(f"  {count}/{total} solved", flush=True),
+    )
+    print(f"Wrote {args.out} ({HEADER.size + size} bytes) in {time.perf_counter() - start:.1f}s")